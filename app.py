@@ -1,3 +1,8 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
+
 import streamlit as st
 import pandas as pd
 import numpy as np
@@ -5,23 +10,27 @@ from io import BytesIO
 
 # Import dari file terpisah
 from utils.styles import apply_custom_css, render_header
-from utils.helpers import (
-    calculate_engagement_rate,
-    clean_duration,
-    parse_date,
-    split_comments,
-    generate_insights
+from utils.analytics import compute_aggregates
+from utils.helpers import generate_insights, optimize_dtypes
+from utils.data_loader import (
+    HEAVY_TEXT_COLUMNS,
+    combine_datasets,
+    combined_key,
+    dataset_key,
+    load_dataset,
+    source_name,
 )
-from utils.sidebar import render_sidebar
-from modules import (
-    executive_summary,
-    engagement_analytics,
-    content_analysis,
-    view_reach_analytics,
-    sentiment_comment_analysis,
-    topic_analysis,
-    data_explorer
+from utils.dataset_cache import DatasetCache, DEFAULT_SPILL_DIR
+from utils.text_store import attach_text_columns, open_text_columns
+from utils.snapshot import (
+    SNAPSHOT_ROOT,
+    changed_sources,
+    read_snapshot,
+    upload_fingerprint,
+    write_snapshot,
 )
+from utils.sidebar import render_sidebar
+from modules import load_page
 
 # ================== PAGE CONFIG ==================
 st.set_page_config(page_title="SocialSight Analytics", layout="wide")
@@ -30,65 +39,216 @@ st.set_page_config(page_title="SocialSight Analytics", layout="wide")
 apply_custom_css()
 render_header()
 
+# ================== DATASET CACHE ==================
+# Processed datasets are shared by every session, keyed by file content
+DATASET_CACHE_MAX_BYTES = 1024**3
+DATASET_CACHE_SPILL = True
+TEXT_STORE_DIR = os.path.join(".cache", "text")
+MAX_PARSE_WORKERS = 4
+PAGE_TEXT_COLUMNS = {
+    "Content Analysis": ["Description"],
+    "Data Explorer": HEAVY_TEXT_COLUMNS,
+}
+
+
+@st.cache_resource
+def get_dataset_cache():
+    return DatasetCache(
+        max_bytes=DATASET_CACHE_MAX_BYTES,
+        spill_dir=DEFAULT_SPILL_DIR if DATASET_CACHE_SPILL else None,
+    )
+
+
+@st.cache_resource(max_entries=4)
+def load_text_frame(key, file_id, names, _df, _text_columns):
+    """The dataset with the text columns ``names`` read from the text store,
+    built once per loaded dataset instead of on every rerun.
+
+    ``key`` (content hash) and ``file_id`` (uploads or snapshot opened)
+    together identify the session's frame across sessions.
+    """
+    return attach_text_columns(_df, _text_columns, list(names))
+
+
+def load_uploads(uploaded_files):
+    """Load every upload through the shared cache, parsing misses in parallel.
+
+    Returns one (key, df, comments, meta, text_columns) per file.
+    """
+    dataset_cache = get_dataset_cache()
+    loaded = [None] * len(uploaded_files)
+    pending = {}
+    for i, uploaded_file in enumerate(uploaded_files):
+        key = dataset_key(uploaded_file.getvalue(), uploaded_file.name)
+        cached = dataset_cache.get(key)
+        if cached is not None:
+            frames, meta = cached
+            text_columns = open_text_columns(
+                os.path.join(TEXT_STORE_DIR, key), meta["text_columns"]
+            )
+            if text_columns is not None:
+                loaded[i] = (key, frames["df"], frames["comments"], meta, text_columns)
+                continue
+        pending[i] = key
+
+    if not pending:
+        st.sidebar.info("⚡ Loaded from the shared dataset cache")
+        return loaded
+
+    # Workers only record their progress; the bar is drawn from this thread
+    fractions = dict.fromkeys(pending, 0.0)
+    progress_bar = st.sidebar.progress(0.0, text="Loading data...")
+    with ThreadPoolExecutor(max_workers=min(MAX_PARSE_WORKERS, len(pending))) as pool:
+        futures = {
+            pool.submit(
+                load_dataset,
+                uploaded_files[i],
+                progress=partial(fractions.__setitem__, i),
+                text_dir=os.path.join(TEXT_STORE_DIR, key),
+            ): i
+            for i, key in pending.items()
+        }
+        not_done = set(futures)
+        while not_done:
+            _, not_done = wait(not_done, timeout=0.2)
+            fraction = sum(fractions.values()) / len(fractions)
+            progress_bar.progress(fraction, text=f"Loading data... {fraction:.0%}")
+    progress_bar.empty()
+
+    for future, i in futures.items():
+        df, comments_df, failed_dates, text_columns = future.result()
+        df, memory_report = optimize_dtypes(df)
+        if comments_df is not None:
+            comments_df, _ = optimize_dtypes(comments_df, ["video_id"])
+        meta = {
+            "failed_dates": failed_dates,
+            "memory_report": memory_report,
+            "text_columns": list(text_columns),
+        }
+        dataset_cache.put(pending[i], {"df": df, "comments": comments_df}, meta)
+        loaded[i] = (pending[i], df, comments_df, meta, text_columns)
+    return loaded
+
+
+def save_session_snapshot():
+    """Write this session's data and finished results to a new snapshot.
+
+    Comments carry the labels of the session's finished full sentiment
+    run (or the loaded snapshot's), the videos the topics of the model
+    last shown on Topic Analysis. Returns the snapshot directory.
+    """
+    key = st.session_state.dataset_key
+    df = st.session_state.df
+    comments = st.session_state.get("comments_df")
+    sources = st.session_state.sources
+
+    sentiment_model = st.session_state.get("sentiment_snapshot")
+    sentiment = st.session_state.get("sentiment_result")
+    if comments is not None and sentiment and sentiment["dataset_key"] == key:
+        job = sentiment["job"]
+        comments = comments.drop(columns=["sentiment", "score"], errors="ignore")
+        comments["sentiment"] = pd.Categorical(job.labels)
+        comments["score"] = job.scores
+        sentiment_model = sentiment["model_fingerprint"]
+
+    weights = keywords = topics_hash = None
+    topics = st.session_state.get("topic_result")
+    if topics and topics["dataset_key"] == key:
+        df = df.copy(deep=False)
+        df["topic"] = topics["assignment"]["topic"]
+        df["topic_confidence"] = topics["assignment"]["topic_confidence"]
+        weights = topics["assignment"]["weights"]
+        keywords = topics["keywords"]
+        topics_hash = topics["model_hash"]
+    elif st.session_state.get("topic_snapshot"):
+        weights = st.session_state.topic_snapshot["weights"]
+        keywords = st.session_state.topic_snapshot["keywords"]
+        topics_hash = st.session_state.topic_snapshot["model_hash"]
+
+    directory = os.path.join(
+        SNAPSHOT_ROOT,
+        "+".join(source_name(source["name"]) for source in sources)
+        + time.strftime("-%Y%m%d-%H%M%S"),
+    )
+    write_snapshot(
+        directory,
+        key,
+        df,
+        comments,
+        st.session_state.get("text_columns") or {},
+        sources,
+        topic_weights=weights,
+        topic_keywords=keywords,
+        topic_model_hash=topics_hash,
+        sentiment_model=sentiment_model,
+        aggregates=st.session_state.get("aggregates") or compute_aggregates(df),
+        options={"saved_from_session": True},
+    )
+    return directory
+
+
 # ================== SIDEBAR ==================
-menu, uploaded_file = render_sidebar()
+menu, uploaded_files, snapshot_dir = render_sidebar()
+if DATASET_CACHE_SPILL and get_dataset_cache().spill_dir is None:
+    st.sidebar.caption(
+        "💾 Dataset cache spilling is off: install pyarrow to keep "
+        "processed files across restarts"
+    )
 
 # ================== LOAD DATA ==================
 if "df" not in st.session_state:
     st.session_state.df = None
 
-if uploaded_file is not None:
-    file_id = f"{uploaded_file.name}_{uploaded_file.size}"
+if uploaded_files:
+    file_id = "|".join(f"{f.name}_{f.size}" for f in uploaded_files)
 
     if (
         "current_file_id" not in st.session_state
         or st.session_state.current_file_id != file_id
     ):
         try:
-            if uploaded_file.name.endswith(".csv"):
-                try:
-                    df = pd.read_csv(
-                        uploaded_file, encoding="utf-8", on_bad_lines="skip"
-                    )
-                except UnicodeDecodeError:
-                    try:
-                        uploaded_file.seek(0)
-                        df = pd.read_csv(
-                            uploaded_file, encoding="latin-1", on_bad_lines="skip"
-                        )
-                    except UnicodeDecodeError:
-                        uploaded_file.seek(0)
-                        df = pd.read_csv(
-                            uploaded_file, encoding="cp1252", on_bad_lines="skip"
-                        )
-                except Exception as e:
-                    uploaded_file.seek(0)
-                    df = pd.read_csv(
-                        uploaded_file,
-                        encoding="utf-8",
-                        sep=",",
-                        quotechar='"',
-                        escapechar="\\",
-                        on_bad_lines="skip",
-                        engine="python",
-                    )
-            else:
-                df = pd.read_excel(uploaded_file)
-
-            if "Tanggal Upload" in df.columns:
-                df["Tanggal Upload"] = df["Tanggal Upload"].apply(parse_date)
-
-            if "Durasi" in df.columns:
-                df["Duration_Seconds"] = df["Durasi"].apply(clean_duration)
-
-            df = calculate_engagement_rate(df)
-
-            if "Komentar Lengkap" in df.columns:
-                df["Comments"] = df["Komentar Lengkap"].apply(lambda x: len(split_comments(x)))
+            loaded = load_uploads(uploaded_files)
+
+            df, comments_df, text_columns, duplicates, memory_report = combine_datasets(
+                [
+                    (source_name(f.name), item[1], item[2], item[4])
+                    for f, item in zip(uploaded_files, loaded)
+                ]
+            )
+            key = combined_key([item[0] for item in loaded])
+            if len(loaded) == 1:
+                memory_report = loaded[0][3]["memory_report"]
+            if duplicates:
+                st.sidebar.info(
+                    f"🔁 {duplicates} duplicate videos merged across "
+                    f"{len(loaded)} files"
+                )
+            failed_dates = sum(item[3]["failed_dates"] for item in loaded)
+
+            st.sidebar.caption(
+                f"🗜️ Memory: {memory_report['before'] / 1024**2:,.1f} MB → "
+                f"{memory_report['after'] / 1024**2:,.1f} MB "
+                f"({len(memory_report['columns'])} columns compacted)"
+            )
+
+            if failed_dates:
+                st.sidebar.warning(
+                    f"⚠️ {failed_dates} upload dates could not be parsed"
+                )
+            if comments_df is not None:
                 st.sidebar.info("📝 Comment counts updated based on split comments")
 
             st.session_state.df = df
+            st.session_state.comments_df = comments_df
+            st.session_state.text_columns = text_columns
             st.session_state.current_file_id = file_id
+            st.session_state.dataset_key = key
+            st.session_state.sources = [
+                upload_fingerprint(f.name, f.getvalue()) for f in uploaded_files
+            ]
+            st.session_state.topic_snapshot = None
+            st.session_state.sentiment_snapshot = None
+            st.session_state.aggregates = compute_aggregates(df)
 
             st.sidebar.success(f"✅ Data loaded: {len(df)} records")
         except Exception as e:
@@ -97,25 +257,78 @@ if uploaded_file is not None:
     else:
         st.sidebar.success(f"✅ Data loaded: {len(st.session_state.df)} records")
 
+elif snapshot_dir:
+    file_id = f"snapshot:{snapshot_dir}:{os.path.getmtime(snapshot_dir)}"
+
+    if st.session_state.get("current_file_id") != file_id:
+        try:
+            snapshot = read_snapshot(snapshot_dir)
+            st.session_state.df = snapshot["df"]
+            st.session_state.comments_df = snapshot["comments"]
+            st.session_state.text_columns = snapshot["text_columns"]
+            st.session_state.aggregates = snapshot["aggregates"]
+            st.session_state.current_file_id = file_id
+            manifest = snapshot["manifest"]
+            st.session_state.dataset_key = manifest["key"]
+            st.session_state.sources = manifest["sources"]
+            # Precomputed topics are only valid for the model they came from
+            st.session_state.topic_snapshot = (
+                {
+                    "model_hash": manifest["topics"].get("model_hash"),
+                    "weights": snapshot["topic_weights"],
+                    "keywords": snapshot["topic_keywords"],
+                }
+                if manifest["topics"] is not None
+                else None
+            )
+            # Fingerprint of the model that labelled the snapshot's comments
+            st.session_state.sentiment_snapshot = (manifest["sentiment"] or {}).get(
+                "model_fingerprint"
+            )
+            st.sidebar.info(
+                f"📦 Snapshot of "
+                f"{', '.join(source['name'] for source in manifest['sources'])} "
+                f"({manifest['created']})"
+            )
+            changed = changed_sources(manifest)
+            if changed:
+                st.sidebar.warning(
+                    f"⚠️ {', '.join(changed)} changed since this snapshot was "
+                    "written; run precompute.py again to refresh it"
+                )
+        except Exception as e:
+            st.error(f"❌ Error loading snapshot: {str(e)}")
+    if st.session_state.df is not None:
+        st.sidebar.success(f"✅ Data loaded: {len(st.session_state.df)} records")
+
+# A session's parsed data and finished analyses reopen from the picker
+if st.session_state.df is not None and st.sidebar.button(
+    "💾 Save snapshot", use_container_width=True
+):
+    try:
+        directory = save_session_snapshot()
+        st.sidebar.success(f"💾 Snapshot saved to {directory}")
+    except Exception as e:
+        st.sidebar.error(f"❌ Error saving snapshot: {str(e)}")
+
 # ================== ROUTING ==================
 if st.session_state.df is not None:
+    # Heavy text columns stay on disk unless the page reads them
+    text_names = tuple(PAGE_TEXT_COLUMNS.get(menu, []))
     df = st.session_state.df
+    if text_names:
+        # Pages may add columns; they get a shallow copy of the shared frame
+        df = load_text_frame(
+            st.session_state.dataset_key,
+            st.session_state.current_file_id,
+            text_names,
+            df,
+            st.session_state.get("text_columns") or {},
+        ).copy(deep=False)
 
     try:
-        if menu == "Executive Summary":
-            executive_summary.render(df)
-        elif menu == "Engagement Analytics":
-            engagement_analytics.render(df)
-        elif menu == "Content Analysis":
-            content_analysis.render(df)
-        elif menu == "View & Reach Analytics":
-            view_reach_analytics.render(df)
-        elif menu == "Sentiment & Comment Analysis":
-            sentiment_comment_analysis.render(df)
-        elif menu == "Topic Analysis":
-            topic_analysis.render(df)
-        elif menu == "Data Explorer":
-            data_explorer.render(df)
+        # Page modules (and their heavy dependencies) load on first visit
+        load_page(menu).render(df)
 
     except Exception as e:
         st.error(f"❌ Error loading data: {str(e)}")
@@ -0,0 +1,60 @@
+"""
+Benchmark vectorized duration parsing against the per-row clean_duration.
+
+Usage (from the project root):
+    python -m benchmarks.duration_benchmark [--rows 1000000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.helpers import clean_duration, parse_duration_series
+
+
+def make_durations(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    hours = rng.integers(0, 3, rows)
+    minutes = rng.integers(0, 60, rows)
+    seconds = rng.integers(0, 60, rows)
+    values = pd.Series(
+        [
+            f"PT{h}H{m}M{s}S" if h else f"PT{m}M{s}S"
+            for h, m, s in zip(hours, minutes, seconds)
+        ],
+        dtype=object,
+    )
+    # Sprinkle in day, fractional, empty and broken values
+    special = rng.choice(rows, rows // 100, replace=False)
+    values.iloc[special] = rng.choice(["P1DT2H", "PT1H2M3.5S", "PT", "n/a", None], len(special))
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    durations = make_durations(args.rows)
+    print(f"{args.rows:,} rows")
+
+    start = time.perf_counter()
+    baseline = durations.apply(clean_duration)
+    baseline_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized = parse_duration_series(durations)
+    vectorized_time = time.perf_counter() - start
+
+    plain = vectorized.notna() & (baseline > 0)
+    print(f"apply(clean_duration)  : {baseline_time:8.3f}s")
+    print(f"parse_duration_series  : {vectorized_time:8.3f}s")
+    print(f"speedup                : {baseline_time / vectorized_time:8.1f}x")
+    print(f"agree on plain values  : {(vectorized[plain] == baseline[plain]).mean():.2%}")
+    print(f"NaN (unparseable)      : {vectorized.isna().sum():,}")
+
+
+if __name__ == "__main__":
+    main()
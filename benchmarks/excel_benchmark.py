@@ -0,0 +1,89 @@
+"""
+Benchmark the streaming openpyxl reader against pd.read_excel.
+
+Builds a workbook of --rows rows by cycling through a crawl CSV (comment
+cells are cut to --comment-chars characters) and reads it both ways.
+
+Usage (from the project root):
+    python -m benchmarks.excel_benchmark [data/data_semeru.csv] [--rows 100000]
+"""
+
+import argparse
+import io
+import time
+import tracemalloc
+
+import pandas as pd
+from openpyxl import Workbook
+
+from utils.data_loader import iter_excel_chunks
+
+
+def make_workbook(path, rows, comment_chars):
+    source = pd.read_csv(path, on_bad_lines="skip")
+    source["Komentar Lengkap"] = source["Komentar Lengkap"].str.slice(0, comment_chars)
+    records = source.astype(object).where(source.notna(), None).values.tolist()
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Data")
+    sheet.append(list(source.columns))
+    for i in range(rows):
+        sheet.append(records[i % len(records)])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer
+
+
+def measure(read, buffer, memory):
+    buffer.seek(0)
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    df = read(buffer)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] if memory else None
+    if memory:
+        tracemalloc.stop()
+    return df, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", nargs="?", default="data/data_semeru.csv")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--comment-chars", type=int, default=2000)
+    parser.add_argument(
+        "--memory", action="store_true", help="also trace peak memory (slower)"
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    buffer = make_workbook(args.path, args.rows, args.comment_chars)
+    print(
+        f"{args.rows:,} rows, {buffer.getbuffer().nbytes / 1024**2:,.1f} MB workbook "
+        f"(built in {time.perf_counter() - start:.1f}s)"
+    )
+
+    readers = [
+        ("pd.read_excel", pd.read_excel),
+        ("iter_excel_chunks", lambda f: pd.concat(iter_excel_chunks(f), ignore_index=True)),
+    ]
+    results = {}
+    for name, read in readers:
+        df, elapsed, peak = measure(read, buffer, args.memory)
+        results[name] = df
+        line = f"{name:18}: {elapsed:8.2f}s"
+        if peak is not None:
+            line += f"  peak {peak / 1024**2:8.1f} MB"
+        print(line)
+
+    baseline, streamed = results.values()
+    same = baseline.shape == streamed.shape and all(
+        baseline[c].fillna("").astype(str).equals(streamed[c].fillna("").astype(str))
+        for c in baseline.columns
+    )
+    print(f"same values        : {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark the import cost of the app's modules.
+
+Every module is imported in a fresh interpreter under ``-X importtime``
+after the packages all pages share (streamlit, pandas, plotly), so the
+reported time is what that module adds to a cold start; the heaviest
+third-party packages it pulls in are listed next to it.
+
+Usage (from the project root):
+    python -m benchmarks.import_benchmark [module ...] [--runs 3]
+"""
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+
+BASELINE = ["streamlit", "pandas", "numpy", "plotly.express", "plotly.graph_objects"]
+
+MODULES = [
+    "modules",
+    "utils.data_loader",
+    "utils.snapshot",
+    "utils.sidebar",
+    "modules.executive_summary",
+    "modules.engagement_analytics",
+    "modules.content_analysis",
+    "modules.view_reach_analytics",
+    "modules.sentiment_comment_analysis",
+    "modules.topic_analysis",
+    "modules.data_explorer",
+    "utils.sentiment_inference",
+    "utils.topic_model",
+]
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_entries(modules):
+    """(cumulative us, depth, name) of every import made by a fresh interpreter"""
+    code = "; ".join(f"import {name}" for name in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return [
+        (int(cumulative), len(indent), name)
+        for _, cumulative, indent, name in LINE.findall(result.stderr)
+    ]
+
+
+def baseline_seconds():
+    """Import time of the packages shared by every page"""
+    return sum(
+        cumulative
+        for cumulative, depth, name in import_entries(BASELINE)
+        if depth == 1 and name in BASELINE
+    ) / 1e6
+
+
+def import_profile(module):
+    """Cumulative import time of ``module`` (seconds) and its top packages"""
+    entries = import_entries(BASELINE + [module])
+    # Entries are printed children first, so everything after the last
+    # baseline package up to the module itself was imported by the module
+    last_baseline = max(
+        i for i, (_, depth, name) in enumerate(entries) if depth == 1 and name in BASELINE
+    )
+    own = entries[last_baseline + 1 :]
+    total = next(
+        (cumulative for cumulative, depth, name in own if depth == 1 and name == module),
+        0,
+    )
+    packages = sorted(
+        (
+            (cumulative, name)
+            for cumulative, depth, name in own
+            if "." not in name and name not in ("modules", "utils")
+        ),
+        reverse=True,
+    )
+    return total / 1e6, [name for _, name in packages[:3]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    seconds = statistics.median(baseline_seconds() for _ in range(args.runs))
+    print(f"{'baseline (' + ', '.join(BASELINE[:2]) + ', ...)':36}: {seconds:6.2f}s")
+    for module in args.modules:
+        try:
+            runs = [import_profile(module) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"{module:36}: failed ({e})")
+            continue
+        seconds = statistics.median(total for total, _ in runs)
+        heaviest = ", ".join(runs[-1][1]) or "-"
+        print(f"{module:36}: {seconds:6.2f}s  ({heaviest})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark the compiled SlangNormalizer against the regex-based normalize_text.
+
+Usage (from the project root):
+    python -m benchmarks.normalizer_benchmark [data/data_semeru.csv] [--limit N]
+"""
+
+import argparse
+import time
+
+import pandas as pd
+
+from modules.sentiment_comment_analysis import normalize_text
+from utils.helpers import split_comments
+from utils.sentiment_resources import read_sentiment_mappings
+from utils.text_normalizer import SlangNormalizer
+
+
+def load_comments(path, limit):
+    df = pd.read_csv(path, on_bad_lines="skip")
+    comments = [
+        comment
+        for value in df["Komentar Lengkap"].dropna()
+        for comment in split_comments(value)
+    ]
+    return comments[:limit] if limit else comments
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", nargs="?", default="data/data_semeru.csv")
+    parser.add_argument("--limit", type=int, default=2000)
+    args = parser.parse_args()
+
+    comments = load_comments(args.path, args.limit)
+    mappings = read_sentiment_mappings()
+    print(f"{len(comments):,} comments, {len(mappings):,} mapping keys")
+
+    start = time.perf_counter()
+    normalizer = SlangNormalizer(mappings)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    baseline = [normalize_text(c, mappings) for c in comments]
+    baseline_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = normalizer.normalize_many(comments)
+    compiled_time = time.perf_counter() - start
+
+    mismatches = sum(a != b for a, b in zip(baseline, compiled))
+
+    print(f"normalize_text      : {baseline_time:8.3f}s ({len(comments) / baseline_time:,.0f} comments/sec)")
+    print(f"SlangNormalizer     : {compiled_time:8.3f}s ({len(comments) / compiled_time:,.0f} comments/sec)")
+    print(f"  build (one-off)   : {build_time:8.3f}s")
+    print(f"speedup             : {baseline_time / compiled_time:8.1f}x")
+    print(f"differing outputs   : {mismatches:,} / {len(comments):,}")
+
+
+if __name__ == "__main__":
+    main()
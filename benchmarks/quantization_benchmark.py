@@ -0,0 +1,80 @@
+"""
+Compare the fp32 sentiment model with its int8 dynamically-quantized copy.
+
+Reports throughput, single-comment latency and the label-agreement rate
+between both models. With --labels (a CSV with ``text`` and ``label``
+columns) it also reports each model's accuracy against the gold labels.
+
+Usage (from the project root):
+    python -m benchmarks.quantization_benchmark [data/data_semeru.csv] [--labels gold.csv]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.normalizer_benchmark import load_comments
+from utils.sentiment_resources import read_sentiment_mappings
+from utils.sentiment_inference import classify_comments, load_classifier
+from utils.text_normalizer import SlangNormalizer
+
+
+def measure(classifier, texts, batch_size, latency_samples):
+    labels, _, stats = classify_comments(texts, classifier, batch_size=batch_size)
+
+    latencies = []
+    for text in texts[:latency_samples]:
+        start = time.perf_counter()
+        classify_comments([text], classifier, batch_size=1)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return labels, {
+        "comments/sec": stats["comments_per_sec"],
+        "p50 latency (ms)": np.percentile(latencies, 50),
+        "p95 latency (ms)": np.percentile(latencies, 95),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", nargs="?", default="data/data_semeru.csv")
+    parser.add_argument("--labels", help="CSV with text,label columns")
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--model-dir", default="./models/sentiment_analysis")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--latency-samples", type=int, default=100)
+    args = parser.parse_args()
+
+    if args.labels:
+        gold = pd.read_csv(args.labels).head(args.limit)
+        texts, gold_labels = gold["text"].astype(str).tolist(), gold["label"].tolist()
+    else:
+        texts, gold_labels = load_comments(args.path, args.limit), None
+
+    texts = SlangNormalizer(read_sentiment_mappings()).normalize_many(texts)
+    print(f"{len(texts):,} comments")
+
+    results = {}
+    predictions = {}
+    for name, quantized in [("fp32", False), ("int8", True)]:
+        start = time.perf_counter()
+        classifier = load_classifier(args.model_dir, quantized=quantized)
+        load_time = time.perf_counter() - start
+        predictions[name], results[name] = measure(
+            classifier, texts, args.batch_size, args.latency_samples
+        )
+        results[name]["load time (s)"] = load_time
+        if gold_labels is not None:
+            results[name]["accuracy"] = np.mean(
+                [p == g for p, g in zip(predictions[name], gold_labels)]
+            )
+
+    print(pd.DataFrame(results).round(3).to_string())
+    agreement = np.mean([a == b for a, b in zip(predictions["fp32"], predictions["int8"])])
+    print(f"label agreement fp32 vs int8: {agreement:.2%}")
+
+
+if __name__ == "__main__":
+    main()
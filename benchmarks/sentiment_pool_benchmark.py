@@ -0,0 +1,72 @@
+"""
+Find the best workers x threads split for sentiment inference on this host.
+
+Runs the in-process engine and SentimentWorkerPool over a sample of real
+comments for every split whose total thread count fits the CPU count.
+
+Usage (from the project root):
+    python -m benchmarks.sentiment_pool_benchmark [data/data_semeru.csv] [--limit N]
+"""
+
+import argparse
+import os
+import time
+from types import SimpleNamespace
+
+import torch
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+from benchmarks.normalizer_benchmark import load_comments
+from utils.sentiment_inference import classify_comments
+from utils.sentiment_pool import SentimentWorkerPool
+
+
+def candidate_shapes(cpus):
+    shapes = []
+    workers = 1
+    while workers <= cpus:
+        shapes.append((workers, cpus // workers))
+        workers *= 2
+    return shapes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", nargs="?", default="data/data_semeru.csv")
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--model-dir", default="./models/sentiment_analysis")
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    comments = load_comments(args.path, args.limit)
+    cpus = os.cpu_count() or 1
+    print(f"{len(comments):,} comments, {cpus} CPUs")
+
+    torch.set_num_threads(cpus)
+    classifier = SimpleNamespace(
+        tokenizer=AutoTokenizer.from_pretrained(args.model_dir),
+        model=AutoModelForSequenceClassification.from_pretrained(args.model_dir),
+    )
+    _, _, stats = classify_comments(comments, classifier, batch_size=args.batch_size)
+    results = [("in-process", 1, cpus, stats["comments_per_sec"])]
+
+    for workers, threads in candidate_shapes(cpus):
+        pool = SentimentWorkerPool(args.model_dir, workers, threads)
+        # Warm up so model loading is not counted
+        list(pool.classify_iter(comments[: workers * 4], shard_size=4))
+        start = time.perf_counter()
+        pool.classify(comments, batch_size=args.batch_size)
+        elapsed = time.perf_counter() - start
+        pool.close()
+        results.append(("pool", workers, threads, len(comments) / elapsed))
+
+    print(f"{'backend':<12}{'workers':>8}{'threads':>9}{'comments/sec':>15}")
+    for backend, workers, threads, rate in results:
+        print(f"{backend:<12}{workers:>8}{threads:>9}{rate:>15,.1f}")
+
+    best = max(results, key=lambda r: r[3])
+    print(f"best: {best[0]} with {best[1]} worker(s) x {best[2]} thread(s)")
+
+
+if __name__ == "__main__":
+    main()
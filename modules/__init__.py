@@ -1,21 +1,26 @@
 """
 Modules for SocialSight Analytics
+
+Pages are imported on first use (``load_page``) so a session only pays
+for the dependencies of the pages it opens.
 """
 
-from . import executive_summary
-from . import engagement_analytics
-from . import content_analysis
-from . import view_reach_analytics
-from . import sentiment_comment_analysis
-from . import topic_analysis
-from . import data_explorer
+import importlib
+
+PAGES = {
+    "Executive Summary": "executive_summary",
+    "Engagement Analytics": "engagement_analytics",
+    "Content Analysis": "content_analysis",
+    "View & Reach Analytics": "view_reach_analytics",
+    "Sentiment & Comment Analysis": "sentiment_comment_analysis",
+    "Topic Analysis": "topic_analysis",
+    "Data Explorer": "data_explorer",
+}
+
+
+def load_page(menu):
+    """Import and return the page module for a menu entry"""
+    return importlib.import_module(f"{__name__}.{PAGES[menu]}")
+
 
-__all__ = [
-    'executive_summary',
-    'engagement_analytics',
-    'content_analysis',
-    'view_reach_analytics',
-    'sentiment_comment_analysis',
-    'topic_analysis',
-    'data_explorer',
-]
\ No newline at end of file
+__all__ = ['PAGES', 'load_page']
@@ -49,7 +49,7 @@ def render(df):
             st.subheader("Category Performance")
 
             cat_perf = (
-                df.groupby("Kategori")
+                df.groupby("Kategori", observed=True)
                 .agg({"Views": "sum", "Engagement": "sum"})
                 .reset_index()
             )
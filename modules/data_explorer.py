@@ -31,9 +31,18 @@ def render(df):
             "Min Views", min_value=0, value=0, step=1000
         )
 
+    selected_sources = []
+    if "Source" in df.columns and df["Source"].nunique() > 1:
+        selected_sources = st.multiselect(
+            "Select Source Datasets", list(df["Source"].unique()), default=[]
+        )
+
     # Apply Filters
     filtered_df = df.copy()
 
+    if selected_sources:
+        filtered_df = filtered_df[filtered_df["Source"].isin(selected_sources)]
+
     if selected_channels:
         filtered_df = filtered_df[
             filtered_df["Channel"].isin(selected_channels)
@@ -95,7 +104,7 @@ def render(df):
         # Category Breakdown
         st.subheader("Category Breakdown")
         if "Kategori" in filtered_df.columns:
-            category_breakdown = filtered_df.groupby("Kategori").agg(
+            category_breakdown = filtered_df.groupby("Kategori", observed=True).agg(
                 {"Views": ["count", "sum"], "Likes": "sum", "Comments": "sum"}
             )
 
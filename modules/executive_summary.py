@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+from utils.analytics import compute_aggregates
 from utils.helpers import generate_insights
 
 
@@ -8,33 +9,37 @@ def render(df):
     """Render Executive Summary page"""
     st.header("Executive Summary")
 
+    # Computed once when the dataset or snapshot was loaded
+    aggregates = st.session_state.get("aggregates") or compute_aggregates(df)
+    metrics = aggregates["metrics"]
+
     col1, col2, col3, col4, col5 = st.columns(5)
 
     with col1:
-        st.metric("Total Videos", f"{len(df):,}")
+        st.metric("Total Videos", f"{metrics['total_videos']:,}")
     with col2:
-        if "Views" in df.columns:
-            st.metric("Total Views", f"{df['Views'].sum():,.0f}")
+        if "total_views" in metrics:
+            st.metric("Total Views", f"{metrics['total_views']:,.0f}")
     with col3:
-        if "Likes" in df.columns:
-            st.metric("Total Likes", f"{df['Likes'].sum():,.0f}")
+        if "total_likes" in metrics:
+            st.metric("Total Likes", f"{metrics['total_likes']:,.0f}")
     with col4:
-        if "Comments" in df.columns:
-            st.metric("Total Comments", f"{df['Comments'].sum():,.0f}")
+        if "total_comments" in metrics:
+            st.metric("Total Comments", f"{metrics['total_comments']:,.0f}")
     with col5:
-        if "Engagement_Rate" in df.columns:
+        if "avg_engagement_rate" in metrics:
             st.metric(
-                "Avg Engagement Rate", f"{df['Engagement_Rate'].mean():.2f}%"
+                "Avg Engagement Rate", f"{metrics['avg_engagement_rate']:.2f}%"
             )
 
     st.write("---")
 
     # Top Channels by Subscribers
-    if "Channel" in df.columns and "Subscribers" in df.columns:
+    channels = aggregates.get("channels")
+    if channels is not None and "Subscribers" in channels.columns:
         st.subheader("Top 10 Channels by Subscribers")
         top_channels = (
-            df.groupby("Channel")["Subscribers"]
-            .first()
+            channels.set_index("Channel")["Subscribers"]
             .sort_values(ascending=True)
             .tail(10)
         )
@@ -62,28 +67,20 @@ def render(df):
         st.plotly_chart(fig, use_container_width=True)
 
     # Category Performance
-    if "Kategori" in df.columns:
+    if "categories" in aggregates:
         st.subheader("Category Account Performance Analysis")
-        cat_analysis = (
-            df.groupby("Kategori")
-            .agg(
-                {
-                    "Views": ["sum", "mean"],
-                    "Engagement_Rate": "mean",
-                    "Judul": "count",
-                }
-            )
-            .round(2)
-        )
-        cat_analysis.columns = [
-            "Total Views",
-            "Avg Views",
-            "Avg Eng Rate",
-            "Video Count",
-        ]
-        cat_analysis = cat_analysis.sort_values("Total Views", ascending=False)
+        cat_analysis = aggregates["categories"].set_index("Kategori")
         st.dataframe(cat_analysis, use_container_width=True)
 
+    # Source Breakdown (several uploads merged)
+    if "Source" in df.columns and df["Source"].nunique() > 1:
+        st.subheader("Source Dataset Breakdown")
+        source_analysis = df.groupby("Source", observed=True).agg(
+            {"Judul": "count", "Views": "sum", "Engagement_Rate": "mean"}
+        ).round(2)
+        source_analysis.columns = ["Video Count", "Total Views", "Avg Eng Rate"]
+        st.dataframe(source_analysis, use_container_width=True)
+
     # Recent Upload Trends
     if "Tanggal Upload" in df.columns:
         st.subheader("Upload Trends (Last 30 Days)")
@@ -4,9 +4,61 @@ import plotly.express as px
 import plotly.graph_objects as go
 import re
 import json
+import time
+import uuid
 from collections import Counter
-from transformers import AutoTokenizer, AutoModelForSequenceClassification, pipeline
-from utils.helpers import split_comments
+from utils.data_loader import COMMENT_TEXT_COLUMN
+from utils.inference_server import MicroBatchServer
+from utils.job_registry import JobRegistry
+from utils.prediction_store import SentimentPredictionStore, model_fingerprint
+from utils.sentiment_resources import (
+    SENTIMENT_BATCH_SIZE,
+    SENTIMENT_MODEL_DIR,
+    build_comment_records,
+    read_sentiment_mappings,
+)
+from utils.sentiment_jobs import SentimentJob
+from utils.text_normalizer import SlangNormalizer
+from utils.lexicon_classifier import LexiconScorer
+from utils.sentiment_sampling import (
+    DEFAULT_SAMPLE_SIZE,
+    MIN_STRATUM_DRAWS,
+    collapse_strata,
+    comment_strata,
+    estimate_shares,
+    stratified_sample,
+)
+
+
+# "server" coalesces comments from all sessions into shared micro-batches,
+# "inprocess" runs the model directly in the calling thread and "pool"
+# shards the comments across SentimentWorkerPool processes
+SENTIMENT_BACKEND = "server"
+SERVER_MAX_BATCH_SIZE = 64
+SERVER_MAX_LATENCY_MS = 25
+SENTIMENT_WORKERS = None
+SENTIMENT_THREADS_PER_WORKER = None
+# Run an int8 dynamically-quantized copy of the model (CPU only)
+SENTIMENT_QUANTIZED = False
+# Background jobs kept (and running at once) per server process, and page
+# refresh interval
+MAX_SENTIMENT_JOBS = 8
+MAX_RUNNING_SENTIMENT_JOBS = 4
+SENTIMENT_POLL_SECONDS = 1.5
+# Cascade mode: lexicon labels confident comments, the rest go to the model
+CASCADE_THRESHOLD = 0.8
+FULL_MODE = "Full analysis"
+ESTIMATE_MODE = "Fast estimate"
+# Settings widget keys and defaults; kept outside the widgets' own state,
+# which Streamlit drops while another page is shown
+SENTIMENT_SETTINGS = {
+    "sentiment_mode": FULL_MODE,
+    "sentiment_sample_size": DEFAULT_SAMPLE_SIZE,
+    "sentiment_cascade": False,
+    "sentiment_cascade_threshold": CASCADE_THRESHOLD,
+}
+# Watcher that keeps a background job running with no session on it
+BACKGROUND_WATCHER = "background"
 
 
 # ==================== SENTIMENT HELPER FUNCTIONS ====================
@@ -25,63 +77,41 @@ def load_stopwords():
 
 @st.cache_resource
 def load_sentiment_mappings():
-    """Load all informal-formal mappings"""
-    mappings = {}
+    """Load all informal-formal mappings once per process"""
+    return read_sentiment_mappings()
 
-    try:
-        file_1 = pd.read_csv("data/informal_formal_1.csv")
-        file_1_map = dict(
-            zip(
-                file_1["transformed"].astype(str).str.lower(),
-                file_1["original-for"].astype(str).str.lower(),
-            )
-        )
-        mappings.update(file_1_map)
-    except:
-        pass
 
-    try:
-        with open("data/informal_formal_2.txt", "r", encoding="utf-8") as f:
-            mappings.update(json.load(f))
-    except:
-        pass
+@st.cache_resource
+def load_slang_normalizer():
+    """Build the slang normalizer once from the informal-formal mappings"""
+    return SlangNormalizer(load_sentiment_mappings())
 
-    try:
-        with open(
-            "data/update_combined_slang_words.txt", "r", encoding="utf-8"
-        ) as f:
-            mappings.update(json.load(f))
-    except:
-        pass
-
-    custom_map = {
-        "apkh": "apakah",
-        "gak": "tidak",
-        "ga": "tidak",
-        "gk": "tidak",
-        "nggk": "tidak",
-        "agar": "supaya",
-        "o on": "bodoh",
-        "blo on": "bodoh",
-        "lekas": "segera",
-        "sbr": "sabar",
-        "nggan": "tidak mau"
-    }
-    mappings.update(custom_map)
 
-    return mappings
+@st.cache_resource
+def load_lexicon_scorer():
+    """Load the positive/negative word lists used by cascade mode"""
+    return LexiconScorer()
 
 
 @st.cache_resource
 def load_sentiment_model():
     """Load sentiment analysis model"""
     try:
-        tokenizer = AutoTokenizer.from_pretrained(
-            "./models/sentiment_analysis"
-        )
-        model = AutoModelForSequenceClassification.from_pretrained(
-            "./models/sentiment_analysis"
+        # torch/transformers are only imported once the model is needed
+        from transformers import (
+            AutoModelForSequenceClassification,
+            AutoTokenizer,
+            pipeline,
         )
+        from utils.sentiment_inference import load_quantized_model
+
+        tokenizer = AutoTokenizer.from_pretrained(SENTIMENT_MODEL_DIR)
+        if SENTIMENT_QUANTIZED:
+            model = load_quantized_model(SENTIMENT_MODEL_DIR)
+        else:
+            model = AutoModelForSequenceClassification.from_pretrained(
+                SENTIMENT_MODEL_DIR
+            )
         sentiment_pipeline = pipeline(
             "sentiment-analysis", model=model, tokenizer=tokenizer
         )
@@ -91,6 +121,403 @@ def load_sentiment_model():
         return None
 
 
+@st.cache_resource
+def load_prediction_store():
+    """Open the on-disk sentiment prediction store shared by all sessions"""
+    try:
+        return SentimentPredictionStore(
+            SENTIMENT_MODEL_DIR, variant="-int8" if SENTIMENT_QUANTIZED else ""
+        )
+    except Exception as e:
+        st.warning(f"Sentiment prediction cache not available: {str(e)}")
+        return None
+
+
+@st.cache_resource
+def load_sentiment_pool():
+    """Start the sentiment worker pool once per server process"""
+    from utils.sentiment_pool import SentimentWorkerPool
+
+    return SentimentWorkerPool(
+        SENTIMENT_MODEL_DIR,
+        workers=SENTIMENT_WORKERS,
+        threads_per_worker=SENTIMENT_THREADS_PER_WORKER,
+        quantized=SENTIMENT_QUANTIZED,
+    )
+
+
+@st.cache_resource
+def load_inference_server(_sentiment_pipeline):
+    """Start the micro-batching inference server once per server process"""
+    from utils.sentiment_inference import classify_comments
+
+    return MicroBatchServer(
+        lambda texts: classify_comments(
+            texts, _sentiment_pipeline, batch_size=SENTIMENT_BATCH_SIZE
+        ),
+        max_batch_size=SERVER_MAX_BATCH_SIZE,
+        max_latency_ms=SERVER_MAX_LATENCY_MS,
+    )
+
+
+def run_classifier(texts, sentiment_pipeline):
+    """Classify texts with the configured backend"""
+    from utils.sentiment_inference import classify_comments
+
+    if SENTIMENT_BACKEND == "pool" and texts:
+        return load_sentiment_pool().classify(
+            texts, batch_size=SENTIMENT_BATCH_SIZE
+        )
+    if SENTIMENT_BACKEND == "server" and texts:
+        return load_inference_server(sentiment_pipeline).classify(texts)
+    return classify_comments(
+        texts, sentiment_pipeline, batch_size=SENTIMENT_BATCH_SIZE
+    )
+
+
+def session_comments():
+    """The session's comment table, without snapshot labels from another model"""
+    comments = st.session_state.get("comments_df")
+    if (
+        comments is not None
+        and "sentiment" in comments.columns
+        and st.session_state.get("sentiment_snapshot")
+        != model_fingerprint(SENTIMENT_MODEL_DIR)
+    ):
+        comments = comments.drop(columns=["sentiment", "score"])
+    return comments
+
+
+@st.cache_resource
+def get_sentiment_jobs():
+    """Process-wide registry of sentiment jobs keyed by dataset and settings"""
+    return JobRegistry(
+        max_jobs=MAX_SENTIMENT_JOBS, max_running=MAX_RUNNING_SENTIMENT_JOBS
+    )
+
+
+def sentiment_job_key(file_id, cascade, sample_size=None):
+    """Registry key of a sentiment job.
+
+    The cascade threshold is not part of the key: it is applied when the
+    job's labels are read (``SentimentJob.set_threshold``).
+    """
+    key = (file_id, "cascade" if cascade else "full")
+    return key + ("sample", sample_size) if sample_size else key
+
+
+def make_sentiment_job(df, sentiment_pipeline, cascade, threshold, sample_size):
+    """Build (without starting) the sentiment job for a dataset.
+
+    With ``sample_size`` the job only labels a stratified sample of the
+    comments; ``job.strata_sizes`` then holds the population per stratum.
+    """
+    # Comment text stays in the text store until a job needs it
+    records = build_comment_records(
+        df,
+        load_slang_normalizer(),
+        session_comments(),
+        (st.session_state.get("text_columns") or {}).get(COMMENT_TEXT_COLUMN),
+    )
+    strata_sizes = None
+    if sample_size:
+        # Few enough strata that each gets MIN_STRATUM_DRAWS within the size
+        records["stratum"] = collapse_strata(
+            comment_strata(records), sample_size // MIN_STRATUM_DRAWS
+        )
+        strata_sizes = records["stratum"].value_counts()
+        records = records.iloc[
+            stratified_sample(records["stratum"], sample_size)
+        ].reset_index(drop=True)
+
+    if "sentiment" in records.columns:
+        job = SentimentJob.from_labels(
+            records["comment_normalized"].tolist(),
+            records.pop("sentiment"),
+            records.pop("score"),
+            records=records,
+        )
+    else:
+        job = SentimentJob(
+            records["comment_normalized"].tolist(),
+            lambda batch: run_classifier(batch, sentiment_pipeline),
+            store=load_prediction_store(),
+            records=records,
+            prefilter=load_lexicon_scorer().score_many if cascade else None,
+            prefilter_threshold=threshold,
+        )
+    job.strata_sizes = strata_sizes
+    return job
+
+
+def start_sentiment_job(
+    file_id,
+    df,
+    sentiment_pipeline,
+    cascade=False,
+    threshold=CASCADE_THRESHOLD,
+    sample_size=None,
+    own=True,
+):
+    """Start the sentiment job for a dataset and settings, or resume it.
+
+    A finished cascade job resumes for the comments a higher threshold
+    routes to the model. With ``own`` the job becomes this session's job,
+    which is cancelled once the session's settings change and no other
+    session shows it; otherwise it runs on in the background.
+    """
+    jobs = get_sentiment_jobs()
+    job_key = sentiment_job_key(file_id, cascade, sample_size)
+    existing = jobs.get(job_key)
+    if existing is not None:
+        existing.set_threshold(threshold)
+    job = jobs.start(
+        job_key,
+        lambda: make_sentiment_job(
+            df, sentiment_pipeline, cascade, threshold, sample_size
+        ),
+    )
+    if own:
+        jobs.watch(job_key, session_id())
+        st.session_state.sentiment_job_key = job_key
+    else:
+        jobs.watch(job_key, BACKGROUND_WATCHER)
+    return job
+
+
+def session_id():
+    """Identifier of this browser session in the job registry"""
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+    return st.session_state.session_id
+
+
+def session_sentiment_job(job_key, threshold):
+    """This session's job for the current settings, or None.
+
+    The session stops watching the job it showed for other settings, which
+    cancels that job unless another session still shows it.
+    """
+    jobs = get_sentiment_jobs()
+    previous = st.session_state.get("sentiment_job_key")
+    if previous is not None and previous != job_key:
+        jobs.release(previous, session_id())
+        st.session_state.sentiment_job_key = None
+    job = jobs.get(job_key)
+    if job is not None:
+        jobs.watch(job_key, session_id())
+        st.session_state.sentiment_job_key = job_key
+        job.set_threshold(threshold)
+    return job
+
+
+def restore_settings():
+    """Seed the settings widgets with this session's last values"""
+    saved = st.session_state.setdefault("sentiment_settings", dict(SENTIMENT_SETTINGS))
+    for key, value in saved.items():
+        if key not in st.session_state:
+            st.session_state[key] = value
+
+
+def save_settings():
+    st.session_state.sentiment_settings = {
+        key: st.session_state[key] for key in SENTIMENT_SETTINGS
+    }
+
+
+def render_run_button(
+    job, file_id, df, sentiment_pipeline, cascade, threshold, sample_size=None
+):
+    """Offer to start (or resume) the analysis for the current settings"""
+    if job is not None and not job.finished:
+        return
+    if job is not None and job.status == "done":
+        if not job.has_pending():
+            return
+        st.info(
+            "Some comments need the model at this threshold; run the "
+            "analysis again to classify them."
+        )
+    if st.button("Run analysis", type="primary", use_container_width=True):
+        try:
+            start_sentiment_job(
+                file_id, df, sentiment_pipeline, cascade, threshold, sample_size
+            )
+        except RuntimeError as e:
+            st.warning(f"⚠️ {str(e)}")
+            return
+        st.rerun()
+
+
+def render_job_progress(job, action):
+    """Show a progress bar with ETA for a running job; return True if running"""
+    labelled, total, eta = job.progress()
+    if not job.finished:
+        eta_text = f" · ETA {eta:,.0f}s" if eta is not None else ""
+        st.progress(
+            labelled / total if total else 0.0,
+            text=f"{action}: {labelled:,} of {total:,} comments{eta_text}",
+        )
+        return True
+    if job.status == "failed":
+        st.error(f"❌ Sentiment analysis failed: {str(job.error)}")
+    elif job.status == "cancelled":
+        st.info("Sentiment analysis was cancelled")
+    elif job.status == "degraded":
+        st.warning(
+            f"⚠️ {job.stats['failed']:,} comments could not be analyzed by the "
+            "model and are left out of the results"
+        )
+    return False
+
+
+def render_job_stats(job, sentiment_pipeline):
+    """Show inference, deduplication and cascade statistics of a job"""
+    stats = job.stats
+    if stats["seconds"] > 0:
+        st.caption(
+            f"Inference: {stats['comments_per_sec']:,.1f} comments/sec "
+            f"({stats['batches']} batches, {stats['seconds']:.1f}s, "
+            f"{stats['cached']:,} from cache)"
+        )
+    elif stats["cached"]:
+        st.caption(f"All {stats['cached']:,} comments loaded from cache")
+    if stats["dedup_ratio"] > 0:
+        st.caption(
+            f"Deduplication: {stats['dedup_ratio']:.1%} of comments "
+            f"collapsed into duplicates ({stats['dedup_seconds']:.2f}s, "
+            f"~{stats['dedup_saved_seconds']:.1f}s of inference saved)"
+        )
+    if stats["cascade_labelled"]:
+        agreement = stats["cascade_agreement"]
+        agreement_text = (
+            f", {agreement:.1%} agreement with the model on a sample"
+            if agreement is not None
+            else ""
+        )
+        st.caption(
+            f"Cascade: {stats['cascade_labelled']:,} comments labelled by "
+            f"the lexicon, {stats['routed_to_model']:.1%} routed to the "
+            f"model{agreement_text}"
+        )
+    if SENTIMENT_BACKEND == "server":
+        with st.expander("Inference server metrics"):
+            metrics = load_inference_server(sentiment_pipeline).metrics()
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Queue Depth", f"{metrics['queue_depth']:,}")
+            col2.metric("Avg Batch Size", f"{metrics['avg_batch_size']:.1f}")
+            col3.metric("p50 Latency", f"{metrics['p50_latency_ms']:,.0f} ms")
+            col4.metric("p95 Latency", f"{metrics['p95_latency_ms']:,.0f} ms")
+
+
+def render_sentiment_estimate(
+    file_id, df, sentiment_pipeline, sample_size, cascade, threshold
+):
+    """Render the fast estimate mode; return True while any job is running"""
+    job = session_sentiment_job(
+        sentiment_job_key(file_id, cascade, sample_size), threshold
+    )
+    render_run_button(
+        job, file_id, df, sentiment_pipeline, cascade, threshold, sample_size
+    )
+    if job is None:
+        return False
+    running = render_job_progress(job, "Classifying sample")
+    sample_df = job.snapshot()
+
+    if len(sample_df) > 0:
+        st.subheader("Estimated Sentiment Distribution")
+        st.caption(
+            f"Estimated from a stratified sample of {len(sample_df):,} of "
+            f"{int(job.strata_sizes.sum()):,} comments (by upload date), "
+            f"with 95% confidence intervals"
+        )
+        render_job_stats(job, sentiment_pipeline)
+
+        estimate = estimate_shares(sample_df, job.strata_sizes)
+        cols = st.columns(3)
+        for col, (_, row) in zip(cols, estimate.iterrows()):
+            col.metric(
+                row["sentiment"],
+                f"{row['share']:.1%}",
+                f"± {row['margin']:.1%}",
+                delta_color="off",
+            )
+
+        fig = px.bar(
+            estimate,
+            x="sentiment",
+            y="share",
+            error_y=estimate["ci_high"] - estimate["share"],
+            error_y_minus=estimate["share"] - estimate["ci_low"],
+            color="sentiment",
+            color_discrete_map={
+                "Positive": "#4A90E2",
+                "Negative": "#e74c3c",
+                "Neutral": "#95a5a6",
+            },
+            labels={"sentiment": "Sentiment", "share": "Estimated Share"},
+            title="Estimated Sentiment Share (95% CI)",
+        )
+        fig.update_layout(showlegend=False, yaxis_tickformat=".0%")
+        st.plotly_chart(fig, use_container_width=True)
+
+        dated = sample_df.assign(
+            tanggal_upload=pd.to_datetime(
+                sample_df["tanggal_upload"], errors="coerce"
+            )
+        ).dropna(subset=["tanggal_upload"])
+        if len(dated) > 0:
+            trend = (
+                dated.groupby([dated["tanggal_upload"].dt.date, "sentiment"])
+                .size()
+                .groupby(level=0)
+                .transform(lambda s: s / s.sum())
+                .reset_index(name="share")
+            )
+            fig = px.line(
+                trend,
+                x="tanggal_upload",
+                y="share",
+                color="sentiment",
+                title="Estimated Sentiment Trend (sample)",
+                labels={"tanggal_upload": "Date", "share": "Share of Comments"},
+                color_discrete_map={
+                    "Positive": "#2ecc71",
+                    "Negative": "#e74c3c",
+                    "Neutral": "#95a5a6",
+                },
+                markers=True,
+            )
+            fig.update_layout(hovermode="x unified", yaxis_tickformat=".0%")
+            st.plotly_chart(fig, use_container_width=True)
+
+    # Offer the full pass in the background
+    full_key = sentiment_job_key(file_id, cascade)
+    full_job = get_sentiment_jobs().get(full_key)
+    if full_job is not None:
+        full_job.set_threshold(threshold)
+    if full_job is None or full_job.status in ("failed", "cancelled"):
+        if st.button("Finish full analysis in background", use_container_width=True):
+            try:
+                start_sentiment_job(
+                    file_id, df, sentiment_pipeline, cascade, threshold, own=False
+                )
+            except RuntimeError as e:
+                st.warning(f"⚠️ {str(e)}")
+            else:
+                st.rerun()
+    elif render_job_progress(full_job, "Full analysis"):
+        running = True
+    elif full_job.status in ("done", "degraded"):
+        st.success(
+            f"Full analysis finished. Switch to '{FULL_MODE}' to see all "
+            f"{len(full_job.texts):,} comments."
+        )
+
+    return running
+
+
 def normalize_text(text, mappings):
     """Normalize text by converting informal/slang to formal"""
     text = str(text)
@@ -129,7 +556,6 @@ def render(df):
     st.header("Sentiment & Comment Analysis")
 
     # Load resources
-    sentiment_mappings = load_sentiment_mappings()
     sentiment_pipeline = load_sentiment_model()
 
     st.write("---")
@@ -185,54 +611,90 @@ def render(df):
     st.write("---")
 
     # ==================== SENTIMENT ANALYSIS ====================
-    if sentiment_pipeline is not None:
-        if "Komentar Lengkap" in df.columns:
-            # Auto-process sentiment analysis
-            if "sentiment_results_cache" not in st.session_state:
-                with st.spinner(
-                    "Processing comments and analyzing sentiment..."
-                ):
-                    sentiment_results = []
-
-                    for idx, row in df.iterrows():
-                        if pd.isna(row.get("Komentar Lengkap")):
-                            continue
-
-                        comments_list = split_comments(row["Komentar Lengkap"])
-
-                        for comment in comments_list:
-                            normalized = normalize_text(
-                                comment, sentiment_mappings
-                            )
-                            sentiment = analyze_sentiment(
-                                normalized, sentiment_pipeline
-                            )
-
-                            sentiment_results.append(
-                                {
-                                    "video_id": row.get("Video ID", idx),
-                                    "tanggal_upload": row.get(
-                                        "Tanggal Upload", None
-                                    ),
-                                    "comment_raw": comment,
-                                    "comment_normalized": normalized,
-                                    "sentiment": sentiment,
-                                }
-                            )
-
-                    if sentiment_results:
-                        st.session_state.sentiment_results_cache = pd.DataFrame(
-                            sentiment_results
-                        )
-                    else:
-                        st.session_state.sentiment_results_cache = None
+    job_running = False
+    comments_df = session_comments()
+    precomputed = comments_df is not None and "sentiment" in comments_df.columns
+    if sentiment_pipeline is not None or precomputed:
+        # The comment table is split at load time, so the raw (lazily
+        # stored) "Komentar Lengkap" column is never materialized here
+        if comments_df is not None or "Komentar Lengkap" in df.columns:
+            restore_settings()
+            with st.expander("Analysis Settings"):
+                mode = st.radio(
+                    "Mode",
+                    [FULL_MODE, ESTIMATE_MODE],
+                    horizontal=True,
+                    key="sentiment_mode",
+                )
+                sample_size = st.number_input(
+                    "Sample size (fast estimate)",
+                    min_value=100,
+                    max_value=50000,
+                    step=500,
+                    key="sentiment_sample_size",
+                    disabled=mode != ESTIMATE_MODE,
+                )
+                cascade = st.checkbox(
+                    "Cascade mode (lexicon first, model for ambiguous comments)",
+                    key="sentiment_cascade",
+                )
+                threshold = st.slider(
+                    "Lexicon confidence threshold",
+                    min_value=0.5,
+                    max_value=1.0,
+                    step=0.05,
+                    key="sentiment_cascade_threshold",
+                    disabled=not cascade,
+                )
+            save_settings()
 
-            # Get results from cache
-            results_df = st.session_state.sentiment_results_cache
+            # Sentiment runs as a background job shared by every rerun
+            file_id = st.session_state.get(
+                "dataset_key", st.session_state.get("current_file_id")
+            )
+            if mode == ESTIMATE_MODE:
+                job_running = render_sentiment_estimate(
+                    file_id,
+                    df,
+                    sentiment_pipeline,
+                    int(sample_size),
+                    cascade,
+                    threshold,
+                )
+                results_df = None
+            else:
+                job_key = sentiment_job_key(file_id, cascade)
+                job = session_sentiment_job(job_key, threshold)
+                if job is None and precomputed:
+                    # Labels from a snapshot need no model run
+                    job = start_sentiment_job(
+                        file_id, df, sentiment_pipeline, cascade, threshold
+                    )
+                render_run_button(
+                    job, file_id, df, sentiment_pipeline, cascade, threshold
+                )
+                job_running = job is not None and render_job_progress(
+                    job, "Analyzing sentiment"
+                )
+                results_df = job.snapshot() if job is not None else None
+                if (
+                    job is not None
+                    and not cascade
+                    and job.status in ("done", "degraded")
+                ):
+                    # Model labels the sidebar's "Save snapshot" writes out
+                    st.session_state.sentiment_result = {
+                        "dataset_key": file_id,
+                        "job": job,
+                        "model_fingerprint": model_fingerprint(SENTIMENT_MODEL_DIR),
+                    }
+
+                if results_df is not None and len(results_df) > 0:
+                    if not job_running:
+                        st.success(f"Analyzed {len(results_df)} comments")
+                    render_job_stats(job, sentiment_pipeline)
 
             if results_df is not None and len(results_df) > 0:
-                st.success(f"Analyzed {len(results_df)} comments")
-
                 # ==================== 1. TOTAL SENTIMENT OVERVIEW ====================
                 st.subheader("Total Sentiment Overview")
 
@@ -450,7 +912,7 @@ def render(df):
                     mime="text/csv",
                     use_container_width=True,
                 )
-            else:
+            elif results_df is not None and not job_running:
                 st.info("No comments found for analysis")
         else:
             st.info(
@@ -480,4 +942,9 @@ def render(df):
         labels={"x": "Engagement Quality", "y": "Number of Videos"},
         title="Distribution of Engagement Quality",
     )
-    st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Poll the background job until every comment is labelled
+    if job_running:
+        time.sleep(SENTIMENT_POLL_SECONDS)
+        st.rerun()
@@ -1,22 +1,140 @@
+import os
+import time
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
-import re
-import joblib
+from utils.job_registry import JobRegistry
+from utils.topic_model import (
+    assign_topics,
+    load_topic_model,
+    model_hash,
+    top_videos_by_topic,
+    topic_keywords,
+    topic_texts,
+)
+from utils.topic_refresh import TopicRefreshJob, list_topic_models
+
+TOP_VIDEOS_PER_TOPIC = 5
+MAX_REFRESH_JOBS = 4
+MAX_RUNNING_REFRESH_JOBS = 2
+REFRESH_POLL_SECONDS = 1.0
+
+
+@st.cache_resource(max_entries=4)
+def load_nmf_package(path, digest):
+    """Load the NMF package once per process and model file hash"""
+    return load_topic_model(path)
+
+
+@st.cache_resource(max_entries=8)
+def load_topic_assignment(dataset_id, digest, _df, _nmf_package, _precomputed=None):
+    """Topic vector, dominant topic, confidence and top videos of every
+    video, computed once per dataset and model hash.
+
+    ``_precomputed`` is a snapshot's ``{"model_hash", "weights"}``; its
+    topic columns are used only when they came from this model.
+    """
+    if (
+        _precomputed is not None
+        and _precomputed["model_hash"] == digest
+        and "topic" in _df.columns
+    ):
+        topics = _df["topic"].to_numpy()
+        confidences = _df["topic_confidence"].to_numpy()
+        weights = _precomputed["weights"]
+    else:
+        topics, confidences, weights = assign_topics(_df, _nmf_package)
+    return {
+        "topic": topics,
+        "topic_confidence": confidences,
+        "weights": weights,
+        "top_videos": (
+            top_videos_by_topic(topics, _df["Views"], TOP_VIDEOS_PER_TOPIC)
+            if "Views" in _df.columns
+            else {}
+        ),
+    }
+
+
+@st.cache_resource
+def get_topic_refresh_jobs():
+    """Process-wide registry of topic refresh jobs keyed by dataset and model"""
+    return JobRegistry(
+        max_jobs=MAX_REFRESH_JOBS, max_running=MAX_RUNNING_REFRESH_JOBS
+    )
+
+
+def dataset_label():
+    """Short name of the loaded files or snapshot, recorded with new versions"""
+    file_id = st.session_state.get("current_file_id", "")
+    if file_id.startswith("snapshot:"):
+        return os.path.basename(file_id[len("snapshot:") :].rsplit(":", 1)[0])
+    return ", ".join(part.rsplit("_", 1)[0] for part in file_id.split("|"))
+
+
+def render_topic_refresh(dataset_id, df, nmf_package):
+    """Offer an online topic update on this dataset; return True while running"""
+    jobs = get_topic_refresh_jobs()
+    job_key = (dataset_id, nmf_package["model_hash"])
+    job = jobs.get(job_key)
+    with st.expander("🔄 Update topics from this dataset", expanded=job is not None):
+        st.caption(
+            "Continues training the selected model on these titles and tags "
+            "with MiniBatchNMF, adding their new vocabulary, and saves the "
+            "result as a new model version."
+        )
+        if job is None or job.status in ("failed", "cancelled"):
+            if job is not None and job.status == "failed":
+                st.error(f"❌ Topic update failed: {str(job.error)}")
+            if st.button("Update topics", use_container_width=True):
+                try:
+                    jobs.start(
+                        job_key,
+                        lambda: TopicRefreshJob(
+                            topic_texts(df), nmf_package, source=dataset_label()
+                        ),
+                    )
+                except RuntimeError as e:
+                    st.warning(f"⚠️ {str(e)}")
+                else:
+                    st.rerun()
+            return False
+        steps, total = job.progress()
+        if not job.finished:
+            st.progress(
+                steps / total if total else 0.0,
+                text=f"Updating topics: {steps:,} of {total:,} batches",
+            )
+            if st.button("Cancel update", use_container_width=True):
+                jobs.cancel(job_key)
+            return True
+        st.success(
+            f"✅ Saved {job.path} ({job.stats['documents']:,} documents, "
+            f"{job.stats['new_terms']:,} new terms, {job.stats['seconds']:.1f}s). "
+            "Select it under Topic model version."
+        )
+    return False
 
 
 def render(df):
     """Render Topic Analysis page"""
     st.header("Topic Analysis")
 
+    # Refreshed versions sit next to the shipped model; options are paths
+    # so the selection survives new versions being added
+    labels = {path: label for label, path in list_topic_models()}
+    model_path = st.selectbox(
+        "Topic model version",
+        list(labels),
+        format_func=labels.get,
+        key="topic_model_version",
+    )
+
     # Load NMF Model
     try:
-        nmf_package = joblib.load("models/topic_modeling/nmf_model.pkl")
-        nmf_model = nmf_package["nmf_model"]
-        tfidf_vectorizer = nmf_package["tfidf"]
-        feature_names = nmf_package["feature_names"]
+        # A replaced model file changes the hash and is loaded afresh
+        nmf_package = load_nmf_package(model_path, model_hash(model_path))
         n_topics = nmf_package["n_topics"]
         model_loaded = True
     except:
@@ -30,6 +148,10 @@ def render(df):
         all_titles = " ".join(df["Judul"].astype(str).values)
 
         try:
+            # wordcloud/matplotlib are only imported for this chart
+            from wordcloud import WordCloud
+            import matplotlib.pyplot as plt
+
             wordcloud = WordCloud(
                 width=1200,
                 height=400,
@@ -56,15 +178,10 @@ def render(df):
         # Display Topics
         st.markdown("#### Discovered Topics")
 
-        n_words = 10
-        topic_data = []
-
-        for i, comp in enumerate(nmf_model.components_):
-            top_idx = comp.argsort()[-n_words:][::-1]
-            top_words = [feature_names[j] for j in top_idx]
-            topic_data.append(
-                {"Topic": f"Topic {i+1}", "Keywords": ", ".join(top_words[:10])}
-            )
+        topic_data = [
+            {"Topic": f"Topic {i+1}", "Keywords": ", ".join(top_words)}
+            for i, top_words in enumerate(topic_keywords(nmf_package))
+        ]
 
         # Display as cards
         cols = st.columns(2)
@@ -85,45 +202,34 @@ def render(df):
 
         st.write("---")
 
+        dataset_id = st.session_state.get(
+            "dataset_key", st.session_state.get("current_file_id")
+        )
+
         # Apply NMF to current data
         try:
-            # Preprocess current data
-            def preprocess_text(text):
-                if pd.isna(text):
-                    return ""
-                text = str(text).lower()
-                text = re.sub(r"http\S+|www\S+|https\S+", "", text)
-                text = re.sub(r"[^a-zA-Z\s]", " ", text)
-                text = " ".join(text.split())
-                return text
-
-            df_temp = df.copy()
-            df_temp["combined_text"] = (
-                df_temp["Judul"].fillna("")
-                + " "
-                + (
-                    df_temp["Total Video Cha Tags"].fillna("")
-                    if "Total Video Cha Tags" in df_temp.columns
-                    else ""
-                )
-            )
-            df_temp["processed_text"] = df_temp["combined_text"].apply(
-                preprocess_text
+            assignment = load_topic_assignment(
+                dataset_id,
+                nmf_package["model_hash"],
+                df,
+                nmf_package,
+                st.session_state.get("topic_snapshot"),
             )
-
-            # Transform with loaded vectorizer
-            tfidf_matrix = tfidf_vectorizer.transform(df_temp["processed_text"])
-            nmf_topics = nmf_model.transform(tfidf_matrix)
-
-            df_temp["topic"] = nmf_topics.argmax(axis=1)
-            df_temp["topic_confidence"] = nmf_topics.max(axis=1)
+            # Kept for the sidebar's "Save snapshot"
+            st.session_state.topic_result = {
+                "dataset_key": dataset_id,
+                "model_hash": nmf_package["model_hash"],
+                "keywords": topic_keywords(nmf_package),
+                "assignment": assignment,
+            }
+            topics = pd.Series(assignment["topic"], index=df.index, name="topic")
 
             # Topic Distribution
             st.markdown("#### Topic Distribution")
             col1, col2 = st.columns(2)
 
             with col1:
-                topic_dist = df_temp["topic"].value_counts().sort_index()
+                topic_dist = topics.value_counts().sort_index()
                 topic_labels = [f"Topic {i+1}" for i in topic_dist.index]
 
                 fig = px.pie(
@@ -139,9 +245,10 @@ def render(df):
 
             with col2:
                 # Topic Performance
-                if "Views" in df_temp.columns:
+                if "Views" in df.columns:
                     topic_perf = (
-                        df_temp.groupby("topic")["Views"]
+                        df["Views"]
+                        .groupby(topics)
                         .agg(["sum", "mean", "count"])
                         .reset_index()
                     )
@@ -178,13 +285,11 @@ def render(df):
             )
 
             topic_idx = int(selected_topic.split()[1]) - 1
-            topic_videos = (
-                df_temp[df_temp["topic"] == topic_idx]
-                .nlargest(5, "Views")[
-                    ["Judul", "Views", "Likes", "Comments", "topic_confidence"]
-                ]
-                .reset_index(drop=True)
-            )
+            rows = assignment["top_videos"].get(topic_idx, [])
+            topic_videos = df.iloc[rows][
+                ["Judul", "Views", "Likes", "Comments"]
+            ].reset_index(drop=True)
+            topic_videos["topic_confidence"] = assignment["topic_confidence"][rows]
 
             if len(topic_videos) > 0:
                 for idx, row in topic_videos.iterrows():
@@ -211,4 +316,11 @@ def render(df):
         except Exception as e:
             st.error(f"Error applying topic model: {str(e)}")
 
-        st.write("---")
\ No newline at end of file
+        st.write("---")
+
+        # Train a new model version on this dataset in the background
+        if "Judul" in df.columns and render_topic_refresh(
+            dataset_id, df, nmf_package
+        ):
+            time.sleep(REFRESH_POLL_SECONDS)
+            st.rerun()
@@ -1,26 +1,29 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from utils import analytics
 
 
 def render(df):
     """Render View & Reach Analytics page"""
     st.header("View & Reach Analytics")
 
+    # Computed once when the dataset or snapshot was loaded
+    aggregates = st.session_state.get("aggregates") or analytics.compute_aggregates(df)
+    metrics = aggregates["metrics"]
+
     # Key Metrics Section
     st.markdown("### Key Performance Metrics")
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
-        st.metric("Total Views", f"{df['Views'].sum():,.0f}")
+        st.metric("Total Views", f"{metrics['total_views']:,.0f}")
     with col2:
-        st.metric("Avg Views/Video", f"{df['Views'].mean():,.0f}")
+        st.metric("Avg Views/Video", f"{metrics['avg_views']:,.0f}")
     with col3:
-        st.metric("Max Views", f"{df['Views'].max():,.0f}")
+        st.metric("Max Views", f"{metrics['max_views']:,.0f}")
     with col4:
-        median_views = df["Views"].median()
-        st.metric("Median Views", f"{median_views:,.0f}")
+        st.metric("Median Views", f"{metrics['median_views']:,.0f}")
 
     st.write("")
     st.markdown("---")
@@ -65,18 +68,10 @@ def render(df):
     st.write("")
 
     # Views Over Time
-    if "Tanggal Upload" in df.columns:
+    if "daily_views" in aggregates:
         st.markdown("### Views Growth Trends")
 
-        daily_views = (
-            df.groupby(df["Tanggal Upload"].dt.date)["Views"]
-            .sum()
-            .reset_index()
-        )
-        daily_views.columns = ["Date", "Total Views"]
-        daily_views["Date"] = pd.to_datetime(daily_views["Date"])
-        daily_views = daily_views.sort_values("Date")
-        daily_views["Cumulative Views"] = daily_views["Total Views"].cumsum()
+        daily_views = aggregates["daily_views"]
 
         col1, col2 = st.columns(2)
 
@@ -133,16 +128,10 @@ def render(df):
     st.write("")
 
     # Monthly Views
-    if "Tanggal Upload" in df.columns:
+    if "monthly_views" in aggregates:
         st.markdown("### Monthly Total Views Analysis")
 
-        monthly_views = (
-            df.groupby(df["Tanggal Upload"].dt.to_period("M"))["Views"]
-            .sum()
-            .reset_index()
-        )
-        monthly_views.columns = ["Month", "Total Views"]
-        monthly_views["Month"] = monthly_views["Month"].astype(str)
+        monthly_views = aggregates["monthly_views"]
 
         fig = px.line(
             monthly_views,
@@ -174,16 +163,11 @@ def render(df):
     st.write("")
 
     # View Spikes Detection
-    if "Tanggal Upload" in df.columns:
+    if "view_spikes" in aggregates:
         st.markdown("### View Spikes Detection")
 
-        mean_views = daily_views["Total Views"].mean()
-        std_views = daily_views["Total Views"].std()
-        spike_threshold = mean_views + (2 * std_views)
-
-        spikes = daily_views[
-            daily_views["Total Views"] > spike_threshold
-        ].copy()
+        spikes = aggregates["view_spikes"]
+        spike_threshold = metrics["spike_threshold"]
 
         if len(spikes) > 0:
             col1, col2 = st.columns([3, 1])
@@ -288,16 +272,15 @@ def render(df):
     st.write("")
 
     # Views by Channel
-    if "Channel" in df.columns:
+    if "channels" in aggregates:
         st.markdown("### Channel Performance Analysis")
+        channels = aggregates["channels"].set_index("Channel")
 
         col1, col2 = st.columns(2)
 
         with col1:
             st.markdown("#### Top 10 Channels by Total Views")
-            channel_views = (
-                df.groupby("Channel")["Views"].sum().nlargest(10).sort_values()
-            )
+            channel_views = channels["Total Views"].nlargest(10).sort_values()
             fig = px.bar(
                 x=channel_views.values,
                 y=channel_views.index,
@@ -322,9 +305,7 @@ def render(df):
 
         with col2:
             st.markdown("#### Top 10 Channels by Average Views")
-            channel_avg_views = (
-                df.groupby("Channel")["Views"].mean().nlargest(10).sort_values()
-            )
+            channel_avg_views = channels["Avg Views"].nlargest(10).sort_values()
             fig = px.bar(
                 x=channel_avg_views.values,
                 y=channel_avg_views.index,
@@ -357,7 +338,7 @@ def render(df):
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
-        total_reach = df["Views"].sum()
+        total_reach = metrics["total_views"]
         st.metric(
             "Total Reach",
             f"{total_reach:,.0f}",
@@ -365,7 +346,7 @@ def render(df):
         )
 
     with col2:
-        unique_viewers_estimate = df["Views"].sum() * 0.7
+        unique_viewers_estimate = metrics["total_views"] * 0.7
         st.metric(
             "Est. Unique Viewers",
             f"{unique_viewers_estimate:,.0f}",
@@ -373,10 +354,8 @@ def render(df):
         )
 
     with col3:
-        if "Subscribers" in df.columns:
-            total_potential_reach = (
-                df.groupby("Channel")["Subscribers"].first().sum()
-            )
+        if "potential_reach" in metrics:
+            total_potential_reach = metrics["potential_reach"]
             st.metric(
                 "Potential Reach",
                 f"{total_potential_reach:,.0f}",
@@ -385,12 +364,8 @@ def render(df):
 
     with col4:
         avg_views_per_subscriber = (
-            (
-                df["Views"].sum()
-                / df.groupby("Channel")["Subscribers"].first().sum()
-                * 100
-            )
-            if "Subscribers" in df.columns
+            metrics["total_views"] / metrics["potential_reach"] * 100
+            if "potential_reach" in metrics
             else 0
         )
         st.metric(
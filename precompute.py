@@ -0,0 +1,216 @@
+"""
+Precompute every page's analytics for one or more crawl files, without the UI.
+
+Runs the same ingestion as the dashboard (parsing, derivations, Video ID
+merge), labels comment sentiment, assigns NMF topics and writes the
+processed data plus page aggregates to a snapshot directory that the
+sidebar can open directly. An existing snapshot built from the same
+input files (by content hash), options and models is left alone unless
+--force.
+
+Usage (from the project root):
+    python precompute.py data/data_semeru.csv [data/data_bensin.csv ...]
+        [--out snapshots/NAME] [--no-sentiment] [--sentiment-model DIR]
+        [--no-topics] [--force]
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from utils.analytics import compute_aggregates
+from utils.data_loader import (
+    COMMENT_TEXT_COLUMN,
+    combine_datasets,
+    combined_key,
+    dataset_key,
+    load_dataset,
+    source_name,
+)
+from utils.helpers import optimize_dtypes
+from utils.prediction_store import model_fingerprint
+from utils.sentiment_resources import SENTIMENT_MODEL_DIR
+from utils.snapshot import (
+    SNAPSHOT_ROOT,
+    SNAPSHOT_VERSION,
+    file_fingerprint,
+    is_snapshot,
+    read_manifest,
+    write_snapshot,
+)
+from utils.topic_model import (
+    TOPIC_MODEL_PATH,
+    assign_topics,
+    load_topic_model,
+    model_hash,
+    topic_keywords,
+)
+
+
+def log(message):
+    print(message, file=sys.stderr, flush=True)
+
+
+def load_files(paths, text_dir):
+    """Load and merge the input files; returns (key, df, comments, text_columns)"""
+    datasets, keys = [], []
+    for i, path in enumerate(paths):
+        with open(path, "rb") as f:
+            upload = io.BytesIO(f.read())
+        upload.name = os.path.basename(path)
+        keys.append(dataset_key(upload.getvalue(), upload.name))
+
+        start = time.perf_counter()
+        df, comments, failed_dates, text_columns = load_dataset(
+            upload, text_dir=os.path.join(text_dir, str(i))
+        )
+        df, _ = optimize_dtypes(df)
+        if comments is not None:
+            comments, _ = optimize_dtypes(comments, ["video_id"])
+        log(
+            f"{path}: {len(df):,} videos, "
+            f"{len(comments) if comments is not None else 0:,} comments, "
+            f"{failed_dates} unparsed dates ({time.perf_counter() - start:.1f}s)"
+        )
+        datasets.append((source_name(path), df, comments, text_columns))
+
+    df, comments, text_columns, duplicates, _ = combine_datasets(datasets)
+    if duplicates:
+        log(f"{duplicates:,} duplicate videos merged")
+    return combined_key(keys), df, comments, text_columns
+
+
+def label_sentiment(df, comments, comment_text, model_dir):
+    """Add sentiment/score columns to the comment table"""
+    from utils.prediction_store import SentimentPredictionStore
+    from utils.sentiment_inference import classify_comments, load_classifier
+    from utils.sentiment_jobs import SentimentJob
+    from utils.sentiment_resources import (
+        SENTIMENT_BATCH_SIZE,
+        build_comment_records,
+        read_sentiment_mappings,
+    )
+    from utils.text_normalizer import SlangNormalizer
+
+    classifier = load_classifier(model_dir)
+    normalizer = SlangNormalizer(read_sentiment_mappings())
+    records = build_comment_records(df, normalizer, comments, comment_text)
+    job = SentimentJob(
+        records["comment_normalized"].tolist(),
+        lambda texts: classify_comments(
+            texts, classifier, batch_size=SENTIMENT_BATCH_SIZE
+        ),
+        store=SentimentPredictionStore(model_dir),
+        records=records,
+    ).run()
+    if job.error is not None:
+        raise job.error
+    if job.stats["failed"]:
+        log(f"sentiment: {job.stats['failed']:,} comments could not be labelled")
+
+    comments = comments.copy()
+    comments["sentiment"] = pd.Categorical(job.labels)
+    comments["score"] = job.scores
+    log(
+        f"sentiment: {len(comments):,} comments, {job.stats['cached']:,} groups "
+        f"from the prediction store, {job.stats['comments_per_sec']:.0f} comments/s"
+    )
+    return comments
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("paths", nargs="+", help="CSV/XLSX crawl files")
+    parser.add_argument("--out", help=f"snapshot directory (default: {SNAPSHOT_ROOT}/<names>)")
+    parser.add_argument("--no-sentiment", action="store_true")
+    parser.add_argument("--sentiment-model", help="model directory (default: the app's)")
+    parser.add_argument("--no-topics", action="store_true")
+    parser.add_argument("--force", action="store_true", help="rebuild even if up to date")
+    args = parser.parse_args()
+
+    out = args.out or os.path.join(
+        SNAPSHOT_ROOT, "+".join(source_name(path) for path in args.paths)
+    )
+    start = time.perf_counter()
+    sentiment_model_dir = args.sentiment_model or SENTIMENT_MODEL_DIR
+
+    sources = [file_fingerprint(path) for path in args.paths]
+    options = {
+        "sentiment": not args.no_sentiment,
+        "sentiment_model": args.sentiment_model,
+        "topics": not args.no_topics,
+    }
+    if not args.force and is_snapshot(out):
+        manifest = read_manifest(out)
+        if (
+            manifest.get("version") == SNAPSHOT_VERSION
+            and [s["sha256"] for s in manifest.get("sources", [])]
+            == [s["sha256"] for s in sources]
+            and manifest.get("options") == options
+            and (
+                manifest.get("topics") is None
+                or manifest["topics"].get("model_hash") == model_hash(TOPIC_MODEL_PATH)
+            )
+            and (
+                manifest.get("sentiment") is None
+                or manifest["sentiment"].get("model_fingerprint")
+                == model_fingerprint(sentiment_model_dir)
+            )
+        ):
+            log(f"{out} is up to date (use --force to rebuild)")
+            return
+
+    with tempfile.TemporaryDirectory() as text_dir:
+        key, df, comments, text_columns = load_files(args.paths, text_dir)
+
+        sentiment_fingerprint = None
+        if comments is not None and not args.no_sentiment:
+            try:
+                comments = label_sentiment(
+                    df,
+                    comments,
+                    text_columns.get(COMMENT_TEXT_COLUMN),
+                    sentiment_model_dir,
+                )
+                sentiment_fingerprint = model_fingerprint(sentiment_model_dir)
+            except Exception as e:
+                log(f"sentiment skipped: {e}")
+
+        keywords = weights = topics_hash = None
+        if not args.no_topics and "Judul" in df.columns:
+            try:
+                nmf_package = load_topic_model()
+                topics, confidences, weights = assign_topics(df, nmf_package)
+                df = df.copy(deep=False)
+                df["topic"] = topics
+                df["topic_confidence"] = confidences
+                keywords = topic_keywords(nmf_package)
+                topics_hash = nmf_package["model_hash"]
+            except Exception as e:
+                log(f"topics skipped: {e}")
+
+        write_snapshot(
+            out,
+            key,
+            df,
+            comments,
+            text_columns,
+            sources,
+            topic_weights=weights,
+            topic_keywords=keywords,
+            topic_model_hash=topics_hash,
+            sentiment_model=sentiment_fingerprint,
+            aggregates=compute_aggregates(df),
+            options=options,
+        )
+
+    log(f"snapshot written to {out} ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
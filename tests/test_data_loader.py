@@ -0,0 +1,60 @@
+import os
+
+import pandas as pd
+import pytest
+
+from utils.data_loader import COMMENT_TEXT_COLUMN, _stream_chunks, merge_datasets
+
+
+def failing_chunks():
+    yield pd.DataFrame({"Judul": ["a", "b"], "Description": ["panjang", None]})
+    raise ValueError("malformed row")
+
+
+def test_failed_pass_leaves_no_temporary_text_files(tmp_path):
+    text_dir = str(tmp_path / "text")
+    with pytest.raises(ValueError):
+        _stream_chunks(failing_chunks(), lambda: 0.0, None, text_dir)
+
+    assert os.listdir(text_dir) == []
+
+
+def comment_chunks(ids, comments):
+    yield pd.DataFrame(
+        {"Video ID": ids, "Views": [1] * len(ids), "Komentar Lengkap": comments}
+    )
+
+
+def comment_texts(comments, text_columns):
+    column = text_columns[COMMENT_TEXT_COLUMN]
+    return column.take(range(len(comments)))
+
+
+def test_comment_text_is_kept_in_the_text_store(tmp_path):
+    df, comments, _, text_columns = _stream_chunks(
+        comment_chunks(["a", "b"], ["satu || dua", "tiga"]),
+        lambda: 0.0,
+        None,
+        str(tmp_path / "text"),
+    )
+
+    assert "text" not in comments.columns
+    assert "Komentar Lengkap" not in df.columns
+    assert comment_texts(comments, text_columns) == ["satu", "dua", "tiga"]
+
+
+def test_merged_comments_point_at_their_text(tmp_path):
+    datasets = []
+    for part, (ids, texts) in enumerate(
+        [(["a", "b"], ["lama a", "lama b"]), (["b", "c"], ["baru b", "baru c"])]
+    ):
+        df, comments, _, text_columns = _stream_chunks(
+            comment_chunks(ids, texts), lambda: 0.0, None, str(tmp_path / str(part))
+        )
+        datasets.append((str(part), df, comments, text_columns))
+
+    df, comments, text_columns, duplicates = merge_datasets(datasets)
+
+    assert duplicates == 1
+    assert comments["video_id"].tolist() == ["a", "b", "c"]
+    assert comment_texts(comments, text_columns) == ["lama a", "baru b", "baru c"]
@@ -0,0 +1,35 @@
+import pandas as pd
+
+from utils.dataset_cache import DatasetCache
+
+
+def make_frames():
+    df = pd.DataFrame({"Views": [100, 200], "Likes": [10, 30], "Durasi": ["PT1M", "PT2M"]})
+    return {"df": df, "comments": None}
+
+
+def test_page_column_writes_do_not_reach_the_cache():
+    cache = DatasetCache()
+    frames = make_frames()
+    cache.put("key", frames, {"failed_dates": 0})
+    nbytes = cache.nbytes
+
+    # A session keeps the frame it loaded on a miss and pages write into it
+    session_df = frames["df"]
+    session_df["Like_Rate"] = session_df["Likes"] / session_df["Views"] * 100
+    hit_df = cache.get("key")[0]["df"]
+    hit_df["Duration_Minutes"] = [1.0, 2.0]
+
+    cached = cache.get("key")[0]["df"]
+    assert list(cached.columns) == ["Views", "Likes", "Durasi"]
+    assert cache.nbytes == nbytes
+
+
+def test_missing_frames_round_trip_as_none():
+    cache = DatasetCache()
+    cache.put("key", make_frames())
+
+    frames, meta = cache.get("key")
+    assert frames["comments"] is None
+    assert meta == {}
+    assert cache.get("other") is None
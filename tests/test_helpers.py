@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from utils.helpers import (
+    explode_comments,
+    parse_date_series,
+    parse_duration_series,
+    split_comments,
+)
+
+
+def test_durations_parse_to_seconds_and_bad_values_to_nan():
+    durations = pd.Series(["P1DT2H", "PT1H2M3.5S", "PT", None, "PT5M30S", "PT1H2M3.5S"])
+    seconds = parse_duration_series(durations)
+
+    assert seconds[0] == 26 * 3600
+    assert seconds[1] == 3723.5 and seconds[5] == 3723.5
+    assert np.isnan(seconds[2]) and np.isnan(seconds[3])
+    assert seconds[4] == 330
+
+
+def test_crawl_dates_parse_as_utc():
+    dates = pd.Series(["2025-11-21T08:07:53Z", "2025-01-02T00:00:00Z", None, "kemarin"])
+    parsed, failed = parse_date_series(dates)
+
+    assert str(parsed.dt.tz) == "UTC"
+    assert parsed[0] == pd.Timestamp("2025-11-21 08:07:53", tz="UTC")
+    assert parsed[2] is pd.NaT and parsed[3] is pd.NaT
+    assert failed == 1
+
+
+def test_naive_datetime_columns_become_utc():
+    dates = pd.Series(pd.to_datetime(["2025-11-21 08:07:53"]))
+    parsed, failed = parse_date_series(dates)
+
+    assert parsed[0] == pd.Timestamp("2025-11-21 08:07:53", tz="UTC")
+    assert failed == 0
+
+
+def test_explode_comments_matches_split_comments():
+    df = pd.DataFrame(
+        {
+            "Video ID": ["a", "b", "c", "d", "e"],
+            "Komentar Lengkap": [
+                "bagus || mantap jiwa ||   keren ",
+                None,
+                "satu saja",
+                " ||  || ",
+                "a||b || c",
+            ],
+        }
+    )
+    comments = explode_comments(df)
+
+    for row, text in enumerate(df["Komentar Lengkap"]):
+        exploded = comments[comments["row"] == row]
+        assert exploded["text"].tolist() == split_comments(text)
+        assert exploded["position"].tolist() == list(range(len(exploded)))
+        assert (exploded["video_id"] == df["Video ID"][row]).all()
@@ -0,0 +1,96 @@
+import threading
+import time
+
+import pytest
+
+from utils.job_registry import JobRegistry
+
+
+class FakeJob:
+    def __init__(self, status="running"):
+        self.status = status
+        self.started = 0
+
+    @property
+    def finished(self):
+        return self.status in ("done", "degraded", "failed", "cancelled")
+
+    def start(self):
+        self.started += 1
+        return self
+
+    def cancel(self):
+        self.status = "cancelled"
+
+
+def test_finished_jobs_are_evicted_past_running_ones():
+    registry = JobRegistry(max_jobs=2, max_running=5)
+    running = registry.start("running", FakeJob)
+    registry.start("old", lambda: FakeJob("done"))
+    registry.start("new", lambda: FakeJob("done"))
+
+    assert registry.get("running") is running
+    assert registry.get("old") is None
+    assert registry.get("new") is not None
+
+
+def test_running_jobs_are_bounded():
+    registry = JobRegistry(max_jobs=8, max_running=2)
+    registry.start("a", FakeJob)
+    registry.start("b", FakeJob)
+    with pytest.raises(RuntimeError):
+        registry.start("c", FakeJob)
+
+    registry.cancel("a")
+    assert registry.start("c", FakeJob).status == "running"
+
+
+def test_cancelled_jobs_are_replaced_and_others_reused():
+    registry = JobRegistry()
+    first = registry.start("key", FakeJob)
+    assert registry.start("key", FakeJob) is first
+    assert first.started == 2
+
+    registry.cancel("key")
+    assert registry.start("key", FakeJob) is not first
+
+
+def test_concurrent_starts_share_one_job():
+    registry = JobRegistry(max_jobs=8, max_running=1)
+    built = []
+    release = threading.Event()
+
+    def make_job():
+        built.append(FakeJob())
+        release.wait(5)
+        return built[-1]
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(registry.start("key", make_job)))
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    # The key being built counts against max_running
+    with pytest.raises(RuntimeError):
+        registry.start("other", FakeJob)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(built) == 1
+    assert results == [built[0], built[0]]
+
+
+def test_jobs_are_cancelled_only_when_no_session_watches_them():
+    registry = JobRegistry()
+    job = registry.start("key", FakeJob)
+    registry.watch("key", "session-a")
+    registry.watch("key", "session-b")
+
+    registry.release("key", "session-a")
+    assert job.status == "running"
+    registry.release("key", "session-b")
+    assert job.status == "cancelled"
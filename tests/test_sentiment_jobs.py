@@ -0,0 +1,98 @@
+from utils.prediction_store import SentimentPredictionStore
+from utils.sentiment_jobs import SentimentJob
+
+
+def flaky_classify(texts):
+    """Scores every text except those containing "boom", like a failed batch"""
+    labels = [None if "boom" in text else "Positive" for text in texts]
+    scores = [0.0 if label is None else 0.9 for label in labels]
+    stats = {"comments": len(texts), "batches": 1, "seconds": 0.01}
+    return labels, scores, stats
+
+
+def negative_classify(texts):
+    stats = {"comments": len(texts), "batches": 1, "seconds": 0.01}
+    return ["Negative"] * len(texts), [0.8] * len(texts), stats
+
+
+def make_store(tmp_path):
+    model_dir = tmp_path / "model"
+    model_dir.mkdir()
+    (model_dir / "config.json").write_text("{}")
+    return SentimentPredictionStore(str(model_dir), path=str(tmp_path / "store.sqlite"))
+
+
+def test_failed_rows_are_not_stored_or_shown(tmp_path):
+    store = make_store(tmp_path)
+    texts = ["bagus sekali", "boom gagal", "mantap", "boom gagal"]
+
+    job = SentimentJob(texts, flaky_classify, store=store, dedup=False).run()
+
+    assert job.status == "degraded"
+    assert job.stats["failed"] == 2
+    assert set(store.get_many(texts)) == {"bagus sekali", "mantap"}
+    snapshot = job.snapshot()
+    assert snapshot["comment_normalized"].tolist() == ["bagus sekali", "mantap"]
+    assert job.progress()[:2] == (2, 4)
+
+
+def test_failed_rows_are_retried_by_a_later_job(tmp_path):
+    store = make_store(tmp_path)
+    SentimentJob(["boom"], flaky_classify, store=store, dedup=False).run()
+
+    job = SentimentJob(["boom"], negative_classify, store=store, dedup=False).run()
+
+    assert job.status == "done"
+    assert job.stats["cached"] == 0
+    assert store.get_many(["boom"]) == {"boom": ("Negative", 0.8)}
+
+
+def lexicon(texts):
+    """Confidence encoded in the text, e.g. "good 0.9" -> ("Positive", 0.9)"""
+    return ["Positive"] * len(texts), [float(text.split()[-1]) for text in texts]
+
+
+def test_cascade_threshold_is_applied_when_reading():
+    seen = []
+
+    def classify(texts):
+        seen.extend(texts)
+        return negative_classify(texts)
+
+    texts = ["a 0.95", "b 0.85", "c 0.6"]
+    job = SentimentJob(
+        texts,
+        classify,
+        dedup=False,
+        prefilter=lexicon,
+        prefilter_threshold=0.8,
+        agreement_sample=0,
+    ).run()
+
+    assert seen == ["c 0.6"]
+    assert list(job.labels) == ["Positive", "Positive", "Negative"]
+
+    # Raising the threshold routes "b" to the model without rescoring "a"
+    job.set_threshold(0.9)
+    assert job.has_pending()
+    assert job.progress()[0] == 2
+    job.run()
+    assert seen == ["c 0.6", "b 0.85"]
+    assert list(job.labels) == ["Positive", "Negative", "Negative"]
+
+    # Lowering it again only changes which label is read
+    job.set_threshold(0.5)
+    assert not job.has_pending()
+    assert list(job.labels) == ["Positive"] * 3
+
+
+def test_cancelled_job_stops_between_chunks():
+    def classify(texts):
+        job.cancel()
+        return negative_classify(texts)
+
+    job = SentimentJob(["a", "b", "c"], classify, dedup=False, chunk_size=1)
+    job.run()
+
+    assert job.status == "cancelled"
+    assert job.progress()[0] == 1
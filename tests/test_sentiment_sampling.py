@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from utils.sentiment_sampling import (
+    MIN_STRATUM_DRAWS,
+    collapse_strata,
+    estimate_shares,
+    stratified_sample,
+)
+
+
+def make_strata(days=300, per_day=10):
+    dates = pd.date_range("2025-01-01", periods=days).strftime("%Y-%m-%d")
+    return pd.Series(np.repeat(dates, per_day))
+
+
+def test_sample_size_is_honoured_with_more_strata_than_draws():
+    strata = collapse_strata(make_strata(), 100 // MIN_STRATUM_DRAWS)
+    picks = stratified_sample(strata, 100)
+
+    assert strata.nunique() <= 50
+    assert len(picks) <= 100
+    assert strata.iloc[picks].value_counts().min() >= MIN_STRATUM_DRAWS
+
+
+def test_collapsed_strata_keep_chronological_runs():
+    strata = collapse_strata(make_strata(days=6, per_day=1), 3)
+
+    assert strata.tolist() == [
+        "2025-01-01..2025-01-02",
+        "2025-01-01..2025-01-02",
+        "2025-01-03..2025-01-04",
+        "2025-01-03..2025-01-04",
+        "2025-01-05..2025-01-06",
+        "2025-01-05..2025-01-06",
+    ]
+
+
+def test_unanimous_small_strata_still_add_variance():
+    sample = pd.DataFrame(
+        {
+            "stratum": ["a", "b", "c", "d"],
+            "sentiment": ["Positive", "Positive", "Negative", "Negative"],
+        }
+    )
+    estimate = estimate_shares(sample, {"a": 50, "b": 50, "c": 50, "d": 50})
+
+    positive = estimate.set_index("sentiment").loc["Positive"]
+    assert positive["share"] == 0.5
+    assert positive["margin"] > 0.2
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+
+from utils.analytics import compute_aggregates
+from utils.snapshot import (
+    changed_sources,
+    read_snapshot,
+    upload_fingerprint,
+    write_snapshot,
+)
+
+
+def round_trip(tmp_path, df):
+    directory = str(tmp_path / "snapshot")
+    write_snapshot(directory, "key", df, None, {}, [])
+    return read_snapshot(directory)["df"]
+
+
+def test_mixed_object_column_keeps_value_types(tmp_path):
+    df = pd.DataFrame(
+        {
+            "mixed": pd.Series([1, "a", True, None, 2.5], dtype=object),
+            "text": ["x", None, "y", "z", ""],
+        }
+    )
+    loaded = round_trip(tmp_path, df)
+
+    assert loaded["mixed"].dtype == object
+    assert loaded["mixed"].tolist()[:3] == [1, "a", True]
+    assert [type(v) for v in loaded["mixed"].tolist()[:3]] == [int, str, bool]
+    assert pd.isna(loaded["mixed"][3]) and loaded["mixed"][4] == 2.5
+    assert loaded["text"].tolist()[2:] == ["y", "z", ""]
+    assert pd.isna(loaded["text"][1])
+
+
+def test_bool_and_mixed_categories_keep_their_dtype(tmp_path):
+    df = pd.DataFrame(
+        {
+            "flag": pd.Categorical([True, False, True]),
+            "mixed": pd.Categorical(pd.Series([1, "a", 1], dtype=object)),
+            "channel": pd.Categorical(["b", "a", "b"]),
+        }
+    )
+    loaded = round_trip(tmp_path, df)
+
+    pd.testing.assert_frame_equal(loaded, df)
+    assert loaded["flag"].cat.categories.dtype == bool
+    assert loaded["flag"].tolist() == [True, False, True]
+    assert loaded["mixed"].tolist() == [1, "a", 1]
+
+
+def test_empty_frame_round_trips(tmp_path):
+    df = pd.DataFrame(
+        {
+            "Views": np.array([], dtype=np.int64),
+            "Judul": pd.Series([], dtype=object),
+            "Kategori": pd.Categorical([]),
+            "Tanggal Upload": pd.to_datetime([], utc=True),
+        }
+    )
+    loaded = round_trip(tmp_path, df)
+
+    assert len(loaded) == 0
+    assert list(loaded.columns) == list(df.columns)
+    assert loaded["Views"].dtype == np.int64
+    assert loaded["Tanggal Upload"].dtype == df["Tanggal Upload"].dtype
+
+
+def test_page_aggregates_round_trip(tmp_path):
+    df = pd.DataFrame(
+        {
+            "Judul": ["a", "b", "c"],
+            "Channel": ["x", "y", "x"],
+            "Subscribers": [10, 20, 10],
+            "Views": [100, 300, 50],
+            "Engagement_Rate": [1.0, 2.0, 3.0],
+            "Kategori": ["k", "k", "m"],
+            "Tanggal Upload": pd.to_datetime(
+                ["2024-01-01", "2024-01-02", "2024-02-01"], utc=True
+            ),
+        }
+    )
+    aggregates = compute_aggregates(df)
+    directory = str(tmp_path / "snapshot")
+    write_snapshot(directory, "key", df, None, {}, [], aggregates=aggregates)
+    loaded = read_snapshot(directory)["aggregates"]
+
+    assert loaded["metrics"] == aggregates["metrics"]
+    assert loaded["metrics"]["potential_reach"] == 30
+    for name in ("daily_views", "monthly_views", "view_spikes", "channels", "categories"):
+        pd.testing.assert_frame_equal(
+            loaded[name], aggregates[name].reset_index(drop=True), check_dtype=False
+        )
+
+
+def test_session_snapshot_keeps_labels_and_upload_sources(tmp_path):
+    df = pd.DataFrame({"Judul": ["a", "b"]})
+    comments = pd.DataFrame(
+        {
+            "row": [0, 0, 1],
+            "sentiment": pd.Categorical(["Positive", None, "Negative"]),
+            "score": [0.9, 0.0, 0.8],
+        }
+    )
+    sources = [upload_fingerprint("data_semeru.csv", b"Judul\na\nb\n")]
+    directory = str(tmp_path / "snapshot")
+    write_snapshot(
+        directory, "key", df, comments, {}, sources, sentiment_model="fingerprint"
+    )
+    snapshot = read_snapshot(directory)
+
+    assert snapshot["manifest"]["sentiment"] == {"model_fingerprint": "fingerprint"}
+    assert snapshot["comments"]["sentiment"].tolist()[::2] == ["Positive", "Negative"]
+    assert pd.isna(snapshot["comments"]["sentiment"][1])
+    # Uploads have no path to re-check
+    assert changed_sources(snapshot["manifest"]) == []
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from sklearn.decomposition import NMF
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from utils.topic_model import load_topic_model
+from utils.topic_refresh import (
+    TopicRefreshJob,
+    list_topic_models,
+    reserve_version,
+    term_idf,
+)
+
+
+OLD_TEXTS = [
+    "harga bensin naik lagi",
+    "antrean bensin di pom",
+    "gunung semeru erupsi",
+    "warga mengungsi dari semeru",
+    "harga bensin turun",
+    "abu vulkanik semeru",
+] * 3
+NEW_TEXTS = [
+    "banjir jakarta hari ini",
+    "banjir rob di jakarta utara",
+    "harga bensin dan banjir",
+    "semeru dan banjir lahar",
+] * 3
+
+
+@pytest.fixture
+def base_path(tmp_path):
+    import joblib
+
+    tfidf = TfidfVectorizer()
+    X = tfidf.fit_transform(OLD_TEXTS)
+    nmf = NMF(n_components=2, init="nndsvda", random_state=0, max_iter=500).fit(X)
+    path = tmp_path / "nmf_model.pkl"
+    joblib.dump(
+        {
+            "nmf_model": nmf,
+            "tfidf": tfidf,
+            "feature_names": tfidf.get_feature_names_out(),
+            "n_topics": 2,
+        },
+        path,
+    )
+    return str(path)
+
+
+def refresh(base_path, tmp_path, texts=NEW_TEXTS):
+    package = load_topic_model(base_path, mmap_dir=str(tmp_path / "mmap"))
+    job = TopicRefreshJob(texts, package, source="test", base_path=base_path, epochs=2)
+    return package, job.run()
+
+
+def test_refresh_keeps_old_idf_and_appends_new_terms(base_path, tmp_path):
+    package, job = refresh(base_path, tmp_path)
+    assert job.status == "done", job.error
+
+    refreshed = load_topic_model(job.path, mmap_dir=str(tmp_path / "mmap"))
+    old_terms = list(package["feature_names"])
+    terms = list(refreshed["feature_names"])
+    assert terms[: len(old_terms)] == old_terms
+    assert "banjir" in terms[len(old_terms) :] and "jakarta" in terms
+    np.testing.assert_allclose(
+        term_idf(refreshed["tfidf"])[: len(old_terms)], term_idf(package["tfidf"])
+    )
+    assert refreshed["nmf_model"].components_.shape == (2, len(terms))
+    assert refreshed["model_hash"] != package["model_hash"]
+
+
+def test_versions_are_listed_in_order(base_path, tmp_path):
+    refresh(base_path, tmp_path)
+    refresh(base_path, tmp_path)
+    # A reserved version still being trained is not offered
+    reserve_version(base_path)
+
+    models = list_topic_models(base_path)
+    assert models[0] == ("Original", base_path)
+    assert [label.split(" ")[0] for label, _ in models[1:]] == ["v2", "v3"]
+    assert [path.rsplit(".", 2)[-2] for _, path in models[1:]] == ["v2", "v3"]
+
+
+def test_cancelled_refresh_releases_its_version(base_path, tmp_path):
+    package = load_topic_model(base_path, mmap_dir=str(tmp_path / "mmap"))
+    job = TopicRefreshJob(NEW_TEXTS, package, base_path=base_path)
+    job.cancel()
+    job.run()
+
+    assert job.status == "cancelled"
+    assert job.path is None
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["mmap", "nmf_model.pkl"]
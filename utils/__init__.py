@@ -1,24 +1,46 @@
 """
 Utils module for SocialSight Analytics
+
+Names are resolved from their submodule on first access, so importing a
+single helper (e.g. in a sentiment pool worker) does not pull in
+streamlit or the snapshot/cache machinery.
 """
 
-from .styles import apply_custom_css, render_header
-from .helpers import (
-    calculate_engagement_rate,
-    clean_duration,
-    parse_date,
-    split_comments,
-    generate_insights
-)
-from .sidebar import render_sidebar
+import importlib
+
+_EXPORTS = {
+    'apply_custom_css': 'styles',
+    'render_header': 'styles',
+    'calculate_engagement_rate': 'helpers',
+    'clean_duration': 'helpers',
+    'parse_duration_series': 'helpers',
+    'parse_date': 'helpers',
+    'parse_date_series': 'helpers',
+    'split_comments': 'helpers',
+    'explode_comments': 'helpers',
+    'count_comments': 'helpers',
+    'optimize_dtypes': 'helpers',
+    'generate_insights': 'helpers',
+    'render_sidebar': 'sidebar',
+    'dataset_key': 'data_loader',
+    'read_dataset': 'data_loader',
+    'load_dataset': 'data_loader',
+    'prepare_dataset': 'data_loader',
+    'merge_datasets': 'data_loader',
+    'DatasetCache': 'dataset_cache',
+    'LazyTextColumn': 'text_store',
+    'attach_text_columns': 'text_store',
+    'list_snapshots': 'snapshot',
+    'read_snapshot': 'snapshot',
+    'write_snapshot': 'snapshot',
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(f"{__name__}.{_EXPORTS[name]}")
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-__all__ = [
-    'apply_custom_css',
-    'render_header',
-    'calculate_engagement_rate',
-    'clean_duration',
-    'parse_date',
-    'split_comments',
-    'generate_insights',
-    'render_sidebar',
-]
\ No newline at end of file
+__all__ = list(_EXPORTS)
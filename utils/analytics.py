@@ -0,0 +1,99 @@
+import pandas as pd
+
+
+def daily_views(df):
+    """Total and cumulative views per upload date"""
+    daily = df.groupby(df["Tanggal Upload"].dt.date)["Views"].sum().reset_index()
+    daily.columns = ["Date", "Total Views"]
+    daily["Date"] = pd.to_datetime(daily["Date"])
+    daily = daily.sort_values("Date")
+    daily["Cumulative Views"] = daily["Total Views"].cumsum()
+    return daily
+
+
+def monthly_views(df):
+    """Total views per upload month ("YYYY-MM")"""
+    months = df["Tanggal Upload"].dt.tz_localize(None).dt.to_period("M")
+    monthly = df.groupby(months)["Views"].sum().reset_index()
+    monthly.columns = ["Month", "Total Views"]
+    monthly["Month"] = monthly["Month"].astype(str)
+    return monthly
+
+
+def view_spikes(daily):
+    """Days whose views exceed mean + 2 std; returns (spikes, threshold)"""
+    threshold = daily["Total Views"].mean() + 2 * daily["Total Views"].std()
+    return daily[daily["Total Views"] > threshold].copy(), threshold
+
+
+def executive_metrics(df):
+    """Headline totals shown on the Executive Summary and View & Reach pages"""
+    metrics = {"total_videos": int(len(df))}
+    for column, name in [
+        ("Views", "total_views"),
+        ("Likes", "total_likes"),
+        ("Comments", "total_comments"),
+    ]:
+        if column in df.columns:
+            metrics[name] = float(df[column].sum())
+    if "Engagement_Rate" in df.columns:
+        metrics["avg_engagement_rate"] = float(df["Engagement_Rate"].mean())
+    if "Views" in df.columns:
+        metrics["avg_views"] = float(df["Views"].mean())
+        metrics["median_views"] = float(df["Views"].median())
+        metrics["max_views"] = float(df["Views"].max())
+    if "Channel" in df.columns and "Subscribers" in df.columns:
+        metrics["potential_reach"] = float(
+            df.groupby("Channel", observed=True)["Subscribers"].first().sum()
+        )
+    return metrics
+
+
+def channel_summary(df):
+    """Total and average views (and subscribers) per channel"""
+    aggregations = {
+        "Total Views": ("Views", "sum"),
+        "Avg Views": ("Views", "mean"),
+    }
+    if "Subscribers" in df.columns:
+        aggregations["Subscribers"] = ("Subscribers", "first")
+    return df.groupby("Channel", observed=True).agg(**aggregations).reset_index()
+
+
+def category_summary(df):
+    """Views, engagement and video count per category, most viewed first"""
+    table = (
+        df.groupby("Kategori", observed=True)
+        .agg(
+            {
+                "Views": ["sum", "mean"],
+                "Engagement_Rate": "mean",
+                "Judul": "count",
+            }
+        )
+        .round(2)
+    )
+    table.columns = ["Total Views", "Avg Views", "Avg Eng Rate", "Video Count"]
+    return table.sort_values("Total Views", ascending=False).reset_index()
+
+
+def compute_aggregates(df):
+    """Every page aggregate of a dataset, computed once at load time.
+
+    Returns a dict with the scalar ``metrics`` and, when the columns they
+    need exist, the ``daily_views``, ``monthly_views``, ``view_spikes``,
+    ``channels`` and ``categories`` tables.
+    """
+    aggregates = {"metrics": executive_metrics(df)}
+    if "Tanggal Upload" in df.columns and "Views" in df.columns:
+        daily = daily_views(df)
+        spikes, threshold = view_spikes(daily)
+        aggregates["daily_views"] = daily
+        aggregates["monthly_views"] = monthly_views(df)
+        aggregates["view_spikes"] = spikes.reset_index(drop=True)
+        aggregates["metrics"]["spike_threshold"] = float(threshold)
+    if "Channel" in df.columns and "Views" in df.columns:
+        aggregates["channels"] = channel_summary(df)
+    if {"Kategori", "Views", "Engagement_Rate", "Judul"} <= set(df.columns):
+        aggregates["categories"] = category_summary(df)
+    return aggregates
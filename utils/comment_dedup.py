@@ -0,0 +1,114 @@
+import zlib
+
+import numpy as np
+
+
+DEFAULT_THRESHOLD = 0.85
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 16
+SHINGLE_SIZE = 4
+_PRIME = np.uint64((1 << 31) - 1)
+_CHUNK_SIZE = 2000
+
+
+def canonical_comment(text):
+    """Lowercase and collapse whitespace so trivial variants hash equally"""
+    return " ".join(str(text).lower().split())
+
+
+def _shingles(text):
+    """Character shingles of a canonical comment as 32-bit hashes"""
+    if len(text) <= SHINGLE_SIZE:
+        grams = {text}
+    else:
+        grams = {text[i : i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+    return [zlib.crc32(g.encode("utf-8")) for g in grams]
+
+
+def minhash_signatures(texts, num_perm=DEFAULT_NUM_PERM, seed=0):
+    """Compute MinHash signatures (len(texts) x num_perm) for canonical texts"""
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, int(_PRIME), size=(num_perm, 1)).astype(np.uint64)
+    b = rng.randint(0, int(_PRIME), size=(num_perm, 1)).astype(np.uint64)
+
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint64)
+    for start in range(0, len(texts), _CHUNK_SIZE):
+        chunk = [_shingles(t) for t in texts[start : start + _CHUNK_SIZE]]
+        lengths = np.fromiter((len(s) for s in chunk), dtype=np.int64, count=len(chunk))
+        hashes = np.fromiter(
+            (h for s in chunk for h in s), dtype=np.uint64, count=int(lengths.sum())
+        )
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        permuted = (a * (hashes % _PRIME) + b) % _PRIME
+        signatures[start : start + len(chunk)] = np.minimum.reduceat(
+            permuted, offsets, axis=1
+        ).T
+    return signatures
+
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def dedup_comments(
+    texts,
+    near_duplicates=True,
+    threshold=DEFAULT_THRESHOLD,
+    num_perm=DEFAULT_NUM_PERM,
+    bands=DEFAULT_BANDS,
+):
+    """Collapse exact and near-duplicate comments.
+
+    Returns (representatives, assignment, stats). ``representatives`` holds
+    the index of one comment per group, ``assignment[i]`` is the position in
+    ``representatives`` that comment i maps to, and stats reports the group
+    counts and dedup ratio.
+    """
+    canonical = [canonical_comment(t) for t in texts]
+
+    # Exact duplicates collapse by hash of the canonical form
+    first_seen = {}
+    unique_index = []
+    exact_group = np.empty(len(texts), dtype=np.int64)
+    for i, text in enumerate(canonical):
+        if text not in first_seen:
+            first_seen[text] = len(unique_index)
+            unique_index.append(i)
+        exact_group[i] = first_seen[text]
+    unique_texts = list(first_seen)
+
+    parent = list(range(len(unique_texts)))
+    if near_duplicates and len(unique_texts) > 1:
+        signatures = minhash_signatures(unique_texts, num_perm=num_perm)
+        rows = num_perm // bands
+        for band in range(bands):
+            buckets = {}
+            block = signatures[:, band * rows : (band + 1) * rows]
+            for i, key in enumerate(map(bytes, block)):
+                head = buckets.setdefault(key, i)
+                if head == i:
+                    continue
+                similarity = np.mean(signatures[head] == signatures[i])
+                if similarity >= threshold:
+                    root_a, root_b = _find(parent, head), _find(parent, i)
+                    if root_a != root_b:
+                        parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    roots = [_find(parent, i) for i in range(len(unique_texts))]
+    group_ids = {}
+    unique_group = np.array(
+        [group_ids.setdefault(root, len(group_ids)) for root in roots], dtype=np.int64
+    )
+    representatives = [unique_index[root] for root in group_ids]
+    assignment = unique_group[exact_group]
+
+    stats = {
+        "total": len(texts),
+        "exact_unique": len(unique_texts),
+        "groups": len(representatives),
+        "dedup_ratio": 1 - len(representatives) / len(texts) if len(texts) else 0.0,
+    }
+    return representatives, assignment, stats
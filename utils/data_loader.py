@@ -0,0 +1,414 @@
+import codecs
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.text_store import TextColumnView, TextColumnWriter
+from utils.helpers import (
+    CATEGORY_COLUMNS,
+    calculate_engagement_rate,
+    optimize_dtypes,
+    detect_date_format,
+    parse_duration_series,
+    parse_date_series,
+    explode_comments,
+    count_comments,
+)
+
+
+# Bump when prepare_dataset changes, so cached datasets are rebuilt
+DATASET_VERSION = "5"
+ENCODING_SAMPLE_BYTES = 1024**2
+# Rows per chunk; crawls carry very large comment/description cells
+CSV_CHUNK_ROWS = 2000
+EXCEL_BATCH_ROWS = CSV_CHUNK_ROWS
+# Tried in order on the byte sample; latin-1 decodes anything
+CSV_ENCODINGS = ["utf-8", "cp1252", "latin-1"]
+# Large free-text columns kept on disk and only read by the pages using them
+HEAVY_TEXT_COLUMNS = ["Komentar Lengkap", "Description", "Thumbnail URL"]
+# Text store column holding the comment table's text, one value per comment
+COMMENT_TEXT_COLUMN = "comment_text"
+# Name of the upload each row came from when several files are merged
+SOURCE_COLUMN = "Source"
+# Sheet and columns read from .xlsx uploads (None: the first sheet, every
+# column). Every column is kept since Data Explorer shows and exports them.
+EXCEL_SHEET_NAME = None
+EXCEL_COLUMNS = None
+
+
+def dataset_key(data, name):
+    """Content hash of an uploaded file, independent of session and file name.
+
+    Only the extension of ``name`` is mixed in, since it decides the parser.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"v{DATASET_VERSION}:{name.rsplit('.', 1)[-1].lower()}:".encode("utf-8"))
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def combined_key(keys):
+    """Key of several uploads analysed together (the key itself for one)"""
+    if len(keys) == 1:
+        return keys[0]
+    return hashlib.sha256("|".join(keys).encode("utf-8")).hexdigest()
+
+
+def source_name(file_name):
+    """Label of a dataset in the Source column, e.g. data_semeru.csv -> data_semeru"""
+    return os.path.splitext(os.path.basename(file_name))[0]
+
+
+def detect_encoding(sample):
+    """Pick the first of CSV_ENCODINGS that decodes a byte sample.
+
+    The sample may end in the middle of a multi-byte character, so it is
+    decoded incrementally without flushing.
+    """
+    for encoding in CSV_ENCODINGS:
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return CSV_ENCODINGS[-1]
+
+
+def _file_size(file):
+    size = getattr(file, "size", None)
+    if size is None:
+        position = file.tell()
+        size = file.seek(0, 2)
+        file.seek(position)
+    return size
+
+
+def _csv_chunks(file, encoding, python_engine=False):
+    file.seek(0)
+    if python_engine:
+        return pd.read_csv(
+            file,
+            encoding=encoding,
+            sep=",",
+            quotechar='"',
+            escapechar="\\",
+            on_bad_lines="skip",
+            engine="python",
+            chunksize=CSV_CHUNK_ROWS,
+        )
+    return pd.read_csv(
+        file, encoding=encoding, on_bad_lines="skip", chunksize=CSV_CHUNK_ROWS
+    )
+
+
+def _stream_chunks(chunks, position, progress, text_dir):
+    """Derive every chunk and stack them; ``position()`` is the fraction read.
+
+    If a chunk fails, the text columns written so far are discarded so a
+    retry starts from clean files.
+    """
+    frames, comments, failed_dates = [], [], 0
+    writers = {}
+    date_format = None
+    rows = 0
+    text_columns = None
+    try:
+        for chunk in chunks:
+            if date_format is None and "Tanggal Upload" in chunk.columns:
+                date_format = detect_date_format(chunk["Tanggal Upload"])
+            chunk, chunk_comments, chunk_failed = _prepare(chunk, date_format)
+            if text_dir is not None:
+                chunk, chunk_comments = _spill_text(
+                    chunk, chunk_comments, text_dir, writers
+                )
+            if chunk_comments is not None:
+                chunk_comments["row"] += rows
+                comments.append(chunk_comments)
+            frames.append(chunk)
+            failed_dates += chunk_failed
+            rows += len(chunk)
+            if progress is not None:
+                progress(min(position(), 1.0))
+
+        text_columns = {name: writer.close() for name, writer in writers.items()}
+    finally:
+        if text_columns is None:
+            for writer in writers.values():
+                writer.abort()
+    if not frames:
+        return pd.DataFrame(), None, 0, text_columns
+    df = pd.concat(frames, ignore_index=True)
+    del frames
+    comments = pd.concat(comments, ignore_index=True) if comments else None
+    return df, comments, failed_dates, text_columns
+
+
+def _stream_csv(file, encoding, python_engine, progress, text_dir):
+    size = _file_size(file) or 1
+    return _stream_chunks(
+        _csv_chunks(file, encoding, python_engine),
+        lambda: file.tell() / size,
+        progress,
+        text_dir,
+    )
+
+
+def _spill_text(df, comments, text_dir, writers):
+    columns = {
+        column: df[column] for column in HEAVY_TEXT_COLUMNS if column in df.columns
+    }
+    if comments is not None:
+        columns[COMMENT_TEXT_COLUMN] = comments["text"]
+        comments = comments.drop(columns=["text"])
+    for name, values in columns.items():
+        if name not in writers:
+            writers[name] = TextColumnWriter(text_dir, name)
+        writers[name].append(values.to_numpy())
+    return df.drop(columns=[c for c in columns if c in df.columns]), comments
+
+
+def load_csv(file, progress=None, text_dir=None):
+    """Stream a CSV in chunks and derive the analysis columns per chunk.
+
+    The encoding is detected once from the first ENCODING_SAMPLE_BYTES,
+    so the file is decoded a single time; only a malformed file falls back
+    to the tolerant python engine. ``progress(fraction)`` is called after
+    every chunk. With ``text_dir`` the HEAVY_TEXT_COLUMNS and the comment
+    text (as COMMENT_TEXT_COLUMN, row i being comment i) are written there
+    chunk by chunk instead of being kept in the DataFrames.
+
+    Returns (df, comments, failed_dates, text_columns), text_columns
+    mapping column name -> LazyTextColumn.
+    """
+    file.seek(0)
+    encoding = detect_encoding(file.read(ENCODING_SAMPLE_BYTES))
+    try:
+        return _stream_csv(file, encoding, False, progress, text_dir)
+    except UnicodeDecodeError:
+        # Undecodable bytes past the sample
+        return _stream_csv(file, CSV_ENCODINGS[-1], False, progress, text_dir)
+    except Exception:
+        return _stream_csv(file, encoding, True, progress, text_dir)
+
+
+def _excel_frame(batch, names, keep):
+    # Transpose the row batch once, then build each kept column in one go
+    width = len(names)
+    columns = list(zip(*(row + (None,) * (width - len(row)) for row in batch)))
+    return pd.DataFrame({names[i]: pd.Series(columns[i]) for i in keep})
+
+
+def iter_excel_chunks(
+    file, sheet_name=None, columns=None, batch_rows=EXCEL_BATCH_ROWS, counter=None
+):
+    """Yield an .xlsx sheet as DataFrames of ``batch_rows`` rows.
+
+    Uses openpyxl's read-only mode, which streams the sheet XML instead of
+    building the workbook DOM. Only ``sheet_name`` (default: the first
+    sheet) is read and, when ``columns`` is given, only those columns are
+    kept. Fully empty rows are skipped. ``counter``, a dict, receives the
+    rows read so far and the sheet's row count for progress reporting.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        names = [
+            str(name) if name is not None else f"Unnamed: {i}"
+            for i, name in enumerate(header)
+        ]
+        keep = [i for i, name in enumerate(names) if columns is None or name in columns]
+        if counter is not None:
+            counter["total"] = max((sheet.max_row or 0) - 1, 0)
+            counter["read"] = 0
+
+        batch = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            batch.append(row)
+            if len(batch) == batch_rows:
+                if counter is not None:
+                    counter["read"] += len(batch)
+                yield _excel_frame(batch, names, keep)
+                batch = []
+        if batch:
+            if counter is not None:
+                counter["read"] += len(batch)
+            yield _excel_frame(batch, names, keep)
+    finally:
+        workbook.close()
+
+
+def load_excel(file, progress=None, text_dir=None, sheet_name=None, columns=None):
+    """Stream an .xlsx upload through the same per-chunk derivations as CSVs.
+
+    Returns (df, comments, failed_dates, text_columns) like ``load_csv``.
+    """
+    file.seek(0)
+    counter = {}
+    chunks = iter_excel_chunks(file, sheet_name, columns, counter=counter)
+    return _stream_chunks(
+        chunks,
+        lambda: counter["read"] / counter["total"] if counter.get("total") else 0.0,
+        progress,
+        text_dir,
+    )
+
+
+def read_dataset(uploaded_file):
+    """Read an uploaded CSV or Excel file into a raw DataFrame"""
+    uploaded_file.seek(0)
+    if uploaded_file.name.endswith(".csv"):
+        encoding = detect_encoding(uploaded_file.read(ENCODING_SAMPLE_BYTES))
+        uploaded_file.seek(0)
+        return pd.read_csv(uploaded_file, encoding=encoding, on_bad_lines="skip")
+    chunks = list(iter_excel_chunks(uploaded_file))
+    return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+
+
+def load_dataset(
+    uploaded_file,
+    progress=None,
+    text_dir=None,
+    sheet_name=EXCEL_SHEET_NAME,
+    columns=EXCEL_COLUMNS,
+):
+    """Read and prepare an upload; CSV and Excel files are streamed in chunks.
+
+    ``sheet_name`` and ``columns`` restrict what is read from Excel files.
+    Returns (df, comments, failed_dates, text_columns) like ``load_csv``.
+    """
+    if uploaded_file.name.endswith(".csv"):
+        return load_csv(uploaded_file, progress, text_dir)
+    return load_excel(uploaded_file, progress, text_dir, sheet_name, columns)
+
+
+def _prepare(df, date_format=None):
+    failed_dates = 0
+    if "Tanggal Upload" in df.columns:
+        df["Tanggal Upload"], failed_dates = parse_date_series(
+            df["Tanggal Upload"], date_format
+        )
+
+    if "Durasi" in df.columns:
+        df["Duration_Seconds"] = parse_duration_series(df["Durasi"])
+
+    df = calculate_engagement_rate(df)
+
+    comments = None
+    if "Komentar Lengkap" in df.columns:
+        comments = explode_comments(df)
+        df["Comments"] = count_comments(comments, len(df))
+
+    return df, comments, failed_dates
+
+
+def prepare_dataset(df):
+    """Derive dates, durations, engagement and comment counts.
+
+    Returns (df, comments, failed_dates), where ``comments`` is the long
+    comment table from ``explode_comments`` or None.
+    """
+    return _prepare(df)
+
+
+def merge_datasets(datasets):
+    """Stack several loaded uploads into one dataset.
+
+    ``datasets`` is a list of (source, df, comments, text_columns) in upload
+    order. Every row gets its ``SOURCE_COLUMN``. Rows sharing a Video ID are
+    resolved through a hash index on the id: the copy with the most Views
+    (counts only grow, so it is the latest crawl) wins, later uploads
+    winning ties. Comment tables and lazy text columns (comment text
+    included) are re-pointed at the merged rows.
+
+    Returns (df, comments, text_columns, duplicates).
+    """
+    frames, parts, part_rows = [], [], []
+    for part, (source, df, _, _) in enumerate(datasets):
+        df = df.copy(deep=False)
+        df[SOURCE_COLUMN] = source
+        frames.append(df)
+        parts.append(np.full(len(df), part, dtype=np.int64))
+        part_rows.append(np.arange(len(df), dtype=np.int64))
+    merged = pd.concat(frames, ignore_index=True)
+    parts = np.concatenate(parts)
+    part_rows = np.concatenate(part_rows)
+
+    keep = np.arange(len(merged))
+    if "Video ID" in merged.columns:
+        views = (
+            pd.to_numeric(merged["Views"], errors="coerce").fillna(-1).to_numpy()
+            if "Views" in merged.columns
+            else np.zeros(len(merged))
+        )
+        # Last row of each id after sorting by (views, upload order) wins
+        order = np.lexsort((parts, views))
+        ids = merged["Video ID"].to_numpy()[order]
+        duplicated = pd.Index(ids).duplicated(keep="last") & pd.notna(ids)
+        keep = np.sort(order[~duplicated])
+    duplicates = len(merged) - len(keep)
+
+    position = np.full(len(merged), -1, dtype=np.int64)
+    position[keep] = np.arange(len(keep))
+    merged = merged.iloc[keep].reset_index(drop=True)
+
+    comments, comment_parts, comment_rows = [], [], []
+    offset = 0
+    for part, (df, (_, _, part_comments, _)) in enumerate(zip(frames, datasets)):
+        if part_comments is not None:
+            part_comments = part_comments.copy()
+            part_comments["row"] = position[part_comments["row"].to_numpy() + offset]
+            kept = np.flatnonzero(part_comments["row"].to_numpy() >= 0)
+            comments.append(part_comments.iloc[kept])
+            comment_parts.append(np.full(len(kept), part, dtype=np.int64))
+            comment_rows.append(kept)
+        offset += len(df)
+    comments = pd.concat(comments, ignore_index=True) if comments else None
+
+    names = {name for _, _, _, text_columns in datasets for name in text_columns}
+    text_columns = {
+        name: TextColumnView(
+            name,
+            [text_columns.get(name) for _, _, _, text_columns in datasets],
+            parts[keep],
+            part_rows[keep],
+        )
+        for name in HEAVY_TEXT_COLUMNS
+        if name in names
+    }
+    if COMMENT_TEXT_COLUMN in names:
+        text_columns[COMMENT_TEXT_COLUMN] = TextColumnView(
+            COMMENT_TEXT_COLUMN,
+            [text_columns.get(COMMENT_TEXT_COLUMN) for _, _, _, text_columns in datasets],
+            np.concatenate(comment_parts),
+            np.concatenate(comment_rows),
+        )
+    return merged, comments, text_columns, duplicates
+
+
+def combine_datasets(datasets):
+    """Merge compacted uploads, as given to ``merge_datasets``.
+
+    A single dataset is returned unchanged. Merged frames are compacted
+    again since categories differ per file. Returns (df, comments,
+    text_columns, duplicates, memory_report), memory_report being None for
+    a single dataset.
+    """
+    if len(datasets) == 1:
+        _, df, comments, text_columns = datasets[0]
+        return df, comments, text_columns, 0, None
+
+    df, comments, text_columns, duplicates = merge_datasets(datasets)
+    df, memory_report = optimize_dtypes(df, CATEGORY_COLUMNS + [SOURCE_COLUMN])
+    if comments is not None:
+        comments, _ = optimize_dtypes(comments, ["video_id"])
+    return df, comments, text_columns, duplicates, memory_report
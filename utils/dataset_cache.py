@@ -0,0 +1,160 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+DEFAULT_MAX_BYTES = 1024**3
+DEFAULT_SPILL_DIR = os.path.join(".cache", "datasets")
+
+
+def frame_bytes(frame):
+    """Deep memory footprint of a DataFrame, 0 for None"""
+    if frame is None:
+        return 0
+    return int(frame.memory_usage(index=True, deep=True).sum())
+
+
+def _parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class DatasetCache:
+    """Process-wide LRU cache of processed datasets keyed by content hash.
+
+    An entry is a dict of DataFrames (or None) plus a small JSON-safe
+    ``meta`` dict. Once the entries exceed ``max_bytes`` the least recently
+    used ones are dropped from memory. With a ``spill_dir`` (and pyarrow
+    installed) every entry is also written as Parquet, so it survives
+    evictions and server restarts.
+
+    ``get`` hands out shallow copies: pages may add columns to their
+    DataFrame without touching the shared one.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, spill_dir=None):
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir if spill_dir and _parquet_available() else None
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if self.spill_dir:
+            os.makedirs(self.spill_dir, exist_ok=True)
+
+    @property
+    def nbytes(self):
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            if key in self._entries:
+                return True
+        return self.spill_dir is not None and os.path.exists(self._meta_path(key))
+
+    def get(self, key):
+        """Return (frames, meta) for ``key``, or None when not cached"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None:
+            entry = self._load_spilled(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._remember(key, entry)
+        self.hits += 1
+
+        frames, meta = entry
+        copies = {
+            name: frame.copy(deep=False) if frame is not None else None
+            for name, frame in frames.items()
+        }
+        return copies, dict(meta)
+
+    def put(self, key, frames, meta=None):
+        """Cache ``frames`` ({name: DataFrame or None}) under ``key``.
+
+        Shallow copies are stored, so the caller may keep using (and add
+        columns to) the frames it passed in.
+        """
+        entry = (
+            {
+                name: frame.copy(deep=False) if frame is not None else None
+                for name, frame in frames.items()
+            },
+            dict(meta or {}),
+        )
+        self._remember(key, entry)
+        if self.spill_dir:
+            self._spill(key, entry)
+
+    def clear(self):
+        """Drop every entry from memory (spilled files are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+
+    def _remember(self, key, entry):
+        size = sum(frame_bytes(frame) for frame in entry[0].values())
+        with self._lock:
+            self._entries[key] = entry
+            self._sizes[key] = size
+            self._entries.move_to_end(key)
+            # Always keep the newest entry, even if it alone is over budget
+            while len(self._entries) > 1 and sum(self._sizes.values()) > self.max_bytes:
+                oldest, _ = self._entries.popitem(last=False)
+                self._sizes.pop(oldest)
+
+    def _meta_path(self, key):
+        return os.path.join(self.spill_dir, f"{key}.json")
+
+    def _frame_path(self, key, name):
+        return os.path.join(self.spill_dir, f"{key}.{name}.parquet")
+
+    def _spill(self, key, entry):
+        frames, meta = entry
+        written = []
+        try:
+            for name, frame in frames.items():
+                if frame is None:
+                    continue
+                path = self._frame_path(key, name)
+                frame.to_parquet(path, index=True)
+                written.append(path)
+            # The meta file is written last and marks the entry as complete
+            with open(self._meta_path(key), "w", encoding="utf-8") as f:
+                json.dump({"frames": sorted(frames), "meta": meta}, f)
+        except Exception:
+            # Mixed-type object columns cannot always be stored as Parquet;
+            # the entry then just lives in memory
+            for path in written:
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _load_spilled(self, key):
+        if self.spill_dir is None:
+            return None
+        try:
+            with open(self._meta_path(key), encoding="utf-8") as f:
+                manifest = json.load(f)
+            frames = {}
+            for name in manifest["frames"]:
+                path = self._frame_path(key, name)
+                frames[name] = pd.read_parquet(path) if os.path.exists(path) else None
+            return frames, manifest["meta"]
+        except Exception:
+            return None
@@ -1,7 +1,41 @@
+import numpy as np
 import pandas as pd
 import re
 
 
+DURATION_PATTERN = (
+    r"^\s*P?"
+    r"(?:(?P<days>\d+(?:\.\d+)?)D)?"
+    r"T?"
+    r"(?:(?P<hours>\d+(?:\.\d+)?)H)?"
+    r"(?:(?P<minutes>\d+(?:\.\d+)?)M)?"
+    r"(?:(?P<seconds>\d+(?:\.\d+)?)S)?"
+    r"\s*$"
+)
+DURATION_UNITS = {"days": 86400, "hours": 3600, "minutes": 60, "seconds": 1}
+# Crawl format (2025-11-21T08:07:53Z) first; %z also accepts the "Z" suffix
+DATE_FORMATS = [
+    "%Y-%m-%dT%H:%M:%S%z",
+    "ISO8601",
+    "%d/%m/%Y %H:%M",
+    "%d/%m/%Y",
+    "%m/%d/%Y",
+]
+DATE_SAMPLE_SIZE = 200
+# Comments in "Komentar Lengkap" are joined with " || "
+COMMENT_SEPARATOR = r"\s\|\|\s"
+# Low-cardinality string columns stored as categoricals
+CATEGORY_COLUMNS = [
+    "Channel",
+    "Kategori",
+    "Country Channel",
+    "Definition",
+    "Dimension",
+    "Projection",
+    "Caption",
+]
+
+
 def calculate_engagement_rate(df):
     """Calculate engagement rate"""
     if "Likes" in df.columns and "Comments" in df.columns and "Views" in df.columns:
@@ -34,6 +68,27 @@ def clean_duration(duration_str):
         return 0
 
 
+def parse_duration_series(durations):
+    """Convert a Series of ISO-8601 durations (PT5M30S, P1DT2H, PT1.5S) to seconds.
+
+    Works on the whole column with one regex extract over the distinct
+    values; values that are missing or do not match (including an empty
+    "PT") become NaN.
+    """
+    codes, uniques = pd.factorize(durations)
+    parts = (
+        pd.Series(uniques, dtype="string")
+        .str.upper()
+        .str.extract(DURATION_PATTERN)
+        .astype(float)
+    )
+    seconds = sum(
+        parts[unit].fillna(0) * factor for unit, factor in DURATION_UNITS.items()
+    ).where(parts.notna().any(axis=1))
+    values = np.append(seconds.to_numpy(dtype=float), np.nan)[codes]
+    return pd.Series(values, index=durations.index, name=durations.name)
+
+
 def parse_date(date_str):
     """Parse date string"""
     try:
@@ -42,14 +97,132 @@ def parse_date(date_str):
         return pd.NaT
 
 
+def detect_date_format(dates, sample_size=DATE_SAMPLE_SIZE):
+    """Pick the known format that parses most of a sample of the column"""
+    sample = dates.dropna().astype(str).head(sample_size)
+    if sample.empty:
+        return "ISO8601"
+
+    best_format, best_parsed = "mixed", 0
+    for fmt in DATE_FORMATS:
+        parsed = pd.to_datetime(sample, format=fmt, errors="coerce", utc=True)
+        parsed_count = parsed.notna().sum()
+        if parsed_count == len(sample):
+            return fmt
+        if parsed_count > best_parsed:
+            best_format, best_parsed = fmt, parsed_count
+    return best_format
+
+
+def parse_date_series(dates, date_format=None):
+    """Parse a whole date column in one pass.
+
+    The format is detected once from a sample (unless ``date_format`` is
+    given), every value is converted to UTC (naive values are taken as UTC)
+    and unparseable values become NaT. Returns (parsed, failed_count) where
+    failed_count excludes values that were already missing.
+    """
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        parsed = (
+            dates.dt.tz_convert("UTC")
+            if dates.dt.tz is not None
+            else dates.dt.tz_localize("UTC")
+        )
+        return parsed, 0
+
+    parsed = pd.to_datetime(
+        dates,
+        format=date_format or detect_date_format(dates),
+        errors="coerce",
+        utc=True,
+    )
+    failed = int((parsed.isna() & dates.notna()).sum())
+    return parsed, failed
+
+
 def split_comments(comment_string):
     """Split multiple comments separated by ||"""
     if pd.isna(comment_string):
         return []
-    comments = re.split(r"\s\|\|\s", str(comment_string))
+    comments = re.split(COMMENT_SEPARATOR, str(comment_string))
     return [c.strip() for c in comments if c.strip()]
 
 
+def explode_comments(df, column="Komentar Lengkap"):
+    """Split every row's comments into a long table in one vectorized pass.
+
+    Returns a DataFrame with one row per comment: ``row`` (position of the
+    video in ``df``), ``video_id``, ``position`` (order within the video)
+    and ``text``. Matches ``split_comments`` row by row.
+    """
+    video_ids = (
+        df["Video ID"].to_numpy() if "Video ID" in df.columns else df.index.to_numpy()
+    )
+    texts = df[column].reset_index(drop=True)
+    texts = texts[texts.notna()].astype(str)
+
+    comments = (
+        texts.str.split(COMMENT_SEPARATOR, regex=True)
+        .explode()
+        .str.strip()
+    )
+    comments = comments[comments.notna() & (comments != "")]
+
+    rows = comments.index.to_numpy()
+    result = pd.DataFrame(
+        {
+            "row": rows,
+            "video_id": video_ids[rows],
+            "text": comments.to_numpy(),
+        }
+    )
+    result["position"] = result.groupby("row").cumcount()
+    return result[["row", "video_id", "position", "text"]]
+
+
+def count_comments(comments, n_rows):
+    """Number of comments per video from an ``explode_comments`` table"""
+    return (
+        comments.groupby("row").size().reindex(range(n_rows), fill_value=0).to_numpy()
+    )
+
+
+def optimize_dtypes(df, category_columns=CATEGORY_COLUMNS):
+    """Shrink a loaded dataset in place of its object/64-bit columns.
+
+    String columns in ``category_columns`` become categoricals, integer
+    columns are downcast to int32 when their values fit (never smaller, so
+    arithmetic such as ``Comments + 1`` keeps headroom) and float columns
+    to float32 only when that is lossless. Returns (df, report) where
+    report holds the memory in bytes before and after and the converted
+    columns.
+    """
+    before = int(df.memory_usage(index=True, deep=True).sum())
+    converted = []
+
+    for column in df.columns:
+        values = df[column]
+        if column in category_columns and values.dtype == object:
+            df[column] = values.astype("category")
+            converted.append(column)
+        elif pd.api.types.is_integer_dtype(values) and values.dtype.itemsize > 4:
+            if values.empty or (
+                values.min() >= np.iinfo(np.int32).min
+                and values.max() <= np.iinfo(np.int32).max
+            ):
+                df[column] = values.astype(np.int32)
+                converted.append(column)
+        elif values.dtype == np.float64:
+            array = values.to_numpy()
+            narrowed = array.astype(np.float32)
+            if np.array_equal(narrowed.astype(np.float64), array, equal_nan=True):
+                df[column] = narrowed
+                converted.append(column)
+
+    after = int(df.memory_usage(index=True, deep=True).sum())
+    return df, {"before": before, "after": after, "columns": converted}
+
+
 def generate_insights(df):
     """Generate automatic insights"""
     insights = []
@@ -61,8 +234,8 @@ def generate_insights(df):
         )
 
     if "Channel" in df.columns and "Subscribers" in df.columns:
-        top_channel = df.groupby("Channel")["Subscribers"].first().idxmax()
-        top_subscribers = df.groupby("Channel")["Subscribers"].first().max()
+        top_channel = df.groupby("Channel", observed=True)["Subscribers"].first().idxmax()
+        top_subscribers = df.groupby("Channel", observed=True)["Subscribers"].first().max()
         insights.append(
             f"Channel dengan subscribers terbanyak: {top_channel} ({top_subscribers:,.0f} subscribers)"
         )
@@ -0,0 +1,149 @@
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+
+
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_LATENCY_MS = 25
+_LATENCY_WINDOW = 500
+
+
+class _Request:
+    def __init__(self, texts):
+        self.texts = texts
+        self.labels = [None] * len(texts)
+        self.scores = [0.0] * len(texts)
+        self.remaining = len(texts)
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class MicroBatchServer:
+    """In-process inference service shared by every Streamlit session.
+
+    Callers submit comment lists; a single worker thread drains the queue,
+    coalesces pieces from all callers into micro-batches of up to
+    ``max_batch_size`` comments, waiting at most ``max_latency_ms`` for a
+    batch to fill, runs ``classify(texts) -> (labels, scores, stats)`` once
+    per batch and routes the results back to each caller.
+    """
+
+    def __init__(self, classify, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_latency_ms=DEFAULT_MAX_LATENCY_MS):
+        self.classify_batch = classify
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000
+        self._queue = queue.Queue()
+        self._carry = None
+        self._lock = threading.Lock()
+        self._pending_comments = 0
+        self._batches = 0
+        self._comments = 0
+        self._batch_sizes = deque(maxlen=_LATENCY_WINDOW)
+        self._latencies = deque(maxlen=_LATENCY_WINDOW)
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def submit(self, texts):
+        """Queue comments and return a Future of (labels, scores)"""
+        request = _Request([str(t) for t in texts])
+        if not request.texts:
+            request.future.set_result(([], []))
+            return request.future
+
+        with self._lock:
+            self._pending_comments += len(request.texts)
+        for start in range(0, len(request.texts), self.max_batch_size):
+            self._queue.put((request, start, min(start + self.max_batch_size, len(request.texts))))
+        return request.future
+
+    def classify(self, texts):
+        """Same contract as ``classify_comments``, served through the queue"""
+        start = time.perf_counter()
+        labels, scores = self.submit(texts).result()
+        elapsed = time.perf_counter() - start
+        stats = {
+            "comments": len(labels),
+            "batches": -(-len(labels) // self.max_batch_size),
+            "seconds": elapsed,
+            "comments_per_sec": len(labels) / elapsed if labels and elapsed > 0 else 0.0,
+            "failed": [i for i, label in enumerate(labels) if label is None],
+        }
+        return labels, scores, stats
+
+    def _collect(self):
+        """Block for the first piece, then fill the batch until the deadline"""
+        if self._carry is not None:
+            pieces, self._carry = [self._carry], None
+        else:
+            pieces = [self._queue.get()]
+        size = pieces[0][2] - pieces[0][1]
+        deadline = time.perf_counter() + self.max_latency
+        while size < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                piece = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if size + piece[2] - piece[1] > self.max_batch_size:
+                # Keep the batch bounded; the piece opens the next batch
+                self._carry = piece
+                break
+            pieces.append(piece)
+            size += piece[2] - piece[1]
+        return pieces, size
+
+    def _serve(self):
+        while True:
+            pieces, size = self._collect()
+            texts = [t for request, start, end in pieces for t in request.texts[start:end]]
+            try:
+                labels, scores, _ = self.classify_batch(texts)
+            except Exception as e:
+                for request, _, _ in pieces:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+                with self._lock:
+                    self._pending_comments -= size
+                continue
+
+            offset = 0
+            now = time.perf_counter()
+            finished = []
+            for request, start, end in pieces:
+                count = end - start
+                request.labels[start:end] = labels[offset : offset + count]
+                request.scores[start:end] = scores[offset : offset + count]
+                offset += count
+                request.remaining -= count
+                if request.remaining == 0 and not request.future.done():
+                    finished.append(request)
+
+            with self._lock:
+                self._pending_comments -= size
+                self._batches += 1
+                self._comments += size
+                self._batch_sizes.append(size)
+                for request in finished:
+                    self._latencies.append(now - request.enqueued_at)
+
+            for request in finished:
+                request.future.set_result((request.labels, request.scores))
+
+    def metrics(self):
+        """Queue depth, batch size and request latency statistics"""
+        with self._lock:
+            latencies = np.array(self._latencies) * 1000
+            return {
+                "queue_depth": self._pending_comments,
+                "batches": self._batches,
+                "comments": self._comments,
+                "avg_batch_size": float(np.mean(self._batch_sizes)) if self._batch_sizes else 0.0,
+                "p50_latency_ms": float(np.percentile(latencies, 50)) if len(latencies) else 0.0,
+                "p95_latency_ms": float(np.percentile(latencies, 95)) if len(latencies) else 0.0,
+            }
@@ -0,0 +1,115 @@
+import threading
+from collections import OrderedDict
+
+
+DEFAULT_MAX_JOBS = 8
+DEFAULT_MAX_RUNNING = 4
+
+
+class JobRegistry:
+    """Process-wide registry of background jobs, shared by every session.
+
+    Jobs expose ``start()``, ``cancel()``, ``status`` and ``finished``. At
+    most ``max_running`` jobs run at once; past ``max_jobs`` entries the
+    least recently used finished jobs are evicted, running ones never are.
+    Sessions showing a job ``watch`` it; ``release`` cancels the job once
+    no session watches it any more.
+    """
+
+    def __init__(self, max_jobs=DEFAULT_MAX_JOBS, max_running=DEFAULT_MAX_RUNNING):
+        self.max_jobs = max_jobs
+        self.max_running = max_running
+        self._jobs = OrderedDict()
+        # Keys whose job is being built, set once it is registered
+        self._building = {}
+        self._watchers = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            return self._jobs.get(key)
+
+    def running(self):
+        with self._lock:
+            return sum(not job.finished for job in self._jobs.values())
+
+    def start(self, key, make_job):
+        """Return the job under ``key``, starting ``make_job()`` if needed.
+
+        A failed, degraded or cancelled job is replaced; a finished job is
+        started again so it can pick up work that is still pending. Raises
+        RuntimeError when ``max_running`` jobs are already running. The key
+        is reserved while ``make_job()`` runs, so sessions starting the
+        same key at once share one job.
+        """
+        while True:
+            with self._lock:
+                building = self._building.get(key)
+                if building is None:
+                    job = self._jobs.get(key)
+                    replace = job is None or job.status in (
+                        "failed",
+                        "degraded",
+                        "cancelled",
+                    )
+                    if replace:
+                        running = len(self._building) + sum(
+                            not j.finished for j in self._jobs.values()
+                        )
+                        if running >= self.max_running:
+                            raise RuntimeError(
+                                f"{running} analyses are already running; "
+                                "try again when one has finished"
+                            )
+                        building = self._building[key] = threading.Event()
+                    break
+            # Another session is building this job; use it once it is there
+            building.wait()
+
+        # Building a job can be slow; other keys keep using the registry
+        if replace:
+            try:
+                job = make_job()
+            except BaseException:
+                with self._lock:
+                    del self._building[key]
+                building.set()
+                raise
+        with self._lock:
+            if replace:
+                self._jobs[key] = job
+                del self._building[key]
+            self._jobs.move_to_end(key)
+            self._evict(keep=key)
+            job.start()
+        if replace:
+            building.set()
+        return job
+
+    def watch(self, key, session):
+        """Record that ``session`` shows the job under ``key``"""
+        with self._lock:
+            self._watchers.setdefault(key, set()).add(session)
+
+    def release(self, key, session):
+        """Stop watching ``key``; cancel its job if nobody else watches it"""
+        with self._lock:
+            watchers = self._watchers.get(key, set())
+            watchers.discard(session)
+            job = self._jobs.get(key)
+            if watchers or job is None or job.finished:
+                return
+        job.cancel()
+
+    def cancel(self, key):
+        """Cancel the job under ``key`` if it is still running"""
+        job = self.get(key)
+        if job is not None and not job.finished:
+            job.cancel()
+
+    def _evict(self, keep):
+        excess = len(self._jobs) - self.max_jobs
+        finished = [k for k, job in self._jobs.items() if job.finished and k != keep]
+        for key in finished[: max(excess, 0)]:
+            del self._jobs[key]
+            self._watchers.pop(key, None)
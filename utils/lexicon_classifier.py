@@ -0,0 +1,90 @@
+import re
+
+
+POSITIVE_WORDS_PATH = "data/positive_words.txt"
+NEGATIVE_WORDS_PATH = "data/negative_words.txt"
+NEGATIONS = {"tidak", "bukan", "jangan", "belum", "tanpa", "kurang"}
+# Contrast and questions usually flip or hedge the overall sentiment
+HEDGES = {"tapi", "tetapi", "namun", "walaupun", "meskipun", "padahal", "?"}
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+_JOINERS = {"️", "‍"}
+
+
+def load_word_list(path):
+    """Load a newline-separated word list"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return {line.strip().lower() for line in f if line.strip()}
+    except OSError:
+        return set()
+
+
+def tokenize(text):
+    """Lowercase words and emoji; ASCII punctuation except '?' is dropped"""
+    return [
+        t
+        for t in TOKEN_PATTERN.findall(str(text).lower())
+        if t not in _JOINERS and (t.isalnum() or t == "?" or ord(t[0]) > 0x2000)
+    ]
+
+
+class LexiconScorer:
+    """Rule-based sentiment scorer over normalized comment tokens.
+
+    Counts positive/negative lexicon hits (unigrams and bigrams, with a
+    preceding negation flipping the polarity) and returns a confidence in
+    [0, 1] that grows with how one-sided the hits are and how much of the
+    comment they cover. Comments with hedges ("tapi", "?") or no hits get
+    confidence 0 and should go to the model.
+    """
+
+    def __init__(self, positive=None, negative=None):
+        self.positive = positive if positive is not None else load_word_list(POSITIVE_WORDS_PATH)
+        self.negative = negative if negative is not None else load_word_list(NEGATIVE_WORDS_PATH)
+
+    def _polarity(self, term):
+        if term in self.positive:
+            return 1
+        if term in self.negative:
+            return -1
+        return 0
+
+    def score(self, text):
+        """Return (label, confidence) for one normalized comment"""
+        tokens = tokenize(text)
+        if not tokens or any(t in HEDGES for t in tokens):
+            return None, 0.0
+
+        positive = negative = covered = 0
+        i = 0
+        while i < len(tokens):
+            width = 1
+            polarity = 0
+            if i + 1 < len(tokens):
+                polarity = self._polarity(f"{tokens[i]} {tokens[i + 1]}")
+                width = 2 if polarity else 1
+            if not polarity:
+                polarity = self._polarity(tokens[i])
+
+            if polarity:
+                if i > 0 and tokens[i - 1] in NEGATIONS:
+                    polarity = -polarity
+                    covered += 1
+                positive += polarity > 0
+                negative += polarity < 0
+                covered += width
+            i += width
+
+        hits = positive + negative
+        if not hits:
+            return None, 0.0
+
+        label = "Positive" if positive >= negative else "Negative"
+        agreement = abs(positive - negative) / hits
+        coverage = min(1.0, covered / len(tokens) * 2)
+        return label, agreement * coverage
+
+    def score_many(self, texts):
+        """Return (labels, confidences) for a list of comments"""
+        results = [self.score(text) for text in texts]
+        return [r[0] for r in results], [r[1] for r in results]
@@ -0,0 +1,139 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+
+CACHE_DIR = ".cache"
+DEFAULT_STORE_PATH = os.path.join(CACHE_DIR, "sentiment_predictions.sqlite")
+DEFAULT_MAX_ENTRIES = 500_000
+
+
+def model_fingerprint(model_dir):
+    """Identify a model directory by the name, size and mtime of its files.
+
+    Replacing or retraining the model changes the fingerprint, which
+    invalidates every prediction stored for the previous version.
+    """
+    digest = hashlib.sha1()
+    try:
+        names = sorted(os.listdir(model_dir))
+    except OSError:
+        names = []
+    for name in names:
+        path = os.path.join(model_dir, name)
+        if not os.path.isfile(path):
+            continue
+        stat = os.stat(path)
+        digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns};".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def comment_key(text, model_id):
+    """Hash a normalized comment together with the model id"""
+    return hashlib.sha1(f"{model_id}\x00{text}".encode("utf-8")).hexdigest()
+
+
+class SentimentPredictionStore:
+    """SQLite-backed store of sentiment predictions shared across sessions.
+
+    Rows are keyed by ``comment_key(normalized_comment, model_id)``, where
+    ``variant`` (e.g. "-int8") separates predictions of model variants. Rows of
+    any other model fingerprint are purged when the store is opened, and once the
+    store grows past ``max_entries`` the least recently used rows are
+    evicted down to 90% of the budget.
+    """
+
+    def __init__(
+        self, model_dir, path=DEFAULT_STORE_PATH, max_entries=DEFAULT_MAX_ENTRIES, variant=""
+    ):
+        self.fingerprint = model_fingerprint(model_dir)
+        self.model_id = self.fingerprint + variant
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS predictions (
+                    key TEXT PRIMARY KEY,
+                    model_id TEXT NOT NULL,
+                    label TEXT NOT NULL,
+                    score REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_predictions_last_used ON predictions(last_used)"
+            )
+            self._conn.execute(
+                "DELETE FROM predictions WHERE substr(model_id, 1, ?) != ?",
+                (len(self.fingerprint), self.fingerprint),
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+
+    def get_many(self, texts):
+        """Return {text: (label, score)} for the texts already in the store"""
+        keys = {comment_key(text, self.model_id): text for text in set(texts)}
+        found = {}
+        key_list = list(keys)
+        now = time.time()
+
+        with self._lock, self._conn:
+            for i in range(0, len(key_list), 500):
+                chunk = key_list[i : i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, label, score FROM predictions WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for key, label, score in rows:
+                    found[keys[key]] = (label, score)
+                self._conn.execute(
+                    f"UPDATE predictions SET last_used = ? WHERE key IN ({placeholders})",
+                    [now, *chunk],
+                )
+        return found
+
+    def put_many(self, predictions):
+        """Store {text: (label, score)} and evict old rows if over budget"""
+        now = time.time()
+        rows = [
+            (comment_key(text, self.model_id), self.model_id, label, float(score), now)
+            for text, (label, score) in predictions.items()
+        ]
+        if not rows:
+            return
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?)", rows
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+            if count > self.max_entries:
+                excess = count - int(self.max_entries * 0.9)
+                self._conn.execute(
+                    """
+                    DELETE FROM predictions WHERE key IN (
+                        SELECT key FROM predictions ORDER BY last_used ASC LIMIT ?
+                    )
+                    """,
+                    (excess,),
+                )
+
+    def clear(self):
+        """Drop every stored prediction"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM predictions")
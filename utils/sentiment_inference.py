@@ -0,0 +1,153 @@
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import torch
+from transformers import AutoConfig, AutoModelForSequenceClassification, AutoTokenizer
+
+from utils.prediction_store import CACHE_DIR, model_fingerprint
+
+
+DEFAULT_BATCH_SIZE = 32
+DEFAULT_MAX_LENGTH = 512
+FALLBACK_LABEL = "Neutral"
+QUANTIZED_CACHE_DIR = os.path.join(CACHE_DIR, "quantized")
+
+
+def quantize_model(model):
+    """Dynamically quantize the Linear layers of a model to int8"""
+    model.eval()
+    return torch.ao.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+
+
+def load_quantized_model(model_dir, cache_dir=QUANTIZED_CACHE_DIR):
+    """Load the int8 model, converting and caching it on first use.
+
+    The cached state dict is keyed by the model fingerprint and torch
+    version, so a replaced model or a torch upgrade triggers a fresh
+    conversion.
+    """
+    cache_path = os.path.join(
+        cache_dir,
+        f"{model_fingerprint(model_dir)}-torch{torch.__version__}.pt",
+    )
+
+    if os.path.exists(cache_path):
+        try:
+            config = AutoConfig.from_pretrained(model_dir)
+            model = quantize_model(
+                AutoModelForSequenceClassification.from_config(config)
+            )
+            model.load_state_dict(torch.load(cache_path, weights_only=False))
+            return model
+        except Exception:
+            pass
+
+    model = quantize_model(AutoModelForSequenceClassification.from_pretrained(model_dir))
+    # Pool workers convert concurrently; readers only ever see a whole file
+    tmp_path = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".pt.tmp")
+        with os.fdopen(fd, "wb") as f:
+            torch.save(dict(model.state_dict()), f)
+        os.replace(tmp_path, cache_path)
+    except (OSError, RuntimeError):
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return model
+
+
+def load_classifier(model_dir, quantized=False):
+    """Load tokenizer and model as an object usable by classify_comments"""
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    if quantized:
+        model = load_quantized_model(model_dir)
+    else:
+        model = AutoModelForSequenceClassification.from_pretrained(model_dir)
+        model.eval()
+    return SimpleNamespace(tokenizer=tokenizer, model=model)
+
+
+def _bucket_batches(lengths, batch_size):
+    """Group indices of similar token length into batches"""
+    order = np.argsort(lengths, kind="stable")
+    return [order[i : i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+def classify_comments(
+    texts,
+    sentiment_pipeline,
+    batch_size=DEFAULT_BATCH_SIZE,
+    max_length=DEFAULT_MAX_LENGTH,
+):
+    """Classify a list of comments in length-bucketed batches.
+
+    Returns (labels, scores, stats) where labels/scores follow the order of
+    ``texts`` and stats holds the comment count, elapsed time and throughput.
+    Rows of a batch the model failed on (or all rows, without a model) keep
+    a ``None`` label; their positions are listed in ``stats["failed"]``.
+    """
+    texts = [str(t) for t in texts]
+    labels = [None] * len(texts)
+    scores = [0.0] * len(texts)
+    stats = {
+        "comments": len(texts),
+        "batches": 0,
+        "seconds": 0.0,
+        "comments_per_sec": 0.0,
+        "failed": [],
+    }
+
+    if not texts:
+        return labels, scores, stats
+    if sentiment_pipeline is None:
+        stats["failed"] = list(range(len(texts)))
+        return labels, scores, stats
+
+    tokenizer = sentiment_pipeline.tokenizer
+    model = sentiment_pipeline.model
+    id2label = model.config.id2label
+    max_length = min(max_length, getattr(tokenizer, "model_max_length", max_length))
+
+    start = time.perf_counter()
+
+    # Truncate by tokens, not characters; padding happens per bucket below
+    encoded = tokenizer(texts, truncation=True, max_length=max_length)
+    input_ids = encoded["input_ids"]
+    lengths = np.fromiter((len(ids) for ids in input_ids), dtype=np.int64, count=len(input_ids))
+
+    model.eval()
+    batches = _bucket_batches(lengths, batch_size)
+    with torch.inference_mode():
+        for batch_idx in batches:
+            features = [
+                {key: encoded[key][i] for key in encoded.keys()} for i in batch_idx
+            ]
+            batch = tokenizer.pad(features, return_tensors="pt")
+            batch = {k: v.to(model.device) for k, v in batch.items()}
+            try:
+                logits = model(**batch).logits
+            except RuntimeError:
+                # e.g. out of memory; the rows stay unlabelled, not "Neutral"
+                stats["failed"].extend(int(i) for i in batch_idx)
+                continue
+            probs = torch.softmax(logits, dim=-1)
+            best_scores, best_ids = probs.max(dim=-1)
+            for i, label_id, score in zip(
+                batch_idx, best_ids.tolist(), best_scores.tolist()
+            ):
+                labels[i] = id2label.get(label_id, FALLBACK_LABEL)
+                scores[i] = score
+
+    elapsed = time.perf_counter() - start
+    stats["batches"] = len(batches)
+    stats["seconds"] = elapsed
+    stats["comments_per_sec"] = len(texts) / elapsed if elapsed > 0 else 0.0
+    stats["failed"].sort()
+
+    return labels, scores, stats
@@ -0,0 +1,345 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.comment_dedup import dedup_comments
+
+
+DEFAULT_CHUNK_SIZE = 256
+DEFAULT_CASCADE_THRESHOLD = 0.8
+DEFAULT_AGREEMENT_SAMPLE = 200
+
+
+class SentimentJob:
+    """Sentiment labelling of a comment list that can run in the background.
+
+    Comments are deduplicated first, cached predictions from ``store`` are
+    applied straight away, and the remaining group representatives are
+    classified chunk by chunk with ``classify(texts) -> (labels, scores,
+    stats)``. Labels are kept per group and fanned out to all members, so
+    ``snapshot()`` always returns the comments labelled so far.
+
+    With a ``prefilter(texts) -> (labels, confidences)`` (cascade mode),
+    the prefilter scores every representative once. Groups it labels with
+    at least ``prefilter_threshold`` confidence skip the model; a random
+    sample of them is still sent to the model afterwards to measure
+    agreement. The threshold is applied when labels are read, so
+    ``set_threshold`` re-labels without rescoring; a finished job then only
+    needs ``start()`` again for the groups newly routed to the model.
+
+    Comments the model fails on (``None`` labels) are neither stored nor
+    marked done; the job then finishes as "degraded" with the number of
+    comments left unlabelled in ``stats["failed"]``. ``cancel()`` stops the
+    job after the current chunk.
+    """
+
+    def __init__(
+        self,
+        texts,
+        classify,
+        store=None,
+        dedup=True,
+        records=None,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        prefilter=None,
+        prefilter_threshold=DEFAULT_CASCADE_THRESHOLD,
+        agreement_sample=DEFAULT_AGREEMENT_SAMPLE,
+    ):
+        self.texts = [str(t) for t in texts]
+        self.classify = classify
+        self.store = store
+        self.dedup = dedup
+        self.records = records
+        self.chunk_size = chunk_size
+        self.prefilter = prefilter
+        self.prefilter_threshold = prefilter_threshold
+        self.agreement_sample = agreement_sample
+
+        self.status = "pending"
+        self.error = None
+        self.stats = {
+            "comments": 0,
+            "batches": 0,
+            "seconds": 0.0,
+            "comments_per_sec": 0.0,
+            "cached": 0,
+            "dedup_ratio": 0.0,
+            "dedup_seconds": 0.0,
+            "dedup_saved_seconds": 0.0,
+            "cascade_labelled": 0,
+            "routed_to_model": 1.0,
+            "cascade_agreement": None,
+            "failed": 0,
+        }
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._cancelled = False
+        # Per-comment group index and per-group state, set up by _prepare
+        self._assignment = None
+
+    @classmethod
+    def from_labels(cls, texts, labels, scores, records=None):
+        """A finished job for comments labelled ahead of time (snapshots)"""
+        job = cls(texts, classify=None, dedup=False, records=records)
+        total = len(job.texts)
+        job._init_groups(np.arange(total), list(job.texts))
+        job._model_labels[:] = np.asarray(labels, dtype=object)
+        job._model_scores[:] = np.asarray(scores, dtype=np.float64)
+        job._model_done[:] = True
+        job._attempted[:] = True
+        job.status = "done"
+        job.started_at = job.finished_at = time.time()
+        return job
+
+    def start(self):
+        """Run the job in a daemon thread.
+
+        A finished job is restarted when groups still wait for the model,
+        e.g. after ``set_threshold`` routed more of them there.
+        """
+        restart = (
+            self._thread is not None
+            and self.status in ("done", "degraded")
+            and self.has_pending()
+        )
+        if self._thread is None or restart:
+            self.status = "running"
+            self._thread = threading.Thread(target=self.run, daemon=True)
+            self._thread.start()
+        return self
+
+    def run(self):
+        """Run the job in the calling thread"""
+        self.started_at = time.time()
+        self.status = "running"
+        try:
+            self._run()
+            if self._cancelled:
+                self.status = "cancelled"
+            else:
+                self.status = "degraded" if self.stats["failed"] else "done"
+        except Exception as e:
+            self.error = e
+            self.status = "failed"
+        finally:
+            self.finished_at = time.time()
+        return self
+
+    def cancel(self):
+        """Stop the job after the chunk being classified"""
+        self._cancelled = True
+
+    def set_threshold(self, threshold):
+        """Apply a new cascade threshold to the labels read from the job"""
+        with self._lock:
+            self.prefilter_threshold = threshold
+            if self._assignment is not None:
+                self._update_stats()
+        return self
+
+    def has_pending(self):
+        """True if some groups still need the model at the current threshold"""
+        with self._lock:
+            if self._assignment is None:
+                return True
+            return bool(self._pending_mask().any())
+
+    def _init_groups(self, assignment, rep_texts):
+        groups = len(rep_texts)
+        self._rep_texts = rep_texts
+        self._sizes = np.bincount(assignment, minlength=groups)
+        self._model_labels = np.empty(groups, dtype=object)
+        self._model_scores = np.zeros(groups, dtype=np.float64)
+        self._model_done = np.zeros(groups, dtype=bool)
+        self._attempted = np.zeros(groups, dtype=bool)
+        self._cheap_labels = np.empty(groups, dtype=object)
+        self._cheap_conf = np.full(groups, -np.inf)
+        self._cached = np.zeros(groups, dtype=bool)
+        self._assignment = assignment
+
+    def _prepare(self):
+        start = time.perf_counter()
+        if self.dedup:
+            representatives, assignment, dedup_stats = dedup_comments(self.texts)
+            self.stats["dedup_ratio"] = dedup_stats["dedup_ratio"]
+        else:
+            assignment, _ = pd.factorize(pd.Series(self.texts, dtype=object))
+            representatives = np.unique(assignment, return_index=True)[1].tolist()
+        self.stats["dedup_seconds"] = time.perf_counter() - start
+
+        rep_texts = [self.texts[i] for i in representatives]
+        known = self.store.get_many(rep_texts) if self.store is not None else {}
+        cached = [g for g, text in enumerate(rep_texts) if text in known]
+        pending = [g for g, text in enumerate(rep_texts) if text not in known]
+
+        # Lexicon scores are computed once; the threshold applies at read time
+        cheap_labels = confidences = None
+        if self.prefilter is not None and pending:
+            cheap_labels, confidences = self.prefilter([rep_texts[g] for g in pending])
+
+        with self._lock:
+            self._init_groups(np.asarray(assignment), rep_texts)
+            if cached:
+                self._model_labels[cached] = [known[rep_texts[g]][0] for g in cached]
+                self._model_scores[cached] = [known[rep_texts[g]][1] for g in cached]
+                self._model_done[cached] = True
+                self._attempted[cached] = True
+                self._cached[cached] = True
+            if cheap_labels is not None:
+                for g, label, confidence in zip(pending, cheap_labels, confidences):
+                    if label is not None:
+                        self._cheap_labels[g] = label
+                        self._cheap_conf[g] = confidence
+            self.stats["cached"] = len(cached)
+            self._update_stats()
+
+    def _run(self):
+        if self._assignment is None:
+            self._prepare()
+
+        inferred = self.stats["comments"]
+        infer_seconds = self.stats["seconds"]
+        while not self._cancelled:
+            with self._lock:
+                chunk = np.flatnonzero(self._pending_mask())[: self.chunk_size]
+            if not len(chunk):
+                break
+            labels, scores, chunk_stats = self._classify_groups(chunk)
+
+            inferred += len(chunk)
+            infer_seconds += chunk_stats["seconds"]
+            with self._lock:
+                self.stats["comments"] = inferred
+                self.stats["batches"] += chunk_stats["batches"]
+                self.stats["seconds"] = infer_seconds
+                self.stats["comments_per_sec"] = (
+                    inferred / infer_seconds if infer_seconds > 0 else 0.0
+                )
+
+        if not self._cancelled and self.prefilter is not None and self.agreement_sample:
+            self._measure_agreement()
+
+        with self._lock:
+            self._update_stats()
+            if self.stats["comments_per_sec"] > 0:
+                self.stats["dedup_saved_seconds"] = (
+                    len(self.texts) - len(self._rep_texts)
+                ) / self.stats["comments_per_sec"]
+
+    def _classify_groups(self, groups):
+        """Run the model on some groups; only scored rows are kept and stored"""
+        texts = [self._rep_texts[g] for g in groups]
+        labels, scores, chunk_stats = self.classify(texts)
+        scored = [i for i, label in enumerate(labels) if label is not None]
+        if self.store is not None and scored:
+            self.store.put_many({texts[i]: (labels[i], scores[i]) for i in scored})
+        with self._lock:
+            self._attempted[groups] = True
+            for i in scored:
+                g = groups[i]
+                self._model_labels[g] = labels[i]
+                self._model_scores[g] = scores[i]
+                self._model_done[g] = True
+        return labels, scores, chunk_stats
+
+    def _measure_agreement(self):
+        with self._lock:
+            confident = np.flatnonzero(self._cheap_conf >= self.prefilter_threshold)
+        if not len(confident):
+            return
+        rng = np.random.default_rng(0)
+        sample = rng.choice(
+            confident, min(self.agreement_sample, len(confident)), replace=False
+        )
+        with self._lock:
+            sample = sample[~self._attempted[sample]]
+        if len(sample):
+            self._classify_groups(sample)
+        with self._lock:
+            sample = confident[self._model_done[confident]]
+            if len(sample):
+                self.stats["cascade_agreement"] = float(
+                    np.mean(self._model_labels[sample] == self._cheap_labels[sample])
+                )
+
+    def _pending_mask(self):
+        """Groups that need the model at the current threshold (lock held)"""
+        return ~self._attempted & (self._cheap_conf < self.prefilter_threshold)
+
+    def _group_labels(self):
+        """(labels, scores, done) per group at the current threshold (lock held)"""
+        cheap = self._cheap_conf >= self.prefilter_threshold
+        labels = np.where(cheap, self._cheap_labels, self._model_labels)
+        scores = np.where(cheap, self._cheap_conf, self._model_scores)
+        return labels, scores, cheap | self._model_done
+
+    def _update_stats(self):
+        """Cascade and failure statistics at the current threshold (lock held)"""
+        cheap = self._cheap_conf >= self.prefilter_threshold
+        if self.prefilter is not None:
+            scored = ~self._cached
+            self.stats["cascade_labelled"] = int(cheap.sum())
+            self.stats["routed_to_model"] = float(
+                (scored & ~cheap).sum() / max(int(scored.sum()), 1)
+            )
+        failed = self._attempted & ~self._model_done & ~cheap
+        self.stats["failed"] = int(self._sizes[failed].sum())
+
+    @property
+    def labels(self):
+        """Label per comment (None where not labelled yet)"""
+        if self._assignment is None:
+            return np.full(len(self.texts), None, dtype=object)
+        with self._lock:
+            labels, _, done = self._group_labels()
+        return np.where(done, labels, None)[self._assignment]
+
+    @property
+    def scores(self):
+        """Score per comment (0.0 where not labelled yet)"""
+        if self._assignment is None:
+            return np.zeros(len(self.texts), dtype=np.float64)
+        with self._lock:
+            _, scores, done = self._group_labels()
+        return np.where(done, scores, 0.0).astype(np.float64)[self._assignment]
+
+    @property
+    def finished(self):
+        return self.status in ("done", "degraded", "failed", "cancelled")
+
+    def progress(self):
+        """Return (labelled, total, eta_seconds or None)"""
+        total = len(self.texts)
+        labelled = 0
+        if self._assignment is not None:
+            with self._lock:
+                _, _, done = self._group_labels()
+                labelled = int(self._sizes[done].sum())
+        eta = None
+        if self.started_at and 0 < labelled < total:
+            elapsed = time.time() - self.started_at
+            eta = elapsed / labelled * (total - labelled)
+        return labelled, total, eta
+
+    def snapshot(self):
+        """Return the records labelled so far with sentiment/score columns"""
+        records = self.records
+        if records is None:
+            records = pd.DataFrame({"comment_normalized": self.texts})
+        if self._assignment is None:
+            mask = np.zeros(len(self.texts), dtype=bool)
+            labels, scores = mask.astype(object), mask.astype(np.float64)
+        else:
+            with self._lock:
+                group_labels, group_scores, done = self._group_labels()
+            mask = done[self._assignment]
+            labels = group_labels[self._assignment][mask]
+            scores = group_scores[self._assignment][mask].astype(np.float64)
+        partial = records[mask].copy()
+        partial["sentiment"] = labels
+        partial["score"] = scores
+        return partial
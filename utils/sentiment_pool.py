@@ -0,0 +1,89 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.sentiment_inference import DEFAULT_BATCH_SIZE, classify_comments, load_classifier
+
+
+DEFAULT_SHARD_SIZE = 256
+
+# Per-worker state, filled in by _init_worker
+_worker_classifier = None
+
+
+def default_pool_shape():
+    """Split the host CPUs into (workers, threads per worker)"""
+    cpus = os.cpu_count() or 1
+    workers = max(1, min(4, cpus // 2))
+    return workers, max(1, cpus // workers)
+
+
+def _init_worker(model_dir, num_threads, quantized):
+    """Load the tokenizer/model once per worker process"""
+    global _worker_classifier
+
+    import torch
+
+    torch.set_num_threads(num_threads)
+    # safetensors weights are memory-mapped, so workers share the page cache
+    _worker_classifier = load_classifier(model_dir, quantized=quantized)
+
+
+def _classify_shard(args):
+    texts, batch_size = args
+    labels, scores, _ = classify_comments(texts, _worker_classifier, batch_size=batch_size)
+    return labels, scores
+
+
+class SentimentWorkerPool:
+    """Process pool that shards comment lists across sentiment workers.
+
+    Each worker loads the model from ``model_dir`` once and pins torch to
+    ``threads_per_worker`` intra-op threads; ``quantized`` selects the int8
+    model. Results come back in input order, shard by shard.
+    """
+
+    def __init__(self, model_dir, workers=None, threads_per_worker=None, quantized=False):
+        default_workers, default_threads = default_pool_shape()
+        self.workers = workers or default_workers
+        self.threads_per_worker = threads_per_worker or default_threads
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_dir, self.threads_per_worker, quantized),
+        )
+
+    def classify_iter(self, texts, batch_size=DEFAULT_BATCH_SIZE, shard_size=DEFAULT_SHARD_SIZE):
+        """Yield (offset, labels, scores) for each shard, in input order"""
+        texts = [str(t) for t in texts]
+        shards = [
+            (texts[i : i + shard_size], batch_size)
+            for i in range(0, len(texts), shard_size)
+        ]
+        for i, (labels, scores) in enumerate(self._executor.map(_classify_shard, shards)):
+            yield i * shard_size, labels, scores
+
+    def classify(self, texts, batch_size=DEFAULT_BATCH_SIZE, shard_size=DEFAULT_SHARD_SIZE):
+        """Same contract as ``classify_comments``, executed on the pool"""
+        start = time.perf_counter()
+        labels, scores = [], []
+        batches = 0
+        for _, shard_labels, shard_scores in self.classify_iter(texts, batch_size, shard_size):
+            labels.extend(shard_labels)
+            scores.extend(shard_scores)
+            batches += -(-len(shard_labels) // batch_size)
+
+        elapsed = time.perf_counter() - start
+        stats = {
+            "comments": len(labels),
+            "batches": batches,
+            "seconds": elapsed,
+            "comments_per_sec": len(labels) / elapsed if labels and elapsed > 0 else 0.0,
+            "failed": [i for i, label in enumerate(labels) if label is None],
+        }
+        return labels, scores, stats
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,95 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from utils.helpers import explode_comments
+
+
+SENTIMENT_MODEL_DIR = "./models/sentiment_analysis"
+SENTIMENT_BATCH_SIZE = 32
+
+
+def read_sentiment_mappings():
+    """Load all informal-formal mappings from the data files"""
+    mappings = {}
+
+    try:
+        file_1 = pd.read_csv("data/informal_formal_1.csv")
+        file_1_map = dict(
+            zip(
+                file_1["transformed"].astype(str).str.lower(),
+                file_1["original-for"].astype(str).str.lower(),
+            )
+        )
+        mappings.update(file_1_map)
+    except:
+        pass
+
+    try:
+        with open("data/informal_formal_2.txt", "r", encoding="utf-8") as f:
+            mappings.update(json.load(f))
+    except:
+        pass
+
+    try:
+        with open(
+            "data/update_combined_slang_words.txt", "r", encoding="utf-8"
+        ) as f:
+            mappings.update(json.load(f))
+    except:
+        pass
+
+    custom_map = {
+        "apkh": "apakah",
+        "gak": "tidak",
+        "ga": "tidak",
+        "gk": "tidak",
+        "nggk": "tidak",
+        "agar": "supaya",
+        "o on": "bodoh",
+        "blo on": "bodoh",
+        "lekas": "segera",
+        "sbr": "sabar",
+        "nggan": "tidak mau"
+    }
+    mappings.update(custom_map)
+
+    return mappings
+
+
+def build_comment_records(df, slang_normalizer, comments=None, comment_text=None):
+    """One normalized row per comment, from the long comment table.
+
+    ``comments`` is the ``explode_comments`` table computed at load time;
+    it is only rebuilt when missing. Its text is read from ``comment_text``
+    (the lazy COMMENT_TEXT_COLUMN) when the table was loaded without it.
+    """
+    if comments is None:
+        comments = explode_comments(df)
+    texts = (
+        comments["text"].to_numpy()
+        if "text" in comments.columns
+        else comment_text.take(np.arange(len(comments)))
+    )
+
+    rows = comments["row"].to_numpy()
+    records = pd.DataFrame(
+        {
+            "video_id": comments["video_id"].to_numpy(),
+            "tanggal_upload": (
+                df["Tanggal Upload"].to_numpy()[rows]
+                if "Tanggal Upload" in df.columns
+                else None
+            ),
+            "comment_raw": texts,
+        }
+    )
+    records["comment_normalized"] = slang_normalizer.normalize_many(
+        records["comment_raw"].tolist()
+    )
+    # Snapshots from precompute.py carry the labels already
+    for column in ("sentiment", "score"):
+        if column in comments.columns:
+            records[column] = comments[column].to_numpy()
+    return records
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_SAMPLE_SIZE = 2000
+Z_95 = 1.96
+# Draws per stratum, so every stratum has a within-stratum variance
+MIN_STRATUM_DRAWS = 2
+SENTIMENT_LABELS = ["Positive", "Negative", "Neutral"]
+
+
+def comment_strata(records):
+    """Stratum of each comment: its video's upload date, else the video id"""
+    strata = pd.Series(records["video_id"].astype(str).values, index=records.index)
+    if "tanggal_upload" in records.columns:
+        dates = pd.to_datetime(records["tanggal_upload"], errors="coerce", utc=True)
+        has_date = dates.notna()
+        strata[has_date] = dates[has_date].dt.strftime("%Y-%m-%d")
+    return strata
+
+
+def collapse_strata(strata, max_strata):
+    """Merge neighbouring strata until there are at most ``max_strata``.
+
+    Strata are taken in sorted order (upload dates chronologically) and
+    cut into runs of roughly equal population; a merged stratum is named
+    after its first and last member.
+    """
+    strata = pd.Series(strata, dtype=object)
+    sizes = strata.value_counts().sort_index()
+    if len(sizes) <= max(max_strata, 1):
+        return strata
+    before = (sizes.cumsum() - sizes).to_numpy()
+    bins = np.minimum(before * max_strata // sizes.sum(), max_strata - 1)
+    names = {}
+    for _, members in pd.Series(sizes.index, index=bins).groupby(level=0):
+        members = members.tolist()
+        name = members[0] if len(members) == 1 else f"{members[0]}..{members[-1]}"
+        names.update(dict.fromkeys(members, name))
+    return strata.map(names)
+
+
+def stratified_sample(strata, sample_size=DEFAULT_SAMPLE_SIZE, seed=0):
+    """Draw positional indices with proportional allocation per stratum.
+
+    Every stratum gets ``MIN_STRATUM_DRAWS`` comments (or all of them) so
+    each contributes a variance to the estimate. The sample never exceeds
+    ``sample_size`` as long as there are at most ``sample_size //
+    MIN_STRATUM_DRAWS`` strata (see ``collapse_strata``).
+    """
+    strata = pd.Series(np.asarray(strata))
+    if sample_size >= len(strata):
+        return np.arange(len(strata))
+
+    rng = np.random.default_rng(seed)
+    sizes = strata.value_counts()
+    allocation = np.maximum(
+        MIN_STRATUM_DRAWS, np.round(sizes * sample_size / len(strata))
+    ).astype(int)
+    allocation = np.minimum(allocation, sizes)
+    # Rounding up small strata can overshoot; take it from the largest
+    excess = int(allocation.sum()) - sample_size
+    while excess > 0:
+        reducible = allocation[allocation > MIN_STRATUM_DRAWS]
+        if reducible.empty:
+            break
+        allocation[reducible.idxmax()] -= 1
+        excess -= 1
+
+    picks = []
+    for stratum, positions in strata.groupby(strata).indices.items():
+        picks.append(rng.choice(positions, allocation[stratum], replace=False))
+    return np.sort(np.concatenate(picks))
+
+
+def estimate_shares(sample, strata_sizes, label_col="sentiment", strata_col="stratum"):
+    """Stratified estimate of each label's share with a 95% interval.
+
+    ``strata_sizes`` maps stratum -> number of comments in the population.
+    Uses the stratified mean with finite population correction. The
+    within-stratum variance uses the Agresti-Coull adjusted proportion
+    (x + 1) / (n + 2), so a stratum whose few draws all agree still adds
+    variance instead of none.
+    """
+    strata_sizes = pd.Series(strata_sizes)
+    observed = sample.groupby(strata_col)[label_col]
+    counts = observed.size()
+    sizes = strata_sizes.reindex(counts.index).astype(float)
+    weights = sizes / sizes.sum()
+
+    rows = []
+    for label in SENTIMENT_LABELS:
+        hits = observed.apply(lambda s: (s == label).sum())
+        p_h = hits / counts
+        share = float((weights * p_h).sum())
+        p_adj = (hits + 1) / (counts + 2)
+        fpc = ((sizes - counts) / sizes.where(sizes > 1, 1)).clip(lower=0)
+        variance = float((weights**2 * fpc * p_adj * (1 - p_adj) / counts).sum())
+        margin = Z_95 * np.sqrt(variance)
+        rows.append(
+            {
+                "sentiment": label,
+                "share": share,
+                "ci_low": max(0.0, share - margin),
+                "ci_high": min(1.0, share + margin),
+                "margin": margin,
+            }
+        )
+    return pd.DataFrame(rows)
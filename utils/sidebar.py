@@ -1,8 +1,12 @@
+import os
+
 import streamlit as st
 
+from utils.snapshot import list_snapshots
+
 
 def render_sidebar():
-    """Render sidebar menu and file uploader"""
+    """Render sidebar menu, file uploader (several files) and snapshot picker"""
     
     # Logo
     st.sidebar.image("assets/SocialSight.png", width=300)
@@ -35,6 +39,19 @@ def render_sidebar():
     menu = st.session_state["menu"]
 
     st.sidebar.write("---")
-    uploaded_file = st.sidebar.file_uploader("Upload File Data", type=["csv", "xlsx"])
-
-    return menu, uploaded_file
\ No newline at end of file
+    uploaded_files = st.sidebar.file_uploader(
+        "Upload File Data", type=["csv", "xlsx"], accept_multiple_files=True
+    )
+
+    # Snapshots (precompute.py or "Save snapshot") open without re-parsing
+    snapshot = None
+    snapshots = list_snapshots()
+    if snapshots:
+        choice = st.sidebar.selectbox(
+            "Or open a snapshot",
+            ["—"] + snapshots,
+            format_func=lambda path: os.path.basename(path) if path != "—" else path,
+        )
+        snapshot = choice if choice != "—" else None
+
+    return menu, uploaded_files, snapshot
\ No newline at end of file
@@ -0,0 +1,374 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.text_store import LazyTextColumn, TextColumnWriter, open_text_columns
+
+
+SNAPSHOT_ROOT = "snapshots"
+SNAPSHOT_VERSION = 5
+MANIFEST_NAME = "manifest.json"
+TEXT_CHUNK_ROWS = 10_000
+STRING_SEPARATOR = "\x00"
+HASH_BLOCK_BYTES = 1 << 20
+
+
+def is_snapshot(directory):
+    return os.path.isfile(os.path.join(directory, MANIFEST_NAME))
+
+
+def list_snapshots(root=SNAPSHOT_ROOT):
+    """Snapshot directories under ``root``, newest first"""
+    if not os.path.isdir(root):
+        return []
+    found = [
+        os.path.join(root, name)
+        for name in os.listdir(root)
+        if is_snapshot(os.path.join(root, name))
+        and ".tmp-" not in name
+        and ".old-" not in name
+    ]
+    return sorted(found, key=os.path.getmtime, reverse=True)
+
+
+def read_manifest(directory):
+    with open(os.path.join(directory, MANIFEST_NAME), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def file_fingerprint(path):
+    """Name, location, size, mtime and SHA-256 of a source file"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_BYTES), b""):
+            digest.update(block)
+    stat = os.stat(path)
+    return {
+        "name": os.path.basename(path),
+        "path": os.path.abspath(path),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "sha256": digest.hexdigest(),
+    }
+
+
+def upload_fingerprint(name, data):
+    """Name, size and SHA-256 of an uploaded file, which has no path to re-check"""
+    return {
+        "name": name,
+        "size": len(data),
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }
+
+
+def changed_sources(manifest):
+    """Names of the snapshot's source files that changed since it was written.
+
+    Files whose size and mtime are unchanged are trusted without hashing;
+    sources that are no longer at their recorded path are not reported.
+    """
+    changed = []
+    for source in manifest.get("sources", []):
+        path = source.get("path")
+        if not path or not os.path.isfile(path):
+            continue
+        stat = os.stat(path)
+        if stat.st_size == source["size"] and stat.st_mtime == source["mtime"]:
+            continue
+        if file_fingerprint(path)["sha256"] != source["sha256"]:
+            changed.append(source["name"])
+    return changed
+
+
+def _block_name(position):
+    return f"{position:03d}"
+
+
+def _write_frame(directory, df):
+    """Write ``df`` column by column; returns the column specs for the manifest.
+
+    Numeric, boolean and naive datetime columns become ``.npy`` blocks,
+    tz-aware datetimes are stored as UTC with their zone, categoricals as
+    codes plus categories. String columns are written as one UTF-8 block
+    of separator-joined values plus a null mask, which reads back with a
+    single decode and split; values containing the separator fall back
+    to the text store. Object columns and categories holding numbers or
+    booleans are kept as JSON so their types survive the round trip.
+    """
+    os.makedirs(directory)
+    specs = []
+    for position, name in enumerate(df.columns):
+        series = df[name]
+        block = _block_name(position)
+        spec = {"name": name, "block": block, "dtype": str(series.dtype)}
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            spec["kind"] = "category"
+            spec["ordered"] = bool(series.cat.ordered)
+            categories = series.cat.categories
+            if categories.dtype == object:
+                spec["categories"] = _json_values(categories, name)
+            else:
+                np.save(
+                    os.path.join(directory, block + ".categories.npy"),
+                    categories.to_numpy(),
+                    allow_pickle=False,
+                )
+            np.save(os.path.join(directory, block + ".npy"), series.cat.codes.to_numpy())
+        elif isinstance(series.dtype, pd.DatetimeTZDtype):
+            spec["kind"] = "datetime"
+            spec["tz"] = str(series.dt.tz)
+            np.save(
+                os.path.join(directory, block + ".npy"),
+                series.dt.tz_convert("UTC").dt.tz_localize(None).to_numpy(),
+            )
+        elif series.dtype == object and pd.api.types.infer_dtype(
+            series, skipna=True
+        ) not in ("string", "empty"):
+            spec["kind"] = "values"
+            nulls = series.isna().to_numpy()
+            with open(os.path.join(directory, block + ".json"), "w", encoding="utf-8") as f:
+                json.dump(_json_values(series[~nulls], name), f, ensure_ascii=False)
+            np.save(os.path.join(directory, block + ".nulls.npy"), nulls)
+        elif series.dtype == object:
+            nulls = series.isna().to_numpy()
+            values = series.where(~nulls, "").astype(str)
+            if values.str.contains(STRING_SEPARATOR, regex=False).any():
+                spec["kind"] = "text"
+                writer = TextColumnWriter(directory, block)
+                for start in range(0, len(series), TEXT_CHUNK_ROWS):
+                    writer.append(series.iloc[start : start + TEXT_CHUNK_ROWS].to_numpy())
+                writer.close()
+            else:
+                spec["kind"] = "strings"
+                with open(os.path.join(directory, block + ".txt"), "wb") as f:
+                    f.write(STRING_SEPARATOR.join(values).encode("utf-8"))
+                np.save(os.path.join(directory, block + ".nulls.npy"), nulls)
+        elif isinstance(series.dtype, np.dtype):
+            spec["kind"] = "array"
+            np.save(
+                os.path.join(directory, block + ".npy"),
+                series.to_numpy(),
+                allow_pickle=False,
+            )
+        else:
+            raise TypeError(f"Column {name!r} has unsupported dtype {series.dtype}")
+        specs.append(spec)
+    return specs
+
+
+def _json_values(values, name):
+    """Plain str/bool/int/float list of ``values``, so their types survive JSON"""
+    plain = []
+    for value in values:
+        if isinstance(value, np.generic):
+            value = value.item()
+        if not isinstance(value, (str, bool, int, float)):
+            raise TypeError(
+                f"Column {name!r} holds a {type(value).__name__} value, "
+                "which snapshots cannot store"
+            )
+        plain.append(value)
+    return plain
+
+
+def _load_block(path, rows):
+    # Copy-on-write mapping: pages read it lazily and may still write to it
+    return np.asarray(np.load(path, mmap_mode="c" if rows else None))
+
+
+def _read_frame(directory, specs, rows):
+    columns = {}
+    for spec in specs:
+        path = os.path.join(directory, spec["block"])
+        if spec["kind"] == "category":
+            if "categories" in spec:
+                categories = pd.Index(spec["categories"], dtype=object)
+            else:
+                categories = pd.Index(np.load(path + ".categories.npy"))
+            values = pd.Categorical.from_codes(
+                _load_block(path + ".npy", rows),
+                categories,
+                ordered=spec["ordered"],
+            )
+        elif spec["kind"] == "datetime":
+            values = pd.DatetimeIndex(_load_block(path + ".npy", rows)).tz_localize("UTC")
+            values = values.tz_convert(spec["tz"])
+        elif spec["kind"] == "strings":
+            values = np.empty(rows, dtype=object)
+            if rows:
+                with open(path + ".txt", "rb") as f:
+                    values[:] = f.read().decode("utf-8").split(STRING_SEPARATOR)
+                values[np.load(path + ".nulls.npy")] = np.nan
+        elif spec["kind"] == "values":
+            nulls = np.load(path + ".nulls.npy")
+            values = np.full(rows, np.nan, dtype=object)
+            with open(path + ".json", encoding="utf-8") as f:
+                values[~nulls] = json.load(f)
+        elif spec["kind"] == "text":
+            values = LazyTextColumn(path, spec["name"]).to_series().to_numpy()
+        else:
+            values = _load_block(path + ".npy", rows)
+        columns[spec["name"]] = values
+    return pd.DataFrame(columns, index=pd.RangeIndex(rows), copy=False)
+
+
+def write_snapshot(
+    directory,
+    key,
+    df,
+    comments,
+    text_columns,
+    sources,
+    topic_weights=None,
+    topic_keywords=None,
+    topic_model_hash=None,
+    sentiment_model=None,
+    aggregates=None,
+    options=None,
+):
+    """Write a processed dataset to ``directory``.
+
+    ``sources`` are the ``file_fingerprint`` (``upload_fingerprint`` for
+    uploads) of every input file.
+    ``text_columns`` (lazy columns, possibly views over several uploads)
+    are copied into the snapshot so it does not depend on the text cache.
+    ``topic_model_hash`` identifies the model the topic columns and
+    weights came from, ``sentiment_model`` the ``model_fingerprint`` of
+    the model that labelled the comments. ``aggregates`` is the
+    ``compute_aggregates`` dict; its tables are stored like the frames so
+    the pages can read them back without recomputing. The snapshot is
+    built next to ``directory`` and swapped in at the end, so a session
+    still mapping the previous one keeps its files.
+    """
+    staging = f"{directory}.tmp-{os.getpid()}"
+    if os.path.exists(staging):
+        shutil.rmtree(staging)
+    os.makedirs(staging)
+
+    df = df.reset_index(drop=True)
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "key": key,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "sources": sources,
+        "options": options or {},
+        "rows": int(len(df)),
+        "columns": _write_frame(os.path.join(staging, "videos"), df),
+        "comments": None,
+        "text_columns": list(text_columns),
+        "topics": None,
+        "sentiment": (
+            {"model_fingerprint": sentiment_model} if sentiment_model else None
+        ),
+    }
+    if comments is not None:
+        comments = comments.reset_index(drop=True)
+        manifest["comments"] = {
+            "rows": int(len(comments)),
+            "columns": _write_frame(os.path.join(staging, "comments"), comments),
+        }
+
+    text_dir = os.path.join(staging, "text")
+    for name, column in text_columns.items():
+        writer = TextColumnWriter(text_dir, name)
+        for start in range(0, len(column), TEXT_CHUNK_ROWS):
+            rows = np.arange(start, min(start + TEXT_CHUNK_ROWS, len(column)))
+            writer.append(np.array(column.take(rows), dtype=object))
+        writer.close()
+
+    if topic_weights is not None:
+        np.save(
+            os.path.join(staging, "topic_weights.npy"),
+            np.asarray(topic_weights, dtype=np.float32),
+        )
+        manifest["topics"] = {
+            "n_topics": int(np.shape(topic_weights)[1]),
+            "keywords": topic_keywords,
+            "model_hash": topic_model_hash,
+        }
+
+    if aggregates is not None:
+        manifest["aggregates"] = {"metrics": aggregates["metrics"], "tables": {}}
+        for name, table in aggregates.items():
+            if name == "metrics":
+                continue
+            table = table.reset_index(drop=True)
+            manifest["aggregates"]["tables"][name] = {
+                "rows": int(len(table)),
+                "columns": _write_frame(
+                    os.path.join(staging, "aggregates", name), table
+                ),
+            }
+
+    with open(os.path.join(staging, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+
+    previous = f"{directory}.old-{os.getpid()}"
+    if os.path.exists(directory):
+        os.replace(directory, previous)
+    os.replace(staging, directory)
+    if os.path.exists(previous):
+        shutil.rmtree(previous)
+    return manifest
+
+
+def read_snapshot(directory):
+    """Open a snapshot written by ``write_snapshot``.
+
+    Returns a dict with manifest, df, comments, text_columns, aggregates
+    (or None), topic_weights (memory-mapped, or None) and topic_keywords.
+    Numeric columns stay memory-mapped until a page touches them.
+    """
+    manifest = read_manifest(directory)
+    if manifest.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(
+            f"Snapshot {directory} uses format {manifest.get('version')}; "
+            "run precompute.py again to rebuild it"
+        )
+
+    df = _read_frame(
+        os.path.join(directory, "videos"), manifest["columns"], manifest["rows"]
+    )
+    comments = None
+    if manifest["comments"] is not None:
+        comments = _read_frame(
+            os.path.join(directory, "comments"),
+            manifest["comments"]["columns"],
+            manifest["comments"]["rows"],
+        )
+
+    text_columns = open_text_columns(
+        os.path.join(directory, "text"), manifest["text_columns"]
+    )
+    if text_columns is None:
+        raise FileNotFoundError(f"Snapshot {directory} is missing text columns")
+
+    aggregates = None
+    if manifest.get("aggregates") is not None:
+        aggregates = {"metrics": manifest["aggregates"]["metrics"]}
+        for name, spec in manifest["aggregates"]["tables"].items():
+            aggregates[name] = _read_frame(
+                os.path.join(directory, "aggregates", name),
+                spec["columns"],
+                spec["rows"],
+            )
+
+    topics = manifest["topics"]
+    return {
+        "manifest": manifest,
+        "df": df,
+        "comments": comments,
+        "text_columns": text_columns,
+        "aggregates": aggregates,
+        "topic_weights": (
+            _load_block(os.path.join(directory, "topic_weights.npy"), manifest["rows"])
+            if topics is not None
+            else None
+        ),
+        "topic_keywords": topics["keywords"] if topics is not None else None,
+    }
@@ -0,0 +1,108 @@
+import re
+
+
+WORD_PATTERN = re.compile(r"\w+")
+_END = object()
+
+
+def _preserve_case(word, replacement):
+    """Apply the casing of the matched word to its replacement"""
+    if word.isupper():
+        return replacement.upper()
+    elif word[0].isupper():
+        return replacement.capitalize()
+    return replacement
+
+
+class SlangNormalizer:
+    """Informal-to-formal normalizer built once from a slang mapping.
+
+    Single-word keys are resolved with a plain dict lookup per token.
+    Multi-word keys ("o on", "blo on", "ati-ati") live in a token trie whose
+    edges alternate between a word and the exact separator that follows it,
+    so a key only matches whole words with the same spacing/punctuation as
+    the regex-based ``normalize_text``. When several keys start at the same
+    word the longest one wins. Keys that do not start and end with a word
+    character (e.g. "@", "w/") are ignored.
+    """
+
+    def __init__(self, mappings):
+        self.words = {}
+        self.trie = {}
+
+        for key, value in mappings.items():
+            key = str(key).lower()
+            spans = list(WORD_PATTERN.finditer(key))
+            if not spans or spans[0].start() != 0 or spans[-1].end() != len(key):
+                continue
+
+            if len(spans) == 1:
+                self.words[key] = value
+                continue
+
+            node = self.trie
+            for i, span in enumerate(spans):
+                node = node.setdefault(span.group(0), {})
+                if i + 1 < len(spans):
+                    node = node.setdefault(key[span.end() : spans[i + 1].start()], {})
+            node[_END] = value
+
+    def __len__(self):
+        return len(self.words) + self._count(self.trie)
+
+    def _count(self, node):
+        return sum(
+            1 if key is _END else self._count(child) for key, child in node.items()
+        )
+
+    def _match_phrase(self, text, tokens, lowered, i):
+        """Return (end_token_index, replacement) of the longest trie match at i"""
+        node = self.trie.get(lowered[i])
+        best = None
+        j = i
+        while node is not None:
+            if _END in node:
+                best = (j, node[_END])
+            if j + 1 >= len(tokens):
+                break
+            gap = text[tokens[j].end() : tokens[j + 1].start()]
+            node = node.get(gap)
+            if node is None:
+                break
+            j += 1
+            node = node.get(lowered[j])
+        return best
+
+    def normalize(self, text):
+        """Normalize a single comment"""
+        text = str(text)
+        tokens = list(WORD_PATTERN.finditer(text))
+        if not tokens:
+            return text
+
+        lowered = [t.group(0).lower() for t in tokens]
+        pieces = []
+        last = 0
+        i = 0
+        while i < len(tokens):
+            match = self._match_phrase(text, tokens, lowered, i) if self.trie else None
+            if match is not None:
+                end, replacement = match
+            elif lowered[i] in self.words:
+                end, replacement = i, self.words[lowered[i]]
+            else:
+                i += 1
+                continue
+
+            start_pos, end_pos = tokens[i].start(), tokens[end].end()
+            pieces.append(text[last:start_pos])
+            pieces.append(_preserve_case(text[start_pos:end_pos], replacement))
+            last = end_pos
+            i = end + 1
+
+        pieces.append(text[last:])
+        return "".join(pieces)
+
+    def normalize_many(self, texts):
+        """Normalize a list of comments in one call"""
+        return [self.normalize(text) for text in texts]
@@ -0,0 +1,176 @@
+import mmap
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+
+def _column_path(directory, name):
+    return os.path.join(directory, re.sub(r"\W+", "_", name).strip("_").lower())
+
+
+class TextColumnWriter:
+    """Append a text column chunk by chunk to a file on disk.
+
+    Values are stored as concatenated UTF-8 bytes next to an offsets array
+    and a null mask; ``close`` returns the ``LazyTextColumn`` reading them.
+    Files are written under a temporary name and renamed into place, so
+    sessions that still map an older copy are never truncated under.
+    """
+
+    def __init__(self, directory, name):
+        os.makedirs(directory, exist_ok=True)
+        self.name = name
+        self.path = _column_path(directory, name)
+        self._tmp = f".tmp-{os.getpid()}-{id(self)}"
+        self._file = open(self.path + ".bin" + self._tmp, "wb")
+        self._lengths = []
+        self._nulls = []
+
+    def append(self, values):
+        nulls = pd.isna(values)
+        encoded = [
+            b"" if null else str(value).encode("utf-8")
+            for value, null in zip(values, nulls)
+        ]
+        self._file.write(b"".join(encoded))
+        self._lengths.append(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)))
+        self._nulls.append(np.asarray(nulls, dtype=bool))
+
+    def close(self):
+        self._file.close()
+        lengths = np.concatenate(self._lengths) if self._lengths else np.zeros(0, np.int64)
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        nulls = np.concatenate(self._nulls) if self._nulls else np.zeros(0, bool)
+        for suffix, array in ((".offsets.npy", offsets), (".nulls.npy", nulls)):
+            with open(self.path + suffix + self._tmp, "wb") as f:
+                np.save(f, array)
+        # The null mask goes last: its presence marks a complete column
+        for suffix in (".bin", ".offsets.npy", ".nulls.npy"):
+            os.replace(self.path + suffix + self._tmp, self.path + suffix)
+        return LazyTextColumn(self.path, self.name)
+
+    def abort(self):
+        """Close and delete the temporary files of an unfinished column"""
+        self._file.close()
+        for suffix in (".bin", ".offsets.npy", ".nulls.npy"):
+            try:
+                os.remove(self.path + suffix + self._tmp)
+            except FileNotFoundError:
+                pass
+
+
+class LazyTextColumn:
+    """Read-only text column backed by a memory-mapped file.
+
+    Only the offsets are touched until values are requested, so holding
+    the column costs (almost) no memory; ``to_series`` materializes it.
+    """
+
+    def __init__(self, path, name):
+        self.path = path
+        self.name = name
+        self._offsets = np.load(path + ".offsets.npy", mmap_mode="r")
+        self._nulls = np.load(path + ".nulls.npy", mmap_mode="r")
+        self._data = None
+
+    @classmethod
+    def open(cls, directory, name):
+        return cls(_column_path(directory, name), name)
+
+    @staticmethod
+    def exists(directory, name):
+        return os.path.exists(_column_path(directory, name) + ".nulls.npy")
+
+    def __len__(self):
+        return len(self._nulls)
+
+    def _buffer(self):
+        if self._data is None:
+            if int(self._offsets[-1]) == 0:
+                self._data = b""
+            else:
+                with open(self.path + ".bin", "rb") as f:
+                    self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._data
+
+    def take(self, rows):
+        """Values at the given positions, None for missing ones"""
+        data = self._buffer()
+        rows = np.asarray(rows, dtype=np.int64)
+        starts = self._offsets[rows].tolist()
+        ends = self._offsets[rows + 1].tolist()
+        nulls = self._nulls[rows].tolist()
+        return [
+            None if null else data[start:end].decode("utf-8")
+            for start, end, null in zip(starts, ends, nulls)
+        ]
+
+    def to_series(self, index=None):
+        """Materialize the whole column as an object Series"""
+        values = np.array(self.take(np.arange(len(self))), dtype=object)
+        values[np.asarray(self._nulls)] = np.nan
+        return pd.Series(values, index=index, name=self.name)
+
+
+class TextColumnView:
+    """Rows picked from several lazy columns, e.g. after merging uploads.
+
+    Row i of the view is row ``rows[i]`` of ``columns[parts[i]]``; a None
+    entry in ``columns`` stands for a dataset without that column.
+    """
+
+    def __init__(self, name, columns, parts, rows):
+        self.name = name
+        self.columns = columns
+        self.parts = np.asarray(parts, dtype=np.int64)
+        self.rows = np.asarray(rows, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def take(self, rows):
+        """Values at the given positions, None for missing ones"""
+        rows = np.asarray(rows, dtype=np.int64)
+        values = np.full(len(rows), None, dtype=object)
+        parts = self.parts[rows]
+        for part, column in enumerate(self.columns):
+            if column is None:
+                continue
+            selected = np.flatnonzero(parts == part)
+            if len(selected):
+                values[selected] = column.take(self.rows[rows[selected]])
+        return values.tolist()
+
+    def to_series(self, index=None):
+        """Materialize the whole column as an object Series"""
+        values = np.array(self.take(np.arange(len(self))), dtype=object)
+        values[pd.isna(values)] = np.nan
+        return pd.Series(values, index=index, name=self.name)
+
+
+def open_text_columns(directory, names):
+    """Reopen stored columns, or None if any of them is missing"""
+    if not all(LazyTextColumn.exists(directory, name) for name in names):
+        return None
+    return {name: LazyTextColumn.open(directory, name) for name in names}
+
+
+def attach_text_columns(df, text_columns, names=None):
+    """Return ``df`` with the requested lazy columns materialized.
+
+    ``text_columns`` maps column name -> LazyTextColumn; the DataFrame
+    passed in is not modified. ``names`` defaults to every column with one
+    value per row of ``df``, which leaves out the comment text.
+    """
+    if names is None:
+        names = [n for n, column in text_columns.items() if len(column) == len(df)]
+    names = [n for n in names if n in text_columns and n not in df.columns]
+    if not names:
+        return df
+    df = df.copy(deep=False)
+    for name in names:
+        df[name] = text_columns[name].to_series(df.index)
+    return df
@@ -0,0 +1,132 @@
+import hashlib
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+
+TOPIC_MODEL_PATH = "models/topic_modeling/nmf_model.pkl"
+TOPIC_KEYWORDS = 10
+TOPIC_MMAP_DIR = os.path.join(".cache", "topic_model")
+HASH_BLOCK_BYTES = 1 << 20
+
+# path -> (size, mtime_ns, sha256) so unchanged files are not re-hashed
+_model_hashes = {}
+
+
+def model_hash(path=TOPIC_MODEL_PATH):
+    """SHA-256 of a model file, recomputed only when its size or mtime changes"""
+    stat = os.stat(path)
+    key = os.path.abspath(path)
+    cached = _model_hashes.get(key)
+    if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+        return cached[2]
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_BYTES), b""):
+            digest.update(block)
+    _model_hashes[key] = (stat.st_size, stat.st_mtime_ns, digest.hexdigest())
+    return digest.hexdigest()
+
+
+def load_topic_model(path=TOPIC_MODEL_PATH, mmap_dir=TOPIC_MMAP_DIR):
+    """Load the NMF package (nmf_model, tfidf, feature_names, n_topics).
+
+    With ``mmap_dir`` the package is re-dumped uncompressed there once per
+    model hash and loaded with ``mmap_mode="r"``: the large arrays (NMF
+    ``components_``, TF-IDF ``idf_``) are then backed by the page cache and
+    shared by every server process. The package also carries its
+    ``model_hash``.
+    """
+    import joblib
+
+    digest = model_hash(path)
+    package = None
+    if mmap_dir:
+        mmap_path = os.path.join(mmap_dir, f"{digest[:16]}.joblib")
+        try:
+            if not os.path.isfile(mmap_path):
+                os.makedirs(mmap_dir, exist_ok=True)
+                tmp_path = f"{mmap_path}.tmp-{os.getpid()}"
+                joblib.dump(joblib.load(path), tmp_path)
+                os.replace(tmp_path, mmap_path)
+            package = joblib.load(mmap_path, mmap_mode="r")
+        except OSError:
+            # Read-only checkout: fall back to a private copy
+            package = None
+    if package is None:
+        package = joblib.load(path)
+    package["model_hash"] = digest
+    return package
+
+
+def preprocess_text(text):
+    """Lowercase, drop URLs and keep letters only, as the model was trained"""
+    if pd.isna(text):
+        return ""
+    text = str(text).lower()
+    text = re.sub(r"http\S+|www\S+|https\S+", "", text)
+    text = re.sub(r"[^a-zA-Z\s]", " ", text)
+    text = " ".join(text.split())
+    return text
+
+
+def preprocess_series(texts):
+    """Vectorized ``preprocess_text`` over a string Series"""
+    return (
+        texts.fillna("")
+        .astype(str)
+        .str.lower()
+        .str.replace(r"http\S+|www\S+|https\S+", "", regex=True)
+        .str.replace(r"[^a-zA-Z\s]", " ", regex=True)
+        .str.split()
+        .str.join(" ")
+    )
+
+
+def topic_texts(df):
+    """Text the topic model sees for each video: title plus tags column"""
+    combined = df["Judul"].fillna("").astype(str) + " "
+    if "Total Video Cha Tags" in df.columns:
+        combined = combined + df["Total Video Cha Tags"].fillna("").astype(str)
+    return preprocess_series(combined)
+
+
+def topic_keywords(nmf_package, n_words=TOPIC_KEYWORDS):
+    """Top ``n_words`` keywords of every topic"""
+    feature_names = nmf_package["feature_names"]
+    keywords = []
+    for comp in nmf_package["nmf_model"].components_:
+        top_idx = comp.argsort()[-n_words:][::-1]
+        keywords.append([feature_names[j] for j in top_idx])
+    return keywords
+
+
+def assign_topics(df, nmf_package):
+    """Project every video on the NMF topics.
+
+    Returns (topics, confidences, weights): the dominant topic index and its
+    weight per row, and the full document-topic matrix.
+    """
+    tfidf_matrix = nmf_package["tfidf"].transform(topic_texts(df))
+    weights = nmf_package["nmf_model"].transform(tfidf_matrix)
+    return weights.argmax(axis=1), weights.max(axis=1), np.asarray(weights)
+
+
+def top_videos_by_topic(topics, views, n=5):
+    """Row positions of the ``n`` most viewed videos of every topic.
+
+    Matches ``nlargest(n, "Views")`` per topic: rows without views are
+    left out and ties keep their original order.
+    """
+    topics = np.asarray(topics)
+    views = pd.to_numeric(pd.Series(views), errors="coerce").to_numpy(
+        dtype=float, na_value=np.nan
+    )
+    rows = np.flatnonzero(~np.isnan(views))
+    # Sorted by topic, then by views descending (lexsort is stable)
+    rows = rows[np.lexsort((-views[rows], topics[rows]))]
+    sorted_topics = topics[rows]
+    present, starts = np.unique(sorted_topics, return_index=True)
+    return {int(topic): rows[start : start + n] for topic, start in zip(present, starts)}
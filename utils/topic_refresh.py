@@ -0,0 +1,308 @@
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+
+from utils.topic_model import TOPIC_MODEL_PATH, model_hash
+
+
+REFRESH_EPOCHS = 5
+REFRESH_BATCH_SIZE = 256
+REFRESH_MIN_DF = 2
+REFRESH_MAX_NEW_TERMS = 500
+# New terms start at this fraction of the mean topic-term weight
+NEW_TERM_WEIGHT = 0.01
+VERSION_PATTERN = re.compile(r"\.v(\d+)\.pkl$")
+
+# Serializes version reservations between jobs of this process
+_version_lock = threading.Lock()
+
+
+def version_path(version, base_path=TOPIC_MODEL_PATH):
+    """``nmf_model.v<version>.pkl`` next to the shipped model"""
+    root, ext = os.path.splitext(base_path)
+    return f"{root}.v{version}{ext}"
+
+
+def _version_files(base_path):
+    """(version, path) of every versioned file next to ``base_path``, sorted"""
+    directory = os.path.dirname(base_path) or "."
+    prefix = os.path.splitext(os.path.basename(base_path))[0] + ".v"
+    if not os.path.isdir(directory):
+        return []
+    versions = []
+    for name in os.listdir(directory):
+        match = VERSION_PATTERN.search(name)
+        if name.startswith(prefix) and match:
+            versions.append((int(match.group(1)), os.path.join(directory, name)))
+    return sorted(versions)
+
+
+def list_topic_models(base_path=TOPIC_MODEL_PATH):
+    """(label, path) of the shipped model and every refreshed version, oldest first.
+
+    A version is listed once its sidecar is written, so models still
+    being trained (reserved, empty files) are left out.
+    """
+    models = [("Original", base_path)]
+    for version, path in _version_files(base_path):
+        info = read_version_info(path)
+        if info:
+            models.append((f"v{version} · {info['source']} ({info['created']})", path))
+    return models
+
+
+def read_version_info(path):
+    """Sidecar metadata of a refreshed model, or None"""
+    try:
+        with open(os.path.splitext(path)[0] + ".json", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def next_version(base_path=TOPIC_MODEL_PATH):
+    """Number after the highest existing version; the shipped model counts
+    as v1, so the first refresh is v2.
+    """
+    versions = [version for version, _ in _version_files(base_path)]
+    return max(versions, default=1) + 1
+
+
+def reserve_version(base_path=TOPIC_MODEL_PATH):
+    """Claim the next version by creating its file empty; returns (version, path).
+
+    ``O_EXCL`` makes the claim atomic between processes, the lock between
+    jobs of this one, so concurrent refreshes never write the same version.
+    """
+    with _version_lock:
+        version = next_version(base_path)
+        while True:
+            path = version_path(version, base_path)
+            try:
+                os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return version, path
+            except FileExistsError:
+                version += 1
+
+
+def _write_atomic(path, write):
+    """Call ``write(tmp_path)`` on a temporary file next to ``path``, then swap it in"""
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path) or ".",
+        prefix=os.path.basename(path) + ".",
+        suffix=".tmp",
+    )
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def extend_vocabulary(tfidf, texts, min_df=REFRESH_MIN_DF, max_new_terms=REFRESH_MAX_NEW_TERMS):
+    """Terms of ``texts`` missing from the vectorizer's vocabulary.
+
+    Uses the vectorizer's own analyzer, keeps terms found in at least
+    ``min_df`` documents and returns the ``max_new_terms`` most frequent.
+    """
+    analyze = tfidf.build_analyzer()
+    known = tfidf.vocabulary_
+    counts = Counter()
+    for text in texts:
+        counts.update(term for term in set(analyze(text)) if term not in known)
+    frequent = sorted(
+        (term for term, count in counts.items() if count >= min_df),
+        key=lambda term: (-counts[term], term),
+    )
+    return frequent[:max_new_terms]
+
+
+def term_idf(tfidf):
+    """IDF weights of a fitted TfidfVectorizer.
+
+    Vectorizers pickled by scikit-learn < 1.5 only keep them as the
+    diagonal matrix ``_idf_diag``.
+    """
+    try:
+        return np.asarray(tfidf.idf_)
+    except AttributeError:
+        return tfidf._tfidf._idf_diag.diagonal()
+
+
+class TopicRefreshJob:
+    """Online update of an NMF topic package on new documents.
+
+    The vocabulary of ``nmf_package`` is extended with the new documents'
+    frequent terms (existing terms keep their IDF), and a MiniBatchNMF is
+    seeded with the old topics and trained with ``partial_fit`` over
+    ``epochs`` shuffled passes. The next ``nmf_model.v<N>.pkl`` next to
+    ``base_path`` is reserved before training and filled in at the end,
+    followed by its JSON sidecar; a failed or cancelled job releases it
+    again. ``cancel()`` stops the job after the current batch.
+    """
+
+    def __init__(
+        self,
+        texts,
+        nmf_package,
+        source="",
+        base_path=TOPIC_MODEL_PATH,
+        epochs=REFRESH_EPOCHS,
+        batch_size=REFRESH_BATCH_SIZE,
+        max_new_terms=REFRESH_MAX_NEW_TERMS,
+        random_state=0,
+    ):
+        self.texts = [str(t) for t in texts if str(t).strip()]
+        self.nmf_package = nmf_package
+        self.source = source
+        self.base_path = base_path
+        self.epochs = epochs
+        self.batch_size = batch_size
+        self.max_new_terms = max_new_terms
+        self.random_state = random_state
+
+        batches = -(-len(self.texts) // batch_size)
+        self.total_steps = batches * epochs
+        self.steps = 0
+        self.status = "pending"
+        self.error = None
+        self.version = None
+        self.path = None
+        self.stats = {"documents": len(self.texts), "new_terms": 0, "seconds": 0.0}
+        self.started_at = None
+        self.finished_at = None
+        self._thread = None
+        self._cancelled = False
+
+    def start(self):
+        """Run the job in a daemon thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, daemon=True)
+            self._thread.start()
+        return self
+
+    def run(self):
+        """Run the job in the calling thread"""
+        self.started_at = time.time()
+        self.status = "running"
+        try:
+            self._run()
+            self.status = "cancelled" if self._cancelled else "done"
+        except Exception as e:
+            self.error = e
+            self.status = "failed"
+        finally:
+            self.finished_at = time.time()
+            self.stats["seconds"] = self.finished_at - self.started_at
+        return self
+
+    def cancel(self):
+        """Stop training after the current batch, without saving"""
+        self._cancelled = True
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed", "cancelled")
+
+    def progress(self):
+        """Return (steps, total_steps)"""
+        return self.steps, self.total_steps
+
+    def _run(self):
+        if not self.texts:
+            raise ValueError("no titles or tags to learn topics from")
+
+        self.version, self.path = reserve_version(self.base_path)
+        saved = False
+        try:
+            saved = self._train()
+        finally:
+            if not saved:
+                os.remove(self.path)
+                self.path = None
+
+    def _train(self):
+        import joblib
+        from sklearn.base import clone
+        from sklearn.decomposition import MiniBatchNMF
+
+        old_tfidf = self.nmf_package["tfidf"]
+        old_terms = list(self.nmf_package["feature_names"])
+        new_terms = extend_vocabulary(
+            old_tfidf, self.texts, max_new_terms=self.max_new_terms
+        )
+        self.stats["new_terms"] = len(new_terms)
+
+        # Existing terms keep their IDF, new ones get it from these documents
+        tfidf = clone(old_tfidf).set_params(vocabulary=old_terms + new_terms)
+        tfidf.fit(self.texts)
+        tfidf.idf_ = np.concatenate(
+            [term_idf(old_tfidf), tfidf.idf_[len(old_terms) :]]
+        )
+        X = tfidf.transform(self.texts)
+
+        # Seed with the current topics so they drift rather than restart
+        old_components = np.asarray(self.nmf_package["nmf_model"].components_)
+        n_topics = old_components.shape[0]
+        rng = np.random.default_rng(self.random_state)
+        H = np.hstack(
+            [
+                old_components,
+                rng.uniform(
+                    0,
+                    old_components.mean() * NEW_TERM_WEIGHT,
+                    (n_topics, len(new_terms)),
+                ),
+            ]
+        ).astype(X.dtype)
+
+        model = MiniBatchNMF(
+            n_components=n_topics,
+            init="custom",
+            batch_size=self.batch_size,
+            random_state=self.random_state,
+        )
+        for _ in range(self.epochs):
+            order = rng.permutation(X.shape[0])
+            for start in range(0, len(order), self.batch_size):
+                if self._cancelled:
+                    return False
+                batch = X[order[start : start + self.batch_size]]
+                if not hasattr(model, "components_"):
+                    W = np.full((batch.shape[0], n_topics), X.mean(), dtype=X.dtype)
+                    model.partial_fit(batch, W=W, H=H)
+                else:
+                    model.partial_fit(batch)
+                self.steps += 1
+
+        package = {
+            "nmf_model": model,
+            "tfidf": tfidf,
+            "feature_names": tfidf.get_feature_names_out(),
+            "n_topics": n_topics,
+        }
+        _write_atomic(self.path, lambda tmp_path: joblib.dump(package, tmp_path))
+        info = {
+            "version": self.version,
+            "parent": self.nmf_package.get("model_hash"),
+            "source": self.source,
+            "created": time.strftime("%Y-%m-%d %H:%M"),
+            "documents": len(self.texts),
+            "new_terms": len(new_terms),
+            "model_hash": model_hash(self.path),
+        }
+
+        def write_info(tmp_path):
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(info, f, indent=2)
+
+        _write_atomic(os.path.splitext(self.path)[0] + ".json", write_info)
+        return True